@@ -1,12 +1,24 @@
 import os
+import sys
 import time
+import queue
+import atexit
+import logging
+import logging.handlers
+import threading
 import requests
 import json
+import orjson
+import numpy as np
+import websocket
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from web3 import Web3
 from py_clob_client.client import ClobClient
 from py_clob_client.clob_types import OrderArgs, OrderType, PostOrdersArgs
 from py_clob_client.order_builder.constants import BUY, SELL
-from datetime import datetime, timedelta, timezone
 
 # ==========================================
 # 🔧 MANUAL FIX for OrderOptions
@@ -16,6 +28,25 @@ class OrderOptions:
         self.tick_size = str(tick_size)
         self.neg_risk = neg_risk
 
+# ==========================================
+# 📝 LOGGING (formatting + stdout writes happen off the trading threads)
+# ==========================================
+LOG_QUEUE = queue.Queue(-1)
+logger = logging.getLogger("bot_main")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+logger.addHandler(logging.handlers.QueueHandler(LOG_QUEUE))
+
+_stdout_handler = logging.StreamHandler(sys.stdout)
+_stdout_handler.terminator = ""  # log() appends its own line ending (supports end="\r" status lines)
+log_listener = logging.handlers.QueueListener(LOG_QUEUE, _stdout_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+def log(*args, end="\n"):
+    """Queue a message for the background writer - drop-in replacement for print"""
+    logger.info(" ".join(str(a) for a in args) + end)
+
 # ==========================================
 # 🛠️ USER CONFIGURATION
 # ==========================================
@@ -30,25 +61,26 @@ POLYMARKET_ADDRESS = "0xC47167d407A91965fAdc7aDAb96F0fF586566bF7"
 # Check what address the private key controls
 from eth_account import Account
 wallet = Account.from_key(PRIVATE_KEY)
-print(f"🔑 Private key controls: {wallet.address}")
-print(f"🔑 Polymarket shows: {POLYMARKET_ADDRESS}")
+log(f"🔑 Private key controls: {wallet.address}")
+log(f"🔑 Polymarket shows: {POLYMARKET_ADDRESS}")
 
 # If they match, we can trade directly (EOA mode)
 # If they don't match, Polymarket uses a proxy contract
 if wallet.address.lower() == POLYMARKET_ADDRESS.lower():
-    print(f"✅ Direct match - using EOA mode")
+    log(f"✅ Direct match - using EOA mode")
     USE_PROXY = False
     SIGNATURE_TYPE = 0
     TRADING_ADDRESS = Web3.to_checksum_address(wallet.address)
 else:
-    print(f"⚠️ Addresses differ - Polymarket uses proxy contract")
-    print(f"   We'll try proxy mode with signature_type=1 (Magic Link)")
+    log(f"⚠️ Addresses differ - Polymarket uses proxy contract")
+    log(f"   We'll try proxy mode with signature_type=1 (Magic Link)")
     USE_PROXY = True
     SIGNATURE_TYPE = 1
     TRADING_ADDRESS = Web3.to_checksum_address(POLYMARKET_ADDRESS)
 
 # Manual Override (optional - leave empty for auto-detection)
 MANUAL_SLUG = ""  # e.g., "btc-updown-15m-1765593000"
+MANUAL_MARKET_TIMESTAMP = int(MANUAL_SLUG.rsplit('-', 1)[-1]) if MANUAL_SLUG else None
 
 # Slug generation for BTC 15min markets
 INTERVAL = 900  # 15 minutes in seconds
@@ -111,26 +143,57 @@ MIN_ORDER_SIZE = 0.1        # Minimum order size
 HOST = "https://clob.polymarket.com"
 CHAIN_ID = 137
 RPC_URL = "https://polygon-rpc.com"
+GAMMA_EVENTS_URL = "https://gamma-api.polymarket.com/events?slug={}"
+SLUG_CACHE_TTL = INTERVAL  # A market's token ids don't change within its 15-minute bucket
+USER_WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/user"
+USER_WS_PING_INTERVAL = 2   # Keep-alive PING cadence on the user channel
+USER_WS_STALE_AFTER = 5     # Fall back to REST order checks after 5s of stream silence
+FILL_STATUSES = ('MATCHED', 'FILLED', 'COMPLETED')
+FINISHED_ORDERS_MEMORY = 256  # Recently settled order ids whose late/duplicate fill events are ignored
+BOOK_CACHE_TTL = 0.2   # Back-to-back bid/ask/depth reads within 200ms share one book fetch
+CANCEL_REPLACE_RETRY_DELAY = 0.2  # Retry a replacement once if it raced its cancel
 USDC_E_CONTRACT = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
 USDC_CHECKSUM = Web3.to_checksum_address(USDC_E_CONTRACT)
+USDC_DECIMALS = 6  # USDC.e decimals are fixed by the contract
 ERC20_ABI = json.loads('[{"constant":true,"inputs":[{"name":"_owner","type":"address"}],"name":"balanceOf","outputs":[{"name":"balance","type":"uint256"}],"type":"function"},{"constant":true,"inputs":[],"name":"decimals","outputs":[{"name":"","type":"uint8"}],"type":"function"}]')
 
 class CombinedBTCBot:
     def __init__(self):
-        print("🤖 Combined BTC Trading Bot Starting...")
-        print(f"📋 Strategy Mode: {STRATEGY_MODE}")
+        log("🤖 Combined BTC Trading Bot Starting...")
+        log(f"📋 Strategy Mode: {STRATEGY_MODE}")
         
         # 1. Setup Web3 (For Balance)
         self.w3 = Web3(Web3.HTTPProvider(RPC_URL))
         self.usdc_contract = self.w3.eth.contract(address=USDC_CHECKSUM, abi=ERC20_ABI)
+        # balanceOf(TRADING_ADDRESS) never changes shape - encode the calldata once
+        self._balanceof_calldata = self.usdc_contract.encode_abi("balanceOf", args=[TRADING_ADDRESS])
+        
+        # Persistent HTTP session for Gamma API (keep-alive, pooled connections)
+        self.http = requests.Session()
+        self.http.headers.update({"Accept": "application/json"})
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504])
+        )
+        self.http.mount("https://", adapter)
+        
+        # token_id -> (fetched_at, order book as float64 arrays) shared by the bid/ask/depth helpers
+        self._book_cache = {}
+        
+        # slug -> (fetched_at, market) for successful Gamma lookups
+        self._slug_cache = {}
+        
+        # Worker pool for overlapping independent REST calls
+        self.pool = ThreadPoolExecutor(max_workers=4)
         
         # 2. Setup Client (For Trading)
         try:
-            print(f"🔐 Setting up Polymarket client...")
+            log(f"🔐 Setting up Polymarket client...")
             
             if USE_PROXY:
-                print(f"   Mode: Proxy with Magic Link (signature_type={SIGNATURE_TYPE})")
-                print(f"   Funder: {TRADING_ADDRESS}")
+                log(f"   Mode: Proxy with Magic Link (signature_type={SIGNATURE_TYPE})")
+                log(f"   Funder: {TRADING_ADDRESS}")
                 self.client = ClobClient(
                     host=HOST, 
                     key=PRIVATE_KEY, 
@@ -139,7 +202,7 @@ class CombinedBTCBot:
                     funder=TRADING_ADDRESS
                 )
             else:
-                print(f"   Mode: EOA (direct trading from {TRADING_ADDRESS})")
+                log(f"   Mode: EOA (direct trading from {TRADING_ADDRESS})")
                 self.client = ClobClient(
                     host=HOST, 
                     key=PRIVATE_KEY, 
@@ -147,14 +210,15 @@ class CombinedBTCBot:
                 )
             
             # Use official method to create/derive API credentials
-            print("🔐 Deriving API credentials...")
+            log("🔐 Deriving API credentials...")
             api_creds = self.client.create_or_derive_api_creds()
             self.client.set_api_creds(api_creds)
+            self.api_creds = api_creds
             
-            print(f"✅ Trading as: {self.client.get_address()}\n")
+            log(f"✅ Trading as: {self.client.get_address()}\n")
             
         except Exception as e:
-            print(f"❌ Connection Failed: {e}")
+            log(f"❌ Connection Failed: {e}")
             import traceback
             traceback.print_exc()
             exit()
@@ -164,55 +228,129 @@ class CombinedBTCBot:
         self.traded_markets_mg = set()
         self.skipped_markets_arb = set()
         self.active_arbitrage = False  # NEW: Block mid-game during arbitrage
-        
-        # Session tracking
-        self.starting_balance = self.get_balance()
+        self.active_market = None      # (market, market_timestamp) shared with strategy workers
+        
+        # Order fills pushed by the user WebSocket channel
+        self.order_events = {}   # order_id -> threading.Event, set once filled
+        self.order_fills = {}    # order_id -> (filled, avg_price)
+        self.finished_orders = OrderedDict()  # order ids already consumed/cancelled (oldest first)
+        self.order_lock = threading.Lock()
+        self.user_ws_last_msg = 0
+        # Wake monitor loops on stream updates - one per strategy so neither clears the other's wakeup
+        self.arb_wake_event = threading.Event()
+        self.mg_wake_event = threading.Event()
+        self.start_user_stream()
+        
+        # Session tracking (balance + node health in one round trip)
+        self.starting_balance, block_number = self.get_chain_state()
+        log(f"⛓️ Polygon block: {block_number} | Balance: ${self.starting_balance:.2f}")
         self.session_trades = 0
         self.session_wins = 0
         self.session_losses = 0
+        self._stats_lock = threading.Lock()   # ARB and MG workers both record results
 
     def get_balance(self):
         """Get USDC.e balance from the trading address"""
         try:
-            raw_bal = self.usdc_contract.functions.balanceOf(TRADING_ADDRESS).call()
-            decimals = self.usdc_contract.functions.decimals().call()
-            return raw_bal / (10 ** decimals)
+            raw = self.w3.eth.call({'to': USDC_CHECKSUM, 'data': self._balanceof_calldata})
+            return int.from_bytes(raw, 'big') / (10 ** USDC_DECIMALS)
         except Exception as e:
-            print(f"⚠️ Balance error: {e}")
+            log(f"⚠️ Balance error: {e}")
             return 0.0
 
+    def get_chain_state(self):
+        """Get USDC.e balance and latest block number in a single batched JSON-RPC request"""
+        try:
+            with self.w3.batch_requests() as batch:
+                batch.add(self.w3.eth.call({'to': USDC_CHECKSUM, 'data': self._balanceof_calldata}))
+                batch.add(self.w3.eth.get_block_number())
+                raw, block_number = batch.execute()
+            return int.from_bytes(raw, 'big') / (10 ** USDC_DECIMALS), block_number
+        except Exception as e:
+            # Some public Polygon endpoints reject batches - fall back to single calls
+            log(f"⚠️ Batched RPC failed ({e}), falling back to single calls")
+            try:
+                return self.get_balance(), self.w3.eth.get_block_number()
+            except Exception:
+                return self.get_balance(), None
+
     def get_market_from_slug(self, slug):
-        """Get market details from a specific slug"""
+        """Get market details from a specific slug (cached per 15-minute bucket)"""
+        now = time.monotonic()
+        hit = self._slug_cache.get(slug)
+        if hit and now - hit[0] < SLUG_CACHE_TTL:
+            return hit[1]
+        
+        market = self.fetch_market_from_slug(slug)
+        if market:
+            # Drop stale entries so the cache stays bounded on long runs
+            for old_slug in [k for k, v in self._slug_cache.items() if now - v[0] > 2 * SLUG_CACHE_TTL]:
+                del self._slug_cache[old_slug]
+            self._slug_cache[slug] = (now, market)
+        return market
+
+    def fetch_market_from_slug(self, slug):
+        """Fetch market details for a slug from the Gamma API"""
         try:
-            url = f"https://gamma-api.polymarket.com/events?slug={slug}"
-            resp = requests.get(url, timeout=10).json()
+            url = GAMMA_EVENTS_URL.format(slug)
+            resp = orjson.loads(self.http.get(url, timeout=10).content)
             
             if not resp or len(resp) == 0:
                 return None
             
             event = resp[0]
             raw_ids = event['markets'][0].get('clobTokenIds')
-            clob_ids = json.loads(raw_ids) if isinstance(raw_ids, str) else raw_ids
+            clob_ids = orjson.loads(raw_ids) if isinstance(raw_ids, str) else raw_ids
             
             condition_id = event['markets'][0].get('conditionId')
             
+            # Window bounds are fixed per market - compute them once here instead of every tick
+            end_ts = int(slug.rsplit('-', 1)[-1]) + INTERVAL
+            
             return {
                 'slug': slug,
                 'yes_token': clob_ids[0],
                 'no_token': clob_ids[1],
                 'title': event.get('title', slug),
-                'condition_id': condition_id
+                'condition_id': condition_id,
+                'end_ts': end_ts,
+                'arb_open_ts': end_ts - ARB_ENTRY_WINDOW_START,
+                'arb_close_ts': end_ts - ARB_ENTRY_WINDOW_END,
+                'mg_open_ts': end_ts - MG_LOCK_WINDOW_END,
+                'mg_close_ts': end_ts - MG_LOCK_WINDOW_START
             }
         except Exception as e:
             return None
 
+    def book_to_arrays(self, book):
+        """Convert an order book into struct-of-arrays float64 form"""
+        asks = book.asks or []
+        bids = book.bids or []
+        arrays = {
+            'ask_px': np.array([o.price for o in asks], dtype=np.float64),
+            'ask_sz': np.array([o.size for o in asks], dtype=np.float64),
+            'bid_px': np.array([o.price for o in bids], dtype=np.float64),
+            'bid_sz': np.array([o.size for o in bids], dtype=np.float64)
+        }
+        return arrays
+
+    def get_book(self, token_id):
+        """Get order book arrays for a token, re-fetching at most once per BOOK_CACHE_TTL"""
+        hit = self._book_cache.get(token_id)
+        if hit and time.monotonic() - hit[0] < BOOK_CACHE_TTL:
+            return hit[1]
+        
+        time.sleep(0.1)  # Small delay to avoid rate limiting
+        arrays = self.book_to_arrays(self.client.get_order_book(token_id))
+        self._book_cache[token_id] = (time.monotonic(), arrays)
+        return arrays
+
     def get_best_ask(self, token_id):
         """Get cheapest available price"""
         try:
-            time.sleep(0.1)  # Small delay to avoid rate limiting
-            book = self.client.get_order_book(token_id)
-            if book.asks:
-                return min(float(o.price) for o in book.asks)
+            arrays = self.get_book(token_id)
+            if arrays['ask_px'].size:
+                return float(arrays['ask_px'].min())
             return None
         except:
             return None
@@ -220,10 +358,9 @@ class CombinedBTCBot:
     def get_best_bid(self, token_id):
         """Get best available selling price"""
         try:
-            time.sleep(0.1)  # Small delay to avoid rate limiting
-            book = self.client.get_order_book(token_id)
-            if book.bids:
-                return max(float(o.price) for o in book.bids)
+            arrays = self.get_book(token_id)
+            if arrays['bid_px'].size:
+                return float(arrays['bid_px'].max())
             return None
         except:
             return None
@@ -231,29 +368,22 @@ class CombinedBTCBot:
     def get_order_book_depth(self, token_id):
         """Get detailed order book information"""
         try:
-            time.sleep(0.1)  # Small delay to avoid rate limiting
-            book = self.client.get_order_book(token_id)
+            arrays = self.get_book(token_id)
+            ask_px, ask_sz, bid_px = arrays['ask_px'], arrays['ask_sz'], arrays['bid_px']
             
-            ask_depth = len(book.asks) if book.asks else 0
-            bid_depth = len(book.bids) if book.bids else 0
-            best_ask = min(float(o.price) for o in book.asks) if book.asks else None
-            best_bid = max(float(o.price) for o in book.bids) if book.bids else None
-            
-            ask_liquidity = 0
-            if book.asks and best_ask:
-                for order in book.asks:
-                    if float(order.price) == best_ask:
-                        ask_liquidity += float(order.size)
+            best_ask = float(ask_px.min()) if ask_px.size else None
+            best_bid = float(bid_px.max()) if bid_px.size else None
+            ask_liquidity = float(ask_sz[ask_px == best_ask].sum()) if best_ask else 0
             
             return {
                 'best_ask': best_ask,
                 'best_bid': best_bid,
-                'ask_depth': ask_depth,
-                'bid_depth': bid_depth,
+                'ask_depth': int(ask_px.size),
+                'bid_depth': int(bid_px.size),
                 'ask_liquidity': ask_liquidity
             }
         except Exception as e:
-            print(f"   ⚠️ Error getting order book: {e}")
+            log(f"   ⚠️ Error getting order book: {e}")
             return None
 
     def place_market_order(self, token_id, price, size, side):
@@ -265,10 +395,10 @@ class CombinedBTCBot:
             price = round(price, 2)
             
             if size < MIN_ORDER_SIZE:
-                print(f"   ⚠️ Order size {size} below minimum {MIN_ORDER_SIZE}")
+                log(f"   ⚠️ Order size {size} below minimum {MIN_ORDER_SIZE}")
                 return None
             
-            print(f"   🔧 Placing FOK {side} order: {size} shares @ ${price:.2f}")
+            log(f"   🔧 Placing FOK {side} order: {size} shares @ ${price:.2f}")
             
             resp = self.client.post_orders([
                 PostOrdersArgs(
@@ -287,18 +417,18 @@ class CombinedBTCBot:
                 
                 if order_result.get('success') or order_result.get('orderID'):
                     order_id = order_result.get('orderID', 'success')
-                    print(f"   ✅ FOK Order placed: {order_id}")
+                    log(f"   ✅ FOK Order placed: {order_id}")
                     return order_id
                 else:
                     error_msg = order_result.get('errorMsg') or order_result.get('error') or str(order_result)
-                    print(f"   ⚠️ FOK Order failed: {error_msg}")
+                    log(f"   ⚠️ FOK Order failed: {error_msg}")
                     return None
             else:
-                print(f"   ⚠️ Empty or invalid response")
+                log(f"   ⚠️ Empty or invalid response")
                 return None
                 
         except Exception as e:
-            print(f"   ❌ Order error: {e}")
+            log(f"   ❌ Order error: {e}")
             import traceback
             traceback.print_exc()
             return None
@@ -309,10 +439,10 @@ class CombinedBTCBot:
             price = round(price, 2)
             
             if size < MIN_ORDER_SIZE:
-                print(f"   ⚠️ Order size {size} below minimum {MIN_ORDER_SIZE}")
+                log(f"   ⚠️ Order size {size} below minimum {MIN_ORDER_SIZE}")
                 return None
             
-            print(f"   🔧 Placing GTC LIMIT {side} order: {size} shares @ ${price:.2f}")
+            log(f"   🔧 Placing GTC LIMIT {side} order: {size} shares @ ${price:.2f}")
             
             resp = self.client.post_orders([
                 PostOrdersArgs(
@@ -331,18 +461,18 @@ class CombinedBTCBot:
                 
                 if order_result.get('success') or order_result.get('orderID'):
                     order_id = order_result.get('orderID', 'success')
-                    print(f"   ✅ GTC Limit Order placed: {order_id}")
+                    log(f"   ✅ GTC Limit Order placed: {order_id}")
                     return order_id
                 else:
                     error_msg = order_result.get('errorMsg') or order_result.get('error') or str(order_result)
-                    print(f"   ⚠️ GTC Order failed: {error_msg}")
+                    log(f"   ⚠️ GTC Order failed: {error_msg}")
                     return None
             else:
-                print(f"   ⚠️ Empty or invalid response")
+                log(f"   ⚠️ Empty or invalid response")
                 return None
                 
         except Exception as e:
-            print(f"   ❌ Order error: {e}")
+            log(f"   ❌ Order error: {e}")
             import traceback
             traceback.print_exc()
             return None
@@ -351,21 +481,52 @@ class CombinedBTCBot:
         """Cancel an open order"""
         try:
             result = self.client.cancel(order_id)
-            print(f"   🗑️ Order {order_id} cancelled")
+            self.forget_order(order_id)
+            log(f"   🗑️ Order {order_id} cancelled")
             return True
         except Exception as e:
-            print(f"   ⚠️ Cancel failed: {e}")
+            log(f"   ⚠️ Cancel failed: {e}")
             return False
 
+    def cancel_and_replace(self, order_id, place, *args):
+        """Cancel a resting order and submit its replacement concurrently instead of cancel-sleep-place"""
+        if not order_id:
+            return place(*args)
+        
+        cancel_future = self.pool.submit(self.cancel_order, order_id)
+        place_future = self.pool.submit(place, *args)
+        cancel_future.result()
+        new_order = place_future.result()
+        
+        if not new_order:
+            # Replacement most likely hit the shares still locked by the old order - retry once the cancel has settled
+            time.sleep(CANCEL_REPLACE_RETRY_DELAY)
+            new_order = place(*args)
+        
+        return new_order
+
     def check_order_status(self, order_id):
         """Check if order has been filled and return the fill price"""
+        ev = self.order_events.get(order_id)
+        if ev and ev.is_set():
+            result = self.order_fills[order_id]
+            self.forget_order(order_id)
+            return result
+        
+        if self.user_stream_alive():
+            return False, None
+        
+        return self.check_order_status_rest(order_id)
+
+    def check_order_status_rest(self, order_id):
+        """Check order fill status over REST (fallback when the user stream is silent)"""
         try:
             order_details = self.client.get_order(order_id)
             
             if isinstance(order_details, dict):
                 status = order_details.get('status', '')
                 
-                if status in ['MATCHED', 'FILLED', 'COMPLETED']:
+                if status in FILL_STATUSES:
                     actual_price = None
                     
                     if 'price' in order_details:
@@ -382,19 +543,154 @@ class CombinedBTCBot:
         except Exception as e:
             return False, None
 
+    def wait_for_fill(self, order_id, timeout):
+        """Block until the user stream reports a fill (or timeout), then confirm via REST if needed"""
+        if self.get_order_event(order_id).wait(timeout):
+            result = self.order_fills[order_id]
+        else:
+            result = self.check_order_status_rest(order_id)
+        # Callers wait on FOK orders once - filled or killed, the order is done either way
+        self.forget_order(order_id)
+        return result
+
+    # ==========================================
+    # USER CHANNEL (ORDER FILLS)
+    # ==========================================
+    def get_order_event(self, order_id):
+        """Get (or create) the fill event for an order id"""
+        with self.order_lock:
+            ev = self.order_events.get(order_id)
+            if ev is None:
+                ev = threading.Event()
+                self.order_events[order_id] = ev
+            return ev
+
+    def forget_order(self, order_id):
+        """Drop an order's fill tracking once it has been consumed, killed or cancelled"""
+        with self.order_lock:
+            self.order_events.pop(order_id, None)
+            self.order_fills.pop(order_id, None)
+            self.finished_orders[order_id] = None
+            if len(self.finished_orders) > FINISHED_ORDERS_MEMORY:
+                self.finished_orders.popitem(last=False)
+
+    def record_fill(self, order_id, price):
+        """Store a fill pushed by the user channel and wake any waiter"""
+        if not order_id or not price or price <= 0:
+            return
+        if order_id in self.finished_orders:
+            return  # Late MINED/CONFIRMED echo of an order we are done with
+        ev = self.get_order_event(order_id)
+        if not ev.is_set():
+            self.order_fills[order_id] = (True, price)
+            ev.set()
+            self.arb_wake_event.set()
+            self.mg_wake_event.set()
+
+    def user_stream_alive(self):
+        """True if the user channel has spoken within USER_WS_STALE_AFTER seconds"""
+        return time.monotonic() - self.user_ws_last_msg < USER_WS_STALE_AFTER
+
+    def handle_user_event(self, event):
+        """Apply a single user-channel event (trade / order update)"""
+        event_type = event.get('event_type')
+        
+        if event_type == 'trade':
+            if event.get('status') not in ('MATCHED', 'MINED', 'CONFIRMED'):
+                return
+            self.record_fill(event.get('taker_order_id'), float(event.get('price') or 0))
+        
+        elif event_type == 'order':
+            order_id = event.get('id')
+            status = event.get('status', '')
+            size_matched = float(event.get('size_matched') or 0)
+            original_size = float(event.get('original_size') or 0)
+            
+            if status in FILL_STATUSES or (original_size > 0 and size_matched >= original_size):
+                self.record_fill(order_id, float(event.get('price') or 0))
+
+    def on_user_message(self, ws, message):
+        self.user_ws_last_msg = time.monotonic()
+        
+        if message == "PONG":
+            return
+        
+        try:
+            data = orjson.loads(message)
+        except ValueError:
+            return
+        
+        events = data if isinstance(data, list) else [data]
+        for event in events:
+            if isinstance(event, dict):
+                self.handle_user_event(event)
+
+    def on_user_open(self, ws):
+        creds = self.api_creds
+        ws.send(json.dumps({
+            "auth": {
+                "apiKey": creds.api_key,
+                "secret": creds.api_secret,
+                "passphrase": creds.api_passphrase
+            },
+            "markets": [],
+            "type": "user"
+        }))
+        self.user_ws_last_msg = time.monotonic()
+        
+        def keepalive():
+            while ws.sock and ws.sock.connected:
+                # Zombie guard: a connected socket that stopped talking gets recycled
+                if not self.user_stream_alive():
+                    log(f"\n   ⚠️ User stream silent for {USER_WS_STALE_AFTER}s - reconnecting")
+                    ws.close()
+                    return
+                try:
+                    ws.send("PING")
+                except Exception:
+                    return
+                time.sleep(USER_WS_PING_INTERVAL)
+        
+        threading.Thread(target=keepalive, daemon=True).start()
+
+    def user_stream_loop(self):
+        """Keep the user channel connected, reconnecting on drop"""
+        while True:
+            try:
+                ws = websocket.WebSocketApp(
+                    USER_WS_URL,
+                    on_open=self.on_user_open,
+                    on_message=self.on_user_message
+                )
+                ws.run_forever()
+            except Exception as e:
+                log(f"   ⚠️ User stream error: {e}")
+            time.sleep(1)
+
+    def start_user_stream(self):
+        """Start the user WebSocket channel in a background thread"""
+        threading.Thread(target=self.user_stream_loop, daemon=True).start()
+
     def get_actual_fill_price(self, order_id, max_retries=10):
         """Get the ACTUAL price the order was filled at"""
-        print(f"   🔍 Fetching actual fill price for order {order_id}...")
+        log(f"   🔍 Fetching actual fill price for order {order_id}...")
+        
+        ev = self.get_order_event(order_id)
         
         for attempt in range(max_retries):
             try:
-                time.sleep(1)
+                if ev.wait(1):
+                    actual_price = self.order_fills[order_id][1]
+                    log(f"   ✅ Actual fill price: ${actual_price:.4f}")
+                    self.forget_order(order_id)
+                    return actual_price
+                
                 order_details = self.client.get_order(order_id)
                 
                 if isinstance(order_details, dict):
                     status = order_details.get('status', '')
                     
-                    if status in ['MATCHED', 'FILLED', 'COMPLETED']:
+                    if status in FILL_STATUSES:
                         actual_price = None
                         
                         if 'price' in order_details:
@@ -409,25 +705,27 @@ class CombinedBTCBot:
                                 actual_price = total_cost / total_size
                         
                         if actual_price:
-                            print(f"   ✅ Actual fill price: ${actual_price:.4f}")
+                            log(f"   ✅ Actual fill price: ${actual_price:.4f}")
+                            self.forget_order(order_id)
                             return actual_price
                     
-                    print(f"   ⏳ Order status: {status}, retrying... ({attempt+1}/{max_retries})")
+                    log(f"   ⏳ Order status: {status}, retrying... ({attempt+1}/{max_retries})")
                 
             except Exception as e:
-                print(f"   ⚠️ Error fetching fill price (attempt {attempt+1}): {e}")
+                log(f"   ⚠️ Error fetching fill price (attempt {attempt+1}): {e}")
         
-        print(f"   ❌ Could not determine actual fill price after {max_retries} attempts")
+        log(f"   ❌ Could not determine actual fill price after {max_retries} attempts")
+        self.forget_order(order_id)
         return None
 
     def settle_market(self, condition_id):
         """Claim winnings from a settled market - DISABLED (method doesn't exist)"""
         try:
-            print(f"\n💰 Settlement skipped (API method not available)")
-            print(f"   Winnings will auto-settle after market resolves")
+            log(f"\n💰 Settlement skipped (API method not available)")
+            log(f"   Winnings will auto-settle after market resolves")
             return False
         except Exception as e:
-            print(f"   ⚠️ Settlement error: {e}")
+            log(f"   ⚠️ Settlement error: {e}")
             return False
 
     # ==========================================
@@ -444,36 +742,30 @@ class CombinedBTCBot:
             return "already_skipped"
         
         current_time = time.time()
-        seconds_until_close = (market_start_time + 900) - current_time
+        seconds_until_close = market['end_ts'] - current_time
         
         # Check entry window
-        if seconds_until_close >= ARB_ENTRY_WINDOW_START:
-            print(f"⏳ [ARB] Waiting for entry window ({int(seconds_until_close)}s > {ARB_ENTRY_WINDOW_START}s)", end="\r")
+        if current_time <= market['arb_open_ts']:
+            log(f"⏳ [ARB] Waiting for entry window ({int(seconds_until_close)}s > {ARB_ENTRY_WINDOW_START}s)", end="\r")
             return "waiting_for_entry_window"
         
-        if seconds_until_close < ARB_ENTRY_WINDOW_END:
+        if current_time > market['arb_close_ts']:
             if slug not in self.skipped_markets_arb:
-                print(f"\n⏰ [ARB] Entry window closed! ({int(seconds_until_close)}s < {ARB_ENTRY_WINDOW_END}s)")
-                print(f"   Skipping this market, waiting for next one...\n")
+                log(f"\n⏰ [ARB] Entry window closed! ({int(seconds_until_close)}s < {ARB_ENTRY_WINDOW_END}s)")
+                log(f"   Skipping this market, waiting for next one...\n")
                 self.skipped_markets_arb.add(slug)
             return "entry_window_closed"
         
         # BLOCK MID-GAME STRATEGY
         self.active_arbitrage = True
         
-        print(f"\n{'='*60}")
-        print(f"🎯 ARBITRAGE ENTRY WINDOW ACTIVE")
-        print(f"{'='*60}")
-        print(f"Market: {market['title']}")
-        print(f"Seconds until close: {int(seconds_until_close)}")
-        
-        # Get order book information
-        print(f"\n📊 Analyzing order books...")
-        yes_book = self.get_order_book_depth(market['yes_token'])
-        no_book = self.get_order_book_depth(market['no_token'])
+        # Get order book information (banner is printed only once an entry qualifies)
+        yes_future = self.pool.submit(self.get_order_book_depth, market['yes_token'])
+        no_future = self.pool.submit(self.get_order_book_depth, market['no_token'])
+        yes_book, no_book = yes_future.result(timeout=5), no_future.result(timeout=5)
         
         if not yes_book or not no_book:
-            print("⚠️ Cannot get order book data, retrying...")
+            log("⚠️ Cannot get order book data, retrying...")
             self.active_arbitrage = False
             return "no_orderbook"
         
@@ -481,14 +773,10 @@ class CombinedBTCBot:
         no_ask = no_book['best_ask']
         
         if not yes_ask or not no_ask:
-            print("⚠️ Cannot get prices, retrying...")
+            log("⚠️ Cannot get prices, retrying...")
             self.active_arbitrage = False
             return "no_prices"
         
-        print(f"\n📊 Current Market State:")
-        print(f"   YES: ${yes_ask:.2f} (liquidity: {yes_book['ask_liquidity']:.2f})")
-        print(f"   NO:  ${no_ask:.2f} (liquidity: {no_book['ask_liquidity']:.2f})")
-        
         # Determine which side to buy (lowest price, must be between 0.40 and 0.48)
         first_buy_side = None
         first_buy_token = None
@@ -523,58 +811,66 @@ class CombinedBTCBot:
             first_buy_book = no_book
         
         if not first_buy_side:
-            print(f"⏳ No side qualifies (must be ${ARB_MIN_FIRST_PRICE:.2f} - ${ARB_MAX_FIRST_PRICE:.2f}), waiting {ARB_RETRY_DELAY}s...")
+            log(f"⏳ [ARB] YES: ${yes_ask:.2f} | NO: ${no_ask:.2f} - no side qualifies (must be ${ARB_MIN_FIRST_PRICE:.2f} - ${ARB_MAX_FIRST_PRICE:.2f}), waiting {ARB_RETRY_DELAY}s...")
             time.sleep(ARB_RETRY_DELAY)
             self.active_arbitrage = False
             return "no_opportunity"
         
         # Check liquidity
         if first_buy_book['ask_liquidity'] < ARB_POSITION_SIZE:
-            print(f"⚠️ Insufficient liquidity on {first_buy_side}: {first_buy_book['ask_liquidity']:.2f} < {ARB_POSITION_SIZE}")
-            print(f"   Waiting {ARB_RETRY_DELAY}s...")
+            log(f"⚠️ Insufficient liquidity on {first_buy_side}: {first_buy_book['ask_liquidity']:.2f} < {ARB_POSITION_SIZE}")
+            log(f"   Waiting {ARB_RETRY_DELAY}s...")
             time.sleep(ARB_RETRY_DELAY)
             self.active_arbitrage = False
             return "insufficient_liquidity"
         
-        print(f"\n✅ First Buy Opportunity:")
-        print(f"   Side: {first_buy_side}")
-        print(f"   Price: ${first_buy_price:.2f}")
-        print(f"   Available liquidity: {first_buy_book['ask_liquidity']:.2f} shares")
+        log(f"\n{'='*60}")
+        log(f"🎯 ARBITRAGE ENTRY WINDOW ACTIVE")
+        log(f"{'='*60}")
+        log(f"Market: {market['title']}")
+        log(f"Seconds until close: {int(seconds_until_close)}")
+        
+        log(f"\n📊 Current Market State:")
+        log(f"   YES: ${yes_ask:.2f} (liquidity: {yes_book['ask_liquidity']:.2f})")
+        log(f"   NO:  ${no_ask:.2f} (liquidity: {no_book['ask_liquidity']:.2f})")
+        
+        log(f"\n✅ First Buy Opportunity:")
+        log(f"   Side: {first_buy_side}")
+        log(f"   Price: ${first_buy_price:.2f}")
+        log(f"   Available liquidity: {first_buy_book['ask_liquidity']:.2f} shares")
         
         # Execute first buy
-        print(f"\n⚡ Executing FIRST BUY ORDER (FOK - {first_buy_side})...")
+        log(f"\n⚡ Executing FIRST BUY ORDER (FOK - {first_buy_side})...")
         first_order_id = self.place_market_order(first_buy_token, first_buy_price, ARB_POSITION_SIZE, BUY)
         
         if not first_order_id:
-            print("\n❌ First FOK order failed! Retrying...")
+            log("\n❌ First FOK order failed! Retrying...")
             time.sleep(ARB_RETRY_DELAY)
             self.active_arbitrage = False
             return "first_order_failed"
         
-        time.sleep(1)
-        
         # Verify first order fill
-        first_filled, actual_first_price = self.check_order_status(first_order_id)
+        first_filled, actual_first_price = self.wait_for_fill(first_order_id, 1)
         
         if not first_filled or not actual_first_price:
-            print("⚠️ FOK order execution verification failed. Aborting trade cycle.")
+            log("⚠️ FOK order execution verification failed. Aborting trade cycle.")
             self.traded_markets_arb.add(slug)
             self.active_arbitrage = False
             return "first_order_failed"
         
-        print(f"✅ FIRST ORDER FILLED ({ARB_POSITION_SIZE} shares)!")
-        first_order_time = time.time()
-        print(f"   Actual fill: ${actual_first_price:.2f}")
+        log(f"✅ FIRST ORDER FILLED ({ARB_POSITION_SIZE} shares)!")
+        first_order_time = time.monotonic()
+        log(f"   Actual fill: ${actual_first_price:.2f}")
         
         # Now place GTC LIMIT SELL ORDER
-        print(f"\n🔄 PLACING GTC LIMIT SELL ORDER...")
-        print(f"   Strategy: Place limit order at profitable price, monitor and adjust")
+        log(f"\n🔄 PLACING GTC LIMIT SELL ORDER...")
+        log(f"   Strategy: Place limit order at profitable price, monitor and adjust")
         
         # Determine the opposite token (the one we didn't buy)
         opposite_token = market['yes_token'] if first_buy_side == "NO" else market['no_token']
         opposite_side = "YES" if first_buy_side == "NO" else "NO"
         
-        start_sell_time = time.time()
+        start_sell_time = time.monotonic()
         stop_loss_active_time = first_order_time + ARB_STOP_LOSS_DELAY
         stop_loss_price = max(actual_first_price - ARB_STOP_LOSS_OFFSET, 0.01)
         
@@ -582,28 +878,31 @@ class CombinedBTCBot:
         last_sell_price = None
         
         while True:
-            elapsed = time.time() - start_sell_time
+            self.arb_wake_event.clear()
+            elapsed = time.monotonic() - start_sell_time
             
             if elapsed >= ARB_SELL_TIMEOUT:
-                print(f"\n\n⏰ Sell timeout ({ARB_SELL_TIMEOUT}s reached)")
-                print(f"   Cancelling any open orders and executing emergency exit...")
+                log(f"\n\n⏰ Sell timeout ({ARB_SELL_TIMEOUT}s reached)")
+                log(f"   Cancelling any open orders and executing emergency exit...")
                 
-                if current_sell_order_id:
-                    self.cancel_order(current_sell_order_id)
+                # Cancel and price lookup are independent - run them together
+                cancel_future = self.pool.submit(self.cancel_order, current_sell_order_id) if current_sell_order_id else None
+                ask_future = self.pool.submit(self.get_best_ask, opposite_token)
+                if cancel_future:
+                    cancel_future.result()
                 
                 # Emergency market sell
-                opposite_ask = self.get_best_ask(opposite_token)
+                opposite_ask = ask_future.result()
                 if opposite_ask:
                     sell_price = min(opposite_ask, 0.99)
                     emergency_order = self.place_market_order(first_buy_token, sell_price, ARB_POSITION_SIZE, SELL)
                     
                     if emergency_order:
-                        time.sleep(2)
-                        filled, final_price = self.check_order_status(emergency_order)
+                        filled, final_price = self.wait_for_fill(emergency_order, 2)
                         if filled and final_price:
                             result = (final_price - actual_first_price) * ARB_POSITION_SIZE
-                            print(f"   📊 Emergency exit completed")
-                            print(f"   Final P&L: ${result:+.2f}")
+                            log(f"   📊 Emergency exit completed")
+                            log(f"   Final P&L: ${result:+.2f}")
                 
                 self.traded_markets_arb.add(slug)
                 self.active_arbitrage = False
@@ -614,19 +913,14 @@ class CombinedBTCBot:
                 sell_filled, actual_sell_price = self.check_order_status(current_sell_order_id)
                 
                 if sell_filled and actual_sell_price:
-                    print(f"\n\n🎉 SELL ORDER FILLED!")
-                    print(f"{'='*60}")
-                    print(f"   Buy:  {first_buy_side} @ ${actual_first_price:.2f}")
-                    print(f"   Sell: {first_buy_side} @ ${actual_sell_price:.2f}")
-                    print(f"   P&L: ${(actual_sell_price - actual_first_price) * ARB_POSITION_SIZE:+.2f}")
-                    print(f"{'='*60}")
-                    
-                    if actual_sell_price > actual_first_price:
-                        self.session_wins += 1
-                    else:
-                        self.session_losses += 1
+                    log(f"\n\n🎉 SELL ORDER FILLED!")
+                    log(f"{'='*60}")
+                    log(f"   Buy:  {first_buy_side} @ ${actual_first_price:.2f}")
+                    log(f"   Sell: {first_buy_side} @ ${actual_sell_price:.2f}")
+                    log(f"   P&L: ${(actual_sell_price - actual_first_price) * ARB_POSITION_SIZE:+.2f}")
+                    log(f"{'='*60}")
                     
-                    self.session_trades += 1
+                    self.record_result(actual_sell_price > actual_first_price)
                     self.traded_markets_arb.add(slug)
                     self.active_arbitrage = False
                     return "arbitrage_complete"
@@ -637,28 +931,23 @@ class CombinedBTCBot:
             
             if opposite_ask and current_bid:
                 # Check stop loss (only after delay)
-                time_until_sl = stop_loss_active_time - time.time()
+                time_until_sl = stop_loss_active_time - time.monotonic()
                 
                 if time_until_sl <= 0 and opposite_ask <= stop_loss_price:
-                    print(f"\n\n🛑 STOP LOSS TRIGGERED at ${opposite_ask:.2f}!")
-                    print(f"   Cancelling open order and executing stop loss...")
+                    log(f"\n\n🛑 STOP LOSS TRIGGERED at ${opposite_ask:.2f}!")
+                    log(f"   Cancelling open order and executing stop loss...")
                     
-                    if current_sell_order_id:
-                        self.cancel_order(current_sell_order_id)
-                    
-                    # Execute stop loss with FOK
-                    sl_order = self.place_market_order(first_buy_token, opposite_ask, ARB_POSITION_SIZE, SELL)
+                    # Execute stop loss with FOK, fired alongside the cancel
+                    sl_order = self.cancel_and_replace(current_sell_order_id, self.place_market_order, first_buy_token, opposite_ask, ARB_POSITION_SIZE, SELL)
                     
                     if sl_order:
-                        time.sleep(2)
-                        filled, final_price = self.check_order_status(sl_order)
+                        filled, final_price = self.wait_for_fill(sl_order, 2)
                         if filled and final_price:
                             loss = (actual_first_price - final_price) * ARB_POSITION_SIZE
-                            print(f"   📉 Stop loss executed")
-                            print(f"   Loss: -${loss:.2f}")
+                            log(f"   📉 Stop loss executed")
+                            log(f"   Loss: -${loss:.2f}")
                     
-                    self.session_losses += 1
-                    self.session_trades += 1
+                    self.record_result(False)
                     self.traded_markets_arb.add(slug)
                     self.active_arbitrage = False
                     return "stop_loss"
@@ -668,22 +957,18 @@ class CombinedBTCBot:
                 
                 # Only place/update order if price has changed
                 if optimal_sell_price != last_sell_price:
-                    # Cancel existing order if any
-                    if current_sell_order_id:
-                        self.cancel_order(current_sell_order_id)
-                        time.sleep(0.5)
-                    
-                    # Place new GTC limit sell order
-                    print(f"\n   📝 Placing GTC sell @ ${optimal_sell_price:.2f} (matching {opposite_side} ask)")
-                    current_sell_order_id = self.place_limit_order(first_buy_token, optimal_sell_price, ARB_POSITION_SIZE, SELL)
+                    # Replace existing order (if any) with a new GTC limit sell order
+                    log(f"\n   📝 Placing GTC sell @ ${optimal_sell_price:.2f} (matching {opposite_side} ask)")
+                    current_sell_order_id = self.cancel_and_replace(current_sell_order_id, self.place_limit_order, first_buy_token, optimal_sell_price, ARB_POSITION_SIZE, SELL)
                     last_sell_price = optimal_sell_price
                 
                 estimated_pnl = (optimal_sell_price - actual_first_price) * ARB_POSITION_SIZE
-                print(f"   💹 Current: ${current_bid:.2f} | Target: ${optimal_sell_price:.2f} | Entry: ${actual_first_price:.2f} | Est P&L: ${estimated_pnl:+.2f} | Time: {int(ARB_SELL_TIMEOUT - elapsed)}s", end="\r")
+                log(f"   💹 Current: ${current_bid:.2f} | Target: ${optimal_sell_price:.2f} | Entry: ${actual_first_price:.2f} | Est P&L: ${estimated_pnl:+.2f} | Time: {int(ARB_SELL_TIMEOUT - elapsed)}s", end="\r")
             
-            time.sleep(CHECK_INTERVAL)
+            # Wake early on any stream update (e.g. our sell filling), else re-poll after CHECK_INTERVAL
+            self.arb_wake_event.wait(timeout=CHECK_INTERVAL)
         
-        self.session_trades += 1
+        self.record_result(None)
         self.traded_markets_arb.add(slug)
         self.active_arbitrage = False
         return "sell_timeout"
@@ -704,53 +989,55 @@ class CombinedBTCBot:
         initial_sl_price = max(entry_price - MG_STOP_LOSS_SPREAD, 0.01)
         
         dynamic_sl_delay = self.calculate_dynamic_sl_delay(entry_time, market_end_time)
-        stop_loss_active_time = entry_time + dynamic_sl_delay
+        
+        # Convert wall-clock deadlines to the monotonic clock once so NTP jumps can't skew SL timing
+        mono_offset = time.monotonic() - time.time()
+        stop_loss_active_time = entry_time + dynamic_sl_delay + mono_offset
+        market_end_mono = market_end_time + mono_offset
         
         trailing_stop = initial_sl_price
         highest_bid = entry_price
         trailing_activated = False
         
-        print(f"\n🎯 Exit Targets (DYNAMIC TRAILING STOP):")
-        print(f"   Entry: ${entry_price:.4f}")
-        print(f"   🚀 Take Profit: ${tp_price:.4f} (+${MG_TAKE_PROFIT_SPREAD:.2f})")
-        print(f"   🛡️ Initial Stop Loss: ${initial_sl_price:.4f} (-${MG_STOP_LOSS_SPREAD:.2f})")
-        print(f"   📈 Trailing activates after +${MG_MIN_PROFIT_FOR_TRAILING:.2f} profit")
-        print(f"   📈 Trailing Stop: Locks in {int(MG_TRAILING_PROFIT_LOCK*100)}% of gains above entry")
-        print(f"   ⏰ Dynamic SL Activation: {int(dynamic_sl_delay)}s from entry")
+        log(f"\n🎯 Exit Targets (DYNAMIC TRAILING STOP):")
+        log(f"   Entry: ${entry_price:.4f}")
+        log(f"   🚀 Take Profit: ${tp_price:.4f} (+${MG_TAKE_PROFIT_SPREAD:.2f})")
+        log(f"   🛡️ Initial Stop Loss: ${initial_sl_price:.4f} (-${MG_STOP_LOSS_SPREAD:.2f})")
+        log(f"   📈 Trailing activates after +${MG_MIN_PROFIT_FOR_TRAILING:.2f} profit")
+        log(f"   📈 Trailing Stop: Locks in {int(MG_TRAILING_PROFIT_LOCK*100)}% of gains above entry")
+        log(f"   ⏰ Dynamic SL Activation: {int(dynamic_sl_delay)}s from entry")
         
         while True:
-            time.sleep(CHECK_INTERVAL + MG_REQUEST_DELAY)  # Add delay to avoid rate limiting
-            current_time = time.time()
+            self.mg_wake_event.clear()
+            self.mg_wake_event.wait(timeout=CHECK_INTERVAL + MG_REQUEST_DELAY)  # Add delay to avoid rate limiting
+            current_time = time.monotonic()
+            current_bid = self.get_best_bid(token_id)  # One book fetch per tick, shared by every branch
             
-            time_until_end = market_end_time - current_time
+            time_until_end = market_end_mono - current_time
             if time_until_end <= MG_STOP_LOSS_BUFFER_TIME:
-                print(f"\n\n⏰ Entering final 3 minutes - forcing exit at market price")
-                current_bid = self.get_best_bid(token_id)
+                log(f"\n\n⏰ Entering final 3 minutes - forcing exit at market price")
                 if current_bid:
-                    print("   Executing final market exit...")
-                    time.sleep(MG_REQUEST_DELAY)
+                    log("   Executing final market exit...")
                     self.place_market_order(token_id, current_bid - 0.01, size, SELL)
                     pnl = (current_bid - entry_price) * size
-                    print(f"   📊 Position closed (time-based exit)")
-                    print(f"   P&L: ${pnl:+.2f}")
+                    log(f"   📊 Position closed (time-based exit)")
+                    log(f"   P&L: ${pnl:+.2f}")
                     return "time_exit"
             
-            current_bid = self.get_best_bid(token_id)
-            
             if current_bid:
                 # CHECK TAKE PROFIT FIRST (before updating highest_bid)
                 # Use a buffer to trigger slightly before the exact TP price
                 tp_trigger_threshold = tp_price - 0.005  # Trigger 0.5 cents before TP
                 
                 if current_bid >= tp_trigger_threshold:
-                    print(f"\n\n💰 TAKE PROFIT TRIGGERED at ${current_bid:.2f}!")
-                    print(f"   (Target was ${tp_price:.2f}, triggered at ${tp_trigger_threshold:.2f})")
-                    print("   Executing Take Profit sell...")
+                    log(f"\n\n💰 TAKE PROFIT TRIGGERED at ${current_bid:.2f}!")
+                    log(f"   (Target was ${tp_price:.2f}, triggered at ${tp_trigger_threshold:.2f})")
+                    log("   Executing Take Profit sell...")
                     time.sleep(MG_REQUEST_DELAY)
                     self.place_market_order(token_id, current_bid, size, SELL)
                     profit = (current_bid - entry_price) * size
-                    print(f"   📈 Position closed at profit!")
-                    print(f"   Profit: +${profit:.2f}")
+                    log(f"   📈 Position closed at profit!")
+                    log(f"   Profit: +${profit:.2f}")
                     return "take_profit"
                 
                 # Update trailing stop logic - only activate after minimum profit
@@ -762,7 +1049,7 @@ class CombinedBTCBot:
                 # Only activate trailing stop if we've made minimum profit
                 if profit_from_entry >= MG_MIN_PROFIT_FOR_TRAILING:
                     if not trailing_activated:
-                        print(f"\n\n   🎯 TRAILING STOP ACTIVATED! (Profit: +${profit_from_entry:.2f})")
+                        log(f"\n\n   🎯 TRAILING STOP ACTIVATED! (Profit: +${profit_from_entry:.2f})")
                         trailing_activated = True
                     
                     locked_profit = entry_price + (profit_from_entry * MG_TRAILING_PROFIT_LOCK)
@@ -777,7 +1064,7 @@ class CombinedBTCBot:
     def execute_mid_game_lock(self, market, market_start_time):
         """Execute mid-game lock strategy - BLOCKED during active arbitrage"""
         slug = market['slug']
-        market_end_time = market_start_time + 900
+        market_end_time = market['end_ts']
         
         # BLOCK if arbitrage is active
         if self.active_arbitrage:
@@ -787,11 +1074,12 @@ class CombinedBTCBot:
             return "already_traded"
         
         current_time = time.time()
-        time_remaining = market_end_time - current_time
         
-        if time_remaining < MG_LOCK_WINDOW_START or time_remaining > MG_LOCK_WINDOW_END:
+        if current_time < market['mg_open_ts'] or current_time > market['mg_close_ts']:
             return "outside_window"
         
+        time_remaining = market_end_time - current_time
+        
         yes_price = self.get_best_ask(market['yes_token'])
         no_price = self.get_best_ask(market['no_token'])
         
@@ -800,7 +1088,7 @@ class CombinedBTCBot:
         
         minutes_remaining = int(time_remaining // 60)
         seconds_remaining = int(time_remaining % 60)
-        print(f"📊 [MG] [{minutes_remaining}m {seconds_remaining}s] YES: ${yes_price:.2f} | NO: ${no_price:.2f}", end="\r")
+        log(f"📊 [MG] [{minutes_remaining}m {seconds_remaining}s] YES: ${yes_price:.2f} | NO: ${no_price:.2f}", end="\r")
         
         entry_token = None
         entry_side = None
@@ -827,205 +1115,231 @@ class CombinedBTCBot:
         else:
             return "no_opportunity"
         
-        print(f"\n\n{'='*60}")
-        print(f"🎯 MID-GAME LOCK TRIGGERED - {entry_side}")
-        print(f"{'='*60}")
+        log(f"\n\n{'='*60}")
+        log(f"🎯 MID-GAME LOCK TRIGGERED - {entry_side}")
+        log(f"{'='*60}")
         
         balance = self.get_balance()
         required = entry_price * order_size
         
         if balance < required:
-            print(f"❌ Insufficient funds. Need ${required:.2f}, have ${balance:.2f}")
+            log(f"❌ Insufficient funds. Need ${required:.2f}, have ${balance:.2f}")
             if market.get('condition_id'):
                 self.settle_market(market['condition_id'])
                 time.sleep(2)
                 balance = self.get_balance()
                 if balance < required:
-                    print(f"   Still insufficient after settlement: ${balance:.2f}")
+                    log(f"   Still insufficient after settlement: ${balance:.2f}")
                     self.traded_markets_mg.add(slug)
                     return "insufficient_funds"
                 else:
-                    print(f"   ✅ Balance restored: ${balance:.2f}")
+                    log(f"   ✅ Balance restored: ${balance:.2f}")
         
-        print(f"Market: {market['title']}")
-        print(f"Time Remaining: {minutes_remaining}m {seconds_remaining}s")
-        print(f"📊 YES: ${yes_price:.2f} | NO: ${no_price:.2f}")
-        print(f"📈 Entry Side: {entry_side} @ ${entry_price:.2f}")
+        log(f"Market: {market['title']}")
+        log(f"Time Remaining: {minutes_remaining}m {seconds_remaining}s")
+        log(f"📊 YES: ${yes_price:.2f} | NO: ${no_price:.2f}")
+        log(f"📈 Entry Side: {entry_side} @ ${entry_price:.2f}")
         
-        print(f"\n⚡ Placing ENTRY order...")
+        log(f"\n⚡ Placing ENTRY order...")
         entry_id = self.place_market_order(entry_token, entry_price, order_size, BUY)
         
         if not entry_id:
-            print("❌ Entry failed")
+            log("❌ Entry failed")
             return "entry_failed"
         
-        print(f"✅ ENTRY ORDER PLACED! Order ID: {entry_id}")
+        log(f"✅ ENTRY ORDER PLACED! Order ID: {entry_id}")
         
-        print(f"\n🔍 Verifying actual fill price...")
+        log(f"\n🔍 Verifying actual fill price...")
         actual_entry_price = self.get_actual_fill_price(entry_id)
         
         if not actual_entry_price:
-            print(f"⚠️ Could not verify fill price, using fallback...")
+            log(f"⚠️ Could not verify fill price, using fallback...")
             time.sleep(2)
             actual_entry_price = self.get_best_bid(entry_token)
             
             if not actual_entry_price:
-                print("❌ Critical: Cannot determine entry price. Aborting trade.")
+                log("❌ Critical: Cannot determine entry price. Aborting trade.")
                 self.place_market_order(entry_token, 0.01, order_size, SELL)
                 return "entry_failed"
         
         slippage = abs(actual_entry_price - entry_price)
-        print(f"\n📊 ENTRY ANALYSIS:")
-        print(f"   Intended: ${entry_price:.4f}")
-        print(f"   Actual:   ${actual_entry_price:.4f}")
-        print(f"   Slippage: ${slippage:.4f} ({(slippage/entry_price)*100:.2f}%)")
+        log(f"\n📊 ENTRY ANALYSIS:")
+        log(f"   Intended: ${entry_price:.4f}")
+        log(f"   Actual:   ${actual_entry_price:.4f}")
+        log(f"   Slippage: ${slippage:.4f} ({(slippage/entry_price)*100:.2f}%)")
         
         if slippage > MG_MAX_ACCEPTABLE_SLIPPAGE:
-            print(f"\n🚨 EXCESSIVE SLIPPAGE DETECTED!")
-            print(f"   Exiting trade immediately...")
+            log(f"\n🚨 EXCESSIVE SLIPPAGE DETECTED!")
+            log(f"   Exiting trade immediately...")
             current_bid = self.get_best_bid(entry_token)
             if current_bid:
                 self.place_market_order(entry_token, current_bid - 0.01, order_size, SELL)
             self.traded_markets_mg.add(slug)
             return "excessive_slippage"
         
-        print(f"\n💎 Active position management: DYNAMIC TRAILING STOP...")
+        log(f"\n💎 Active position management: DYNAMIC TRAILING STOP...")
         entry_time = time.time()
         result = self.monitor_with_trailing_stop(entry_token, actual_entry_price, order_size, entry_time, market_end_time)
         
-        self.session_trades += 1
-        if result in ["take_profit", "time_exit"]:
-            self.session_wins += 1
-        else:
-            self.session_losses += 1
+        self.record_result(result in ["take_profit", "time_exit"])
         
         current_balance = self.get_balance()
         session_pnl = current_balance - self.starting_balance
-        win_rate = (self.session_wins / self.session_trades * 100) if self.session_trades > 0 else 0
+        trades, wins, losses = self.session_counts()
+        win_rate = (wins / trades * 100) if trades > 0 else 0
         
-        print(f"\n📊 SESSION STATS:")
-        print(f"   Starting Balance: ${self.starting_balance:.2f}")
-        print(f"   Current Balance: ${current_balance:.2f}")
-        print(f"   Session P&L: ${session_pnl:+.2f}")
-        print(f"   Trades: {self.session_trades} | Wins: {self.session_wins} | Losses: {self.session_losses}")
-        print(f"   Win Rate: {win_rate:.1f}%")
+        log(f"\n📊 SESSION STATS:")
+        log(f"   Starting Balance: ${self.starting_balance:.2f}")
+        log(f"   Current Balance: ${current_balance:.2f}")
+        log(f"   Session P&L: ${session_pnl:+.2f}")
+        log(f"   Trades: {trades} | Wins: {wins} | Losses: {losses}")
+        log(f"   Win Rate: {win_rate:.1f}%")
         
         if market.get('condition_id'):
-            print(f"\n💰 Attempting immediate settlement...")
+            log(f"\n💰 Attempting immediate settlement...")
             time.sleep(5)
             self.settle_market(market['condition_id'])
         
         self.traded_markets_mg.add(slug)
-        print(f"\n✅ Trade cycle complete!\n")
+        log(f"\n✅ Trade cycle complete!\n")
         
         return "traded"
 
+    def record_result(self, win):
+        """Count a finished trade in the session stats (win=None: counted, neither win nor loss)"""
+        with self._stats_lock:
+            self.session_trades += 1
+            if win is None:
+                return
+            if win:
+                self.session_wins += 1
+            else:
+                self.session_losses += 1
+
+    def session_counts(self):
+        """Consistent (trades, wins, losses) snapshot"""
+        with self._stats_lock:
+            return self.session_trades, self.session_wins, self.session_losses
+
+    def strategy_worker(self, name, execute, done_statuses):
+        """Evaluate one strategy against the active market until the process exits"""
+        while True:
+            try:
+                active = self.active_market
+                if not active:
+                    time.sleep(CHECK_INTERVAL)
+                    continue
+                
+                market, market_timestamp = active
+                status = execute(market, market_timestamp)
+                
+                if status in done_statuses:
+                    log(f"\n✅ [{name}] Trade cycle complete!")
+                    time.sleep(5)
+                elif status == "already_traded":
+                    # Nothing left to do on this market - idle until the run loop rolls it
+                    while self.active_market is active:
+                        time.sleep(CHECK_INTERVAL)
+                else:
+                    time.sleep(CHECK_INTERVAL)
+            
+            except Exception as e:
+                log(f"\n❌ [{name}] Error: {e}")
+                import traceback
+                traceback.print_exc()
+                time.sleep(10)
+
     def run(self):
         """Main bot loop"""
-        print(f"🚀 Bot is now running...")
-        print(f"\n📋 STRATEGY CONFIGURATION:")
+        log(f"🚀 Bot is now running...")
+        log(f"\n📋 STRATEGY CONFIGURATION:")
         
         if STRATEGY_MODE in ["ARBITRAGE", "BOTH"]:
-            print(f"\n🎯 ARBITRAGE STRATEGY:")
-            print(f"   Entry Window: {ARB_ENTRY_WINDOW_START}s to {ARB_ENTRY_WINDOW_END}s remaining")
-            print(f"   Entry Range: ${ARB_MIN_FIRST_PRICE:.2f} - ${ARB_MAX_FIRST_PRICE:.2f}")
-            print(f"   Position: {ARB_POSITION_SIZE} shares")
-            print(f"   Strategy: Buy lowest side, place GTC limit sell order")
-            print(f"   Sell Timeout: {ARB_SELL_TIMEOUT}s")
-            print(f"   Stop Loss: -${ARB_STOP_LOSS_OFFSET:.2f} (after {ARB_STOP_LOSS_DELAY}s)")
+            log(f"\n🎯 ARBITRAGE STRATEGY:")
+            log(f"   Entry Window: {ARB_ENTRY_WINDOW_START}s to {ARB_ENTRY_WINDOW_END}s remaining")
+            log(f"   Entry Range: ${ARB_MIN_FIRST_PRICE:.2f} - ${ARB_MAX_FIRST_PRICE:.2f}")
+            log(f"   Position: {ARB_POSITION_SIZE} shares")
+            log(f"   Strategy: Buy lowest side, place GTC limit sell order")
+            log(f"   Sell Timeout: {ARB_SELL_TIMEOUT}s")
+            log(f"   Stop Loss: -${ARB_STOP_LOSS_OFFSET:.2f} (after {ARB_STOP_LOSS_DELAY}s)")
         
         if STRATEGY_MODE in ["MID_GAME", "BOTH"]:
-            print(f"\n🎯 MID-GAME LOCK STRATEGY:")
-            print(f"   Entry Window: {MG_LOCK_WINDOW_START}s to {MG_LOCK_WINDOW_END}s remaining")
-            print(f"   Entry: ${MG_MIN_ENTRY_PRICE:.2f}+ on either side")
-            print(f"   Position: {MG_ORDER_SIZE} shares")
-            print(f"   Take Profit: +${MG_TAKE_PROFIT_SPREAD:.2f}")
-            print(f"   Stop Loss: -${MG_STOP_LOSS_SPREAD:.2f} (dynamic)")
-            print(f"   Trailing: {int(MG_TRAILING_PROFIT_LOCK*100)}% profit lock")
-            print(f"   ⚠️ BLOCKED during active arbitrage trades")
+            log(f"\n🎯 MID-GAME LOCK STRATEGY:")
+            log(f"   Entry Window: {MG_LOCK_WINDOW_START}s to {MG_LOCK_WINDOW_END}s remaining")
+            log(f"   Entry: ${MG_MIN_ENTRY_PRICE:.2f}+ on either side")
+            log(f"   Position: {MG_ORDER_SIZE} shares")
+            log(f"   Take Profit: +${MG_TAKE_PROFIT_SPREAD:.2f}")
+            log(f"   Stop Loss: -${MG_STOP_LOSS_SPREAD:.2f} (dynamic)")
+            log(f"   Trailing: {int(MG_TRAILING_PROFIT_LOCK*100)}% profit lock")
+            log(f"   ⚠️ BLOCKED during active arbitrage trades")
+        
+        log(f"\n")
+        
+        # Each strategy runs on its own thread so a long-running trade in one never stalls the other
+        workers = []
+        if STRATEGY_MODE in ["ARBITRAGE", "BOTH"]:
+            workers.append(("ARB", self.execute_arbitrage_strategy, ["arbitrage_complete", "stop_loss", "sell_timeout"]))
+        if STRATEGY_MODE in ["MID_GAME", "BOTH"]:
+            workers.append(("MG", self.execute_mid_game_lock, ["traded"]))
         
-        print(f"\n")
+        for name, execute, done_statuses in workers:
+            threading.Thread(target=self.strategy_worker, args=(name, execute, done_statuses), daemon=True).start()
         
         current_market = None
         
         while True:
             try:
-                now_utc = datetime.now(timezone.utc)
-                current_timestamp = int(now_utc.timestamp())
+                current_timestamp = int(time.time())  # POSIX time is already UTC
                 
-                market_timestamp = (current_timestamp // 900) * 900
-                expected_slug = f"btc-updown-15m-{market_timestamp}"
+                # A manual slug never rolls over, so compare against it rather than the clock's slug
+                if MANUAL_SLUG:
+                    market_timestamp = MANUAL_MARKET_TIMESTAMP
+                else:
+                    market_timestamp = (current_timestamp // 900) * 900
+                expected_slug = MANUAL_SLUG or f"btc-updown-15m-{market_timestamp}"
                 
                 if not current_market or current_market['slug'] != expected_slug:
-                    print(f"\n🔍 Looking for market: {expected_slug}")
+                    log(f"\n🔍 Looking for market: {expected_slug}")
                     
-                    if MANUAL_SLUG:
-                        current_market = self.get_market_from_slug(MANUAL_SLUG)
-                        market_timestamp = int(MANUAL_SLUG.split('-')[-1])
-                    else:
-                        current_market = self.get_market_from_slug(expected_slug)
+                    current_market = self.get_market_from_slug(expected_slug)
                     
                     if current_market:
                         market_end = market_timestamp + 900
                         time_left = market_end - current_timestamp
-                        print(f"✅ Active Market Found!")
-                        print(f"   {current_market['title']}")
-                        print(f"   Time Left: {time_left//60}m {time_left%60}s\n")
+                        if not self.active_market or self.active_market[0]['slug'] != current_market['slug']:
+                            log(f"✅ Active Market Found!")
+                            log(f"   {current_market['title']}")
+                            log(f"   Time Left: {time_left//60}m {time_left%60}s\n")
+                            
+                            # Clear skipped markets for new market
+                            self.skipped_markets_arb.clear()
                         
-                        # Clear skipped markets for new market
-                        self.skipped_markets_arb.clear()
+                        # Publish to the strategy workers as one tuple so they never see a torn update
+                        self.active_market = (current_market, market_timestamp)
                     else:
                         next_market_time = ((current_timestamp // 900) + 1) * 900
                         wait_time = next_market_time - current_timestamp
-                        print(f"⏳ No active market. Next check in {wait_time}s")
+                        log(f"⏳ No active market. Next check in {wait_time}s")
                         time.sleep(min(wait_time, 60))
                         continue
                 
-                # Execute strategies based on mode
-                arb_status = None
-                mg_status = None
-                
-                if STRATEGY_MODE in ["ARBITRAGE", "BOTH"]:
-                    arb_status = self.execute_arbitrage_strategy(current_market, market_timestamp)
-                
-                if STRATEGY_MODE in ["MID_GAME", "BOTH"]:
-                    mg_status = self.execute_mid_game_lock(current_market, market_timestamp)
-                
-                # Handle status results
-                if arb_status in ["arbitrage_complete", "stop_loss", "sell_timeout"]:
-                    print("\n✅ [ARB] Trade cycle complete!")
-                    time.sleep(5)
-                
-                if mg_status == "traded":
-                    print("✅ [MG] Trade executed!")
-                    time.sleep(5)
-                
-                if mg_status == "blocked_by_arbitrage":
-                    # Just wait silently
-                    time.sleep(CHECK_INTERVAL)
-                
-                if arb_status == "already_traded" and mg_status == "already_traded":
-                    next_market_time = ((current_timestamp // 900) + 1) * 900
-                    wait_time = max(next_market_time - int(time.time()), 5)
-                    print(f"\n⏭️ All strategies complete. Next market in {wait_time}s\n")
-                    time.sleep(wait_time)
-                else:
-                    time.sleep(CHECK_INTERVAL)
+                time.sleep(CHECK_INTERVAL)
                 
             except KeyboardInterrupt:
-                print("\n\n🛑 Bot stopped by user")
-                print(f"\n📊 FINAL SESSION STATS:")
+                log("\n\n🛑 Bot stopped by user")
+                log(f"\n📊 FINAL SESSION STATS:")
                 current_balance = self.get_balance()
                 session_pnl = current_balance - self.starting_balance
-                win_rate = (self.session_wins / self.session_trades * 100) if self.session_trades > 0 else 0
-                print(f"   Starting Balance: ${self.starting_balance:.2f}")
-                print(f"   Final Balance: ${current_balance:.2f}")
-                print(f"   Total P&L: ${session_pnl:+.2f}")
-                print(f"   Total Trades: {self.session_trades} | Wins: {self.session_wins} | Losses: {self.session_losses}")
-                print(f"   Win Rate: {win_rate:.1f}%")
+                trades, wins, losses = self.session_counts()
+                win_rate = (wins / trades * 100) if trades > 0 else 0
+                log(f"   Starting Balance: ${self.starting_balance:.2f}")
+                log(f"   Final Balance: ${current_balance:.2f}")
+                log(f"   Total P&L: ${session_pnl:+.2f}")
+                log(f"   Total Trades: {trades} | Wins: {wins} | Losses: {losses}")
+                log(f"   Win Rate: {win_rate:.1f}%")
                 break
             except Exception as e:
-                print(f"\n❌ Error: {e}")
+                log(f"\n❌ Error: {e}")
                 import traceback
                 traceback.print_exc()
                 time.sleep(10)
@@ -1,15 +1,29 @@
 import os
+import sys
 import time
+import atexit
+import queue
+import logging
+import logging.handlers
+import threading
 import requests
+import httpx
 import json
+import orjson
+import websocket
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from web3 import Web3
 from py_clob_client.client import ClobClient
 from py_clob_client.clob_types import OrderArgs, OrderType, PostOrdersArgs
 from py_clob_client.order_builder.constants import BUY, SELL
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 import csv
-import pandas as pd
-from collections import deque
+import openpyxl
+import numpy as np
+from collections import OrderedDict, deque
+from bisect import bisect_left, insort
 
 # ==========================================
 # 🔧 MANUAL FIX for OrderOptions
@@ -19,6 +33,56 @@ class OrderOptions:
         self.tick_size = str(tick_size)
         self.neg_risk = neg_risk
 
+# ==========================================
+# 🧺 BOUNDED SET (traded-market memory)
+# ==========================================
+class BoundedSet:
+    """Insertion-ordered set that forgets its oldest entries beyond `capacity`"""
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._items = OrderedDict()
+        self._lock = threading.Lock()   # strategy threads add while the state saver iterates
+
+    def add(self, item):
+        with self._lock:
+            self._items[item] = None
+            self._items.move_to_end(item)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+
+    def update(self, items):
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+# ==========================================
+# 📝 LOGGING (formatting + stdout writes happen off the trading threads)
+# ==========================================
+LOG_QUEUE = queue.Queue(-1)
+logger = logging.getLogger("bot_mg")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+logger.addHandler(logging.handlers.QueueHandler(LOG_QUEUE))
+
+_stdout_handler = logging.StreamHandler(sys.stdout)
+_stdout_handler.terminator = ""  # log() appends its own line ending (supports end="\r" status lines)
+log_listener = logging.handlers.QueueListener(LOG_QUEUE, _stdout_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+def log(*args, end="\n"):
+    """Queue a message for the background writer - drop-in replacement for print"""
+    logger.info(" ".join(str(a) for a in args) + end)
+
 # ==========================================
 # 🛠️ USER CONFIGURATION
 # ==========================================
@@ -33,25 +97,26 @@ POLYMARKET_ADDRESS = "0xC47167d407A91965fAdc7aDAb96F0fF586566bF7"
 # Check what address the private key controls
 from eth_account import Account
 wallet = Account.from_key(PRIVATE_KEY)
-print(f"🔑 Private key controls: {wallet.address}")
-print(f"🏦 Polymarket shows: {POLYMARKET_ADDRESS}")
+log(f"🔑 Private key controls: {wallet.address}")
+log(f"🏦 Polymarket shows: {POLYMARKET_ADDRESS}")
 
 # If they match, we can trade directly (EOA mode)
 # If they don't match, Polymarket uses a proxy contract
 if wallet.address.lower() == POLYMARKET_ADDRESS.lower():
-    print(f"✅ Direct match - using EOA mode")
+    log(f"✅ Direct match - using EOA mode")
     USE_PROXY = False
     SIGNATURE_TYPE = 0
     TRADING_ADDRESS = Web3.to_checksum_address(wallet.address)
 else:
-    print(f"⚠️ Addresses differ - Polymarket uses proxy contract")
-    print(f"   We'll try proxy mode with signature_type=1 (Magic Link)")
+    log(f"⚠️ Addresses differ - Polymarket uses proxy contract")
+    log(f"   We'll try proxy mode with signature_type=1 (Magic Link)")
     USE_PROXY = True
     SIGNATURE_TYPE = 1
     TRADING_ADDRESS = Web3.to_checksum_address(POLYMARKET_ADDRESS)
 
 # Manual Override (optional - leave empty for auto-detection)
 MANUAL_SLUG = ""  # e.g., "btc-updown-15m-1765593000"
+MANUAL_MARKET_TIMESTAMP = int(MANUAL_SLUG.rsplit('-', 1)[-1]) if MANUAL_SLUG else None
 
 # Slug generation for BTC 15min markets
 INTERVAL = 900  # 15 minutes in seconds
@@ -81,9 +146,10 @@ MG_TAKE_PROFIT = 0.95       # Take profit at $0.95
 MG_STOP_LOSS = 0.57         # Stop loss at $0.57
 
 # ⭐ NEW: Precise order settings
-MG_ENTRY_WAIT_TIME = 5      # Wait 5 seconds for entry fill
-MG_EXIT_WAIT_TIME = 3       # Wait 3 seconds for exit fill
+MG_ENTRY_WAIT_TIME = 5      # Max wait for a delayed entry match to be confirmed
+MG_EXIT_WAIT_TIME = 3       # Max wait for a delayed exit match to be confirmed
 MG_MAX_SLIPPAGE = 0.01      # Allow 1 cent slippage if needed
+MG_EXIT_RETRY_INTERVAL = 1.0  # Min seconds between exit attempts after an unfilled FAK
 
 # ==========================================
 # 💥 DUMP HEDGE STRATEGY SETTINGS
@@ -91,47 +157,112 @@ MG_MAX_SLIPPAGE = 0.01      # Allow 1 cent slippage if needed
 DH_WATCH_WINDOW_MINUTES = 2    # Watch first 2 minutes of round
 DH_DUMP_THRESHOLD = 0.15       # 15% price drop triggers entry
 DH_DUMP_TIMEFRAME = 3          # Check drop over 3 seconds
+DH_TICK_BUFFER = 64            # Price samples kept for dump detection (ring buffer rows)
 DH_SUM_TARGET = 0.95           # leg1_price + leg2_price must be < this
 DH_SHARES_PER_LEG = 20          # Fixed shares for dump hedge strategy
 
 # ⭐ NEW: Dump hedge precise order settings
-DH_ENTRY_WAIT_TIME = 3         # Wait 3 seconds for leg fills
+DH_ENTRY_WAIT_TIME = 3         # Max wait for a delayed leg match to be confirmed
 DH_MAX_SLIPPAGE = 0.02         # Allow 2 cent slippage for dump hedge
+FOK_CONFIRM_TIMEOUT = 2        # Max wait for a fallback FOK fill to be confirmed
 
 # System settings
 CHECK_INTERVAL = 1          # Check every 1 second for dump detection
+STATUS_INTERVAL = 1.0       # Redraw the in-place status line at most once per second
 MIN_ORDER_SIZE = 0.1        # Minimum order size
 
 # Trade Logging
 TRADE_LOG_FILE = "polymarket_trades.csv"
+SLUG_CACHE_SIZE = 256       # Resolved markets kept in memory per session
+TRADED_MARKETS_CAPACITY = 4096  # Traded slugs remembered per strategy (oldest forgotten first)
+FINISHED_ORDERS_MEMORY = 256    # Recently settled order ids whose late/duplicate fill events are ignored
+STATE_FILE = "dual_strategy_state.json"   # Traded markets / open legs, survives restarts (session stats start fresh)
+STATE_SAVE_INTERVAL = 2     # Seconds between state snapshots (written only when something changed)
+EXCEL_EXPORT_EVERY = 5      # Rewrite the xlsx after this many new trades...
+EXCEL_EXPORT_INTERVAL = 60  # ...or this many seconds after the first unsaved trade
+TRADE_LOG_HEADERS = [
+    'timestamp', 'strategy', 'market_slug', 'market_title',
+    'entry_side', 'entry_time', 'intended_entry_price', 'actual_entry_price',
+    'entry_size', 'actual_shares_purchased', 'yes_price_at_entry', 'no_price_at_entry', 
+    'time_remaining_at_entry', 'bid_size_at_entry',
+    'exit_reason', 'exit_time', 'exit_price', 'time_in_trade_seconds',
+    'gross_pnl', 'pnl_percent', 'win_loss',
+    'leg2_side', 'leg2_price', 'leg2_shares', 'combined_cost',
+    'session_trade_number', 'balance_before', 'balance_after', 'session_pnl_running'
+]
 ENABLE_EXCEL = True
 
 # ==========================================
 # SYSTEM SETUP
 # ==========================================
 HOST = "https://clob.polymarket.com"
+GAMMA_EVENTS_URL = "https://gamma-api.polymarket.com/events"
+CLOB_BOOK_URL = HOST + "/book"     # Raw book JSON (skips the SDK's per-level objects)
+CLOB_TIME_URL = HOST + "/time"     # Cheap endpoint used to pre-open connections
+CLOB_RTT_WARN = 0.020              # Warn if the CLOB is further than this (20ms ~ hosted in EU-West/Amsterdam)
+CLOB_RTT_PROBES = 3                # Startup RTT samples (the best one is reported)
+CLOB_RTT_SAMPLES = 256             # Recent CLOB request latencies kept for p50/p99
+CLOB_BOOKS_URL = HOST + "/books"   # Batched variant: POST [{"token_id": ...}, ...]
 CHAIN_ID = 137
 RPC_URL = "https://polygon-rpc.com"
 USDC_E_CONTRACT = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
 USDC_CHECKSUM = Web3.to_checksum_address(USDC_E_CONTRACT)
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL3_ABI = json.loads('[{"inputs":[{"components":[{"name":"target","type":"address"},{"name":"allowFailure","type":"bool"},{"name":"callData","type":"bytes"}],"name":"calls","type":"tuple[]"}],"name":"aggregate3","outputs":[{"components":[{"name":"success","type":"bool"},{"name":"returnData","type":"bytes"}],"name":"returnData","type":"tuple[]"}],"stateMutability":"payable","type":"function"}]')
+MARKET_WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+WS_PING_INTERVAL = 2       # Polymarket drops idle sockets without a PING (PONGs also prove liveness)
+WS_STALE_AFTER = 5         # Silent this long = zombie socket: reconnect and use REST meanwhile
+USER_WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/user"
+USER_WS_PING_INTERVAL = 2   # Keep-alive PING cadence on the user channel
+USER_WS_STALE_AFTER = 5     # Fall back to REST order checks after 5s of stream silence
+BALANCE_RESYNC_INTERVAL = 60  # Cached balance is re-read over RPC at most this often
+FILL_STATUSES = ('MATCHED', 'FILLED', 'COMPLETED')
+OPPOSITE_SIDE = {"YES": "NO", "NO": "YES"}
 ERC20_ABI = json.loads('[{"constant":true,"inputs":[{"name":"_owner","type":"address"}],"name":"balanceOf","outputs":[{"name":"balance","type":"uint256"}],"type":"function"},{"constant":true,"inputs":[],"name":"decimals","outputs":[{"name":"","type":"uint8"}],"type":"function"}]')
 
 class DualStrategyBot:
     def __init__(self):
-        print("🤖 Dual Strategy Trading Bot Starting...")
-        print(f"📊 Active Strategy: {ACTIVE_STRATEGY}")
+        log("🤖 Dual Strategy Trading Bot Starting...")
+        log(f"📊 Active Strategy: {ACTIVE_STRATEGY}")
         
         # 1. Setup Web3 (For Balance)
         self.w3 = Web3(Web3.HTTPProvider(RPC_URL))
         self.usdc_contract = self.w3.eth.contract(address=USDC_CHECKSUM, abi=ERC20_ABI)
+        self._balance_of = self.usdc_contract.functions.balanceOf(TRADING_ADDRESS)
+        self.multicall3 = self.w3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+        
+        # Persistent HTTP session for Gamma API (keep-alive, pooled connections)
+        self.http = requests.Session()
+        self.http.headers.update({"Accept": "application/json", "Accept-Encoding": "gzip"})
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[429, 502, 503, 504])
+        )
+        self.http.mount("https://", adapter)
+        
+        # HTTP/2 client for CLOB book reads: concurrent requests multiplex over one TLS connection
+        self.clob_rtts = deque(maxlen=CLOB_RTT_SAMPLES)
+        self.clob_http = httpx.Client(
+            http2=True,
+            headers={"Accept": "application/json"},
+            limits=httpx.Limits(max_connections=8, max_keepalive_connections=8),
+            timeout=5
+        )
+        
+        # Worker pool for overlapping independent reads with the trade path
+        self.pool = ThreadPoolExecutor(max_workers=4)
+        
+        # slug -> market for successful Gamma lookups (token ids never change for a slug)
+        self._slug_cache = {}
         
         # 2. Setup Client (For Trading)
         try:
-            print(f"🔗 Setting up Polymarket client...")
+            log(f"🔗 Setting up Polymarket client...")
             
             if USE_PROXY:
-                print(f"   Mode: Proxy with Magic Link (signature_type={SIGNATURE_TYPE})")
-                print(f"   Funder: {TRADING_ADDRESS}")
+                log(f"   Mode: Proxy with Magic Link (signature_type={SIGNATURE_TYPE})")
+                log(f"   Funder: {TRADING_ADDRESS}")
                 self.client = ClobClient(
                     host=HOST, 
                     key=PRIVATE_KEY, 
@@ -140,235 +271,721 @@ class DualStrategyBot:
                     funder=TRADING_ADDRESS
                 )
             else:
-                print(f"   Mode: EOA (direct trading from {TRADING_ADDRESS})")
+                log(f"   Mode: EOA (direct trading from {TRADING_ADDRESS})")
                 self.client = ClobClient(
                     host=HOST, 
                     key=PRIVATE_KEY, 
                     chain_id=CHAIN_ID
                 )
             
-            print("🔐 Deriving API credentials...")
+            log("🔐 Deriving API credentials...")
             api_creds = self.client.create_or_derive_api_creds()
             self.client.set_api_creds(api_creds)
+            self.api_creds = api_creds
             
-            print(f"✅ Trading as: {self.client.get_address()}\n")
+            self.address = self.client.get_address()
+            self.warm_connections()
+            log(f"✅ Trading as: {self.address}\n")
             
         except Exception as e:
-            print(f"❌ Connection Failed: {e}")
+            log(f"❌ Connection Failed: {e}")
             import traceback
             traceback.print_exc()
             exit()
             
         # Track markets
-        self.traded_markets_midgame = set()
-        self.traded_markets_dumphedge = set()
+        self.traded_markets_midgame = BoundedSet(TRADED_MARKETS_CAPACITY)
+        self.traded_markets_dumphedge = BoundedSet(TRADED_MARKETS_CAPACITY)
+        self.active_market = None      # (market, market_timestamp) shared with strategy workers
+        
+        # Order fills pushed by the user WebSocket channel
+        self.order_events = {}   # order_id -> threading.Event, set once filled
+        self.order_fills = {}    # order_id -> (filled, avg_price)
+        self.finished_orders = BoundedSet(FINISHED_ORDERS_MEMORY)  # order ids already consumed
+        self.order_lock = threading.Lock()
+        self.user_ws_last_msg = 0
+        
+        # Balance cache: moved by our fills on the user channel, re-synced over RPC periodically
+        self._balance_lock = threading.Lock()
+        self._cached_balance = None
+        self._balance_synced_at = 0.0
+        self.order_sides = {}   # order_id -> BUY/SELL for orders we placed and are awaiting
+        self.start_user_stream()
         
-        # Session tracking
-        self.starting_balance = self.get_balance()
+        # Session tracking - balance + decimals in one eth_call; decimals never change so keep the divisor
+        try:
+            raw_bal, raw_decimals = self.multicall([
+                (self.usdc_contract, 'balanceOf', [TRADING_ADDRESS]),
+                (self.usdc_contract, 'decimals', [])
+            ])
+            self._usdc_scale = float(10 ** int.from_bytes(raw_decimals, 'big'))
+            self.starting_balance = int.from_bytes(raw_bal, 'big') / self._usdc_scale
+        except Exception as e:
+            log(f"⚠️ Multicall failed ({e}), assuming 6 decimals")
+            self._usdc_scale = float(10 ** 6)
+            self.starting_balance = self.get_balance()
+        self._cached_balance = self.starting_balance
+        self._balance_synced_at = time.monotonic()
         self.session_trades = 0
         self.session_wins = 0
         self.session_losses = 0
+        self._stats_lock = threading.Lock()   # DH and MG workers both record results
         
         # Dump hedge tracking
         self.dh_leg1_active = False
         self.dh_leg1_side = None
         self.dh_leg1_price = None
         self.dh_leg1_shares = 0
+        self.dh_leg2_shares = 0.0   # LEG 2 can fill partially - hedged so far and what it cost
+        self.dh_leg2_cost = 0.0
+        self.dh_balance_before = None
         self.dh_current_market = None
+        self._side_tok = {}
+        self._order_opts = {}   # token_id -> OrderOptions for the active market
+        
+        # Mid-game position currently held (persisted so a restart knows it is open)
+        self.mg_open_position = None
         
-        # Price history for dump detection
-        self.yes_price_history = deque(maxlen=DH_DUMP_TIMEFRAME + 1)
-        self.no_price_history = deque(maxlen=DH_DUMP_TIMEFRAME + 1)
+        # Crash recovery: hydrate from the last snapshot, then keep snapshotting in the background
+        self.load_state()
+        self._state_saved = None
+        threading.Thread(target=self.state_persist_loop, daemon=True).start()
+        atexit.register(self.save_state)
         
-        # Trade logging
+        # Price history for dump detection: preallocated ring of (time, yes, no) rows
+        self.price_ticks = np.zeros((DH_TICK_BUFFER, 3), dtype=np.float64)
+        self.price_tick_count = 0
+        
+        # In-place status line throttle (per strategy, so BOTH mode shows each)
+        self._last_status_ts = {}
+        
+        # Trade logging (CSV/Excel writes happen on a background worker)
         self.trade_logs = []
+        self._excel_dirty = False
+        self._log_q = queue.Queue()
         self.initialize_trade_log()
+        self._log_thread = threading.Thread(target=self._log_worker, daemon=True)
+        self._log_thread.start()
+        atexit.register(self.shutdown_trade_log)
+        
+        # Top-of-book cache fed by the market WebSocket
+        self._book_lock = threading.Lock()
+        self._book_levels = {}   # token_id -> {'bids'/'asks': {price: size}, price ladders, best_bid, best_ask, bid_size}
+        self._book_cache = {}    # token_id -> {'best_ask', 'best_bid', 'bid_size'}
+        self._ws_assets = []
+        self._ws = None
+        self._ws_last_msg = 0
+        self._bid_changed = threading.Event()   # set whenever a streamed best bid moves
+        threading.Thread(target=self.market_stream_loop, daemon=True).start()
 
     def initialize_trade_log(self):
-        """Initialize CSV file with headers if it doesn't exist"""
-        if not os.path.exists(TRADE_LOG_FILE):
-            headers = [
-                'timestamp', 'strategy', 'market_slug', 'market_title',
-                'entry_side', 'entry_time', 'intended_entry_price', 'actual_entry_price',
-                'entry_size', 'actual_shares_purchased', 'yes_price_at_entry', 'no_price_at_entry', 
-                'time_remaining_at_entry', 'bid_size_at_entry',
-                'exit_reason', 'exit_time', 'exit_price', 'time_in_trade_seconds',
-                'gross_pnl', 'pnl_percent', 'win_loss',
-                'leg2_side', 'leg2_price', 'leg2_shares', 'combined_cost',
-                'session_trade_number', 'balance_before', 'balance_after', 'session_pnl_running'
-            ]
-            
-            with open(TRADE_LOG_FILE, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=headers)
-                writer.writeheader()
-            
-            print(f"📊 Trade log initialized: {TRADE_LOG_FILE}")
+        """Open the CSV log once for the whole session (header written if the file is new)"""
+        is_new = not os.path.exists(TRADE_LOG_FILE)
+        
+        self._csv_file = open(TRADE_LOG_FILE, 'a', newline='', buffering=1 << 16)
+        self._csv_writer = csv.DictWriter(self._csv_file, fieldnames=TRADE_LOG_HEADERS)
+        
+        if is_new:
+            self._csv_writer.writeheader()
+            self._csv_file.flush()
+            log(f"📊 Trade log initialized: {TRADE_LOG_FILE}")
+
+    def close_trade_log(self):
+        """Flush and close the session CSV handle"""
+        if not self._csv_file.closed:
+            self._csv_file.close()
 
     def log_trade(self, trade_data):
-        """Append trade data to CSV and optionally Excel"""
-        try:
-            self.trade_logs.append(trade_data)
+        """Queue trade data for the log worker (never blocks the trade path on file I/O or formatting)"""
+        self._log_q.put(dict(trade_data))
+
+    def format_trade_row(self, trade_data):
+        """Copy of a trade record with its epoch times rendered for the log files"""
+        row = dict(trade_data)
+        for field in ('timestamp', 'entry_time', 'exit_time'):
+            if isinstance(row.get(field), float):
+                row[field] = datetime.fromtimestamp(row[field]).isoformat()
+        return row
+
+    def _log_worker(self):
+        """Write queued trades to CSV; rewrite Excel every few trades or once a minute"""
+        pending = 0
+        first_pending = 0.0
+        
+        while True:
+            try:
+                trade_data = self._log_q.get(timeout=EXCEL_EXPORT_INTERVAL)
+            except queue.Empty:
+                trade_data = {}
             
-            with open(TRADE_LOG_FILE, 'a', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=trade_data.keys())
-                writer.writerow(trade_data)
+            if trade_data is None:
+                return
             
-            if ENABLE_EXCEL:
-                df = pd.DataFrame(self.trade_logs)
-                excel_file = TRADE_LOG_FILE.replace('.csv', '.xlsx')
-                df.to_excel(excel_file, index=False, engine='openpyxl')
+            if trade_data:
+                try:
+                    row = self.format_trade_row(trade_data)
+                    self.trade_logs.append(row)
+                    
+                    self._csv_writer.writerow(row)
+                    self._csv_file.flush()
+                    
+                    self._excel_dirty = True
+                    if not pending:
+                        first_pending = time.monotonic()
+                    pending += 1
+                    
+                    log(f"✅ Trade logged to {TRADE_LOG_FILE}")
+                    
+                except Exception as e:
+                    log(f"⚠️ Error logging trade: {e}")
             
-            print(f"✅ Trade logged to {TRADE_LOG_FILE}")
+            if pending and (pending >= EXCEL_EXPORT_EVERY or time.monotonic() - first_pending >= EXCEL_EXPORT_INTERVAL):
+                self.export_excel()
+                pending = 0
+
+    def shutdown_trade_log(self):
+        """Drain the log queue, then close the CSV and write the final Excel file"""
+        if self._log_thread.is_alive():
+            self._log_q.put(None)
+            self._log_thread.join()
+        self.close_trade_log()
+        self.export_excel()
+
+    def export_excel(self):
+        """Write the session's trades to xlsx in one streaming pass"""
+        if not ENABLE_EXCEL or not self._excel_dirty:
+            return
+        try:
+            excel_file = TRADE_LOG_FILE.replace('.csv', '.xlsx')
             
+            wb = openpyxl.Workbook(write_only=True)
+            ws = wb.create_sheet("trades")
+            ws.append(TRADE_LOG_HEADERS)
+            for row in self.trade_logs:
+                ws.append([row.get(h) for h in TRADE_LOG_HEADERS])
+            wb.save(excel_file)
+            
+            self._excel_dirty = False
+            log(f"📊 Excel log written: {excel_file}")
         except Exception as e:
-            print(f"⚠️ Error logging trade: {e}")
+            log(f"⚠️ Error writing Excel log: {e}")
+
+    def warm_connections(self):
+        """Open the CLOB connections up front so the first order/book read skips the TLS handshake"""
+        warmups = [
+            self.pool.submit(self.client.get_server_time),
+            self.pool.submit(self.probe_clob_rtt),
+        ]
+        for future in warmups:
+            try:
+                future.result(timeout=5)
+            except Exception as e:
+                log(f"   ⚠️ Connection warm-up failed: {e}")
+
+    def probe_clob_rtt(self):
+        """Time a few GET /time round trips and warn loudly if the bot is hosted far from the CLOB"""
+        for _ in range(CLOB_RTT_PROBES):
+            self.clob_rtts.append(self.clob_http.get(CLOB_TIME_URL).elapsed.total_seconds())
+        rtt = min(self.clob_rtts)
+        log(f"📡 CLOB round trip: {rtt*1000:.1f}ms")
+        if rtt > CLOB_RTT_WARN:
+            log(f"⚠️ CLOB RTT {rtt*1000:.0f}ms exceeds {CLOB_RTT_WARN*1000:.0f}ms - every REST call and order pays this.")
+            log(f"   Redeploy close to the CLOB (EU-West / Amsterdam) for the biggest latency win.")
+
+    def clob_latency_summary(self):
+        if not self.clob_rtts:
+            return "n/a"
+        p50, p99 = np.percentile(np.fromiter(self.clob_rtts, dtype=np.float64), [50, 99])
+        return f"p50 {p50*1000:.0f}ms | p99 {p99*1000:.0f}ms ({len(self.clob_rtts)} samples)"
 
+    def snapshot_state(self):
+        return {
+            'traded_markets_midgame': list(self.traded_markets_midgame),      # oldest first
+            'traded_markets_dumphedge': list(self.traded_markets_dumphedge),
+            'open_positions': {
+                'dump_hedge_leg1': {
+                    'market': self.dh_current_market,
+                    'side_tokens': self._side_tok,
+                    'side': self.dh_leg1_side,
+                    'price': self.dh_leg1_price,
+                    'shares': self.dh_leg1_shares,
+                    'leg2_shares': self.dh_leg2_shares,
+                    'leg2_cost': self.dh_leg2_cost,
+                    'balance_before': self.dh_balance_before
+                } if self.dh_leg1_active else None,
+                'midgame': self.mg_open_position
+            }
+        }
+
+    def load_state(self):
+        """Restore traded markets and open legs written by a previous run (no-op if there is none)"""
+        try:
+            with open(STATE_FILE, 'rb') as f:
+                state = orjson.loads(f.read())
+        except (OSError, ValueError):
+            return
+        
+        self.traded_markets_midgame.update(state.get('traded_markets_midgame', []))
+        self.traded_markets_dumphedge.update(state.get('traded_markets_dumphedge', []))
+        
+        positions = state.get('open_positions') or {}
+        leg1 = positions.get('dump_hedge_leg1')
+        if leg1:
+            # Resume watching for LEG 2 on the same market
+            self.dh_current_market = leg1['market']
+            self._side_tok = leg1['side_tokens']
+            self.dh_leg1_active = True
+            self.dh_leg1_side = leg1['side']
+            self.dh_leg1_price = leg1['price']
+            self.dh_leg1_shares = leg1['shares']
+            self.dh_leg2_shares = leg1.get('leg2_shares', 0.0)
+            self.dh_leg2_cost = leg1.get('leg2_cost', 0.0)
+            self.dh_balance_before = leg1['balance_before']
+            log(f"♻️ Resuming DH LEG 1: {leg1['side']} @ ${leg1['price']:.2f} on {leg1['market']}")
+        
+        # Warn once: the next save drops it, so it is not reported again on every restart
+        mg_position = positions.get('midgame')
+        if mg_position:
+            log(f"⚠️ Mid-game position was open at shutdown: {mg_position} - manage it manually")
+        
+        log(f"♻️ Restored state: {len(self.traded_markets_midgame) + len(self.traded_markets_dumphedge)} traded markets")
+
+    def save_state(self):
+        """Write the state snapshot atomically (tmp file + rename) if it changed"""
+        try:
+            data = orjson.dumps(self.snapshot_state())
+            if data == self._state_saved:
+                return
+            tmp_file = STATE_FILE + ".tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_file, STATE_FILE)
+            self._state_saved = data
+        except Exception as e:
+            log(f"   ⚠️ Could not save state: {e}")
+
+    def state_persist_loop(self):
+        while True:
+            time.sleep(STATE_SAVE_INTERVAL)
+            self.save_state()
+
+    def multicall(self, calls):
+        """Run several (contract, fn_name, args) reads in a single eth_call via Multicall3"""
+        results = self.multicall3.functions.aggregate3([
+            (contract.address, False, contract.encode_abi(fn_name, args=args))
+            for contract, fn_name, args in calls
+        ]).call()
+        return [return_data for success, return_data in results]
+
+    def status_due(self, key):
+        """True (and stamps the time) if `key`'s status line may be redrawn - check before formatting it"""
+        now = time.monotonic()
+        if now - self._last_status_ts.get(key, 0.0) < STATUS_INTERVAL:
+            return False
+        self._last_status_ts[key] = now
+        return True
+    
     def get_balance(self):
         """Get USDC.e balance from the trading address"""
         try:
-            raw_bal = self.usdc_contract.functions.balanceOf(TRADING_ADDRESS).call()
-            decimals = self.usdc_contract.functions.decimals().call()
-            return raw_bal / (10 ** decimals)
+            raw_bal = self._balance_of.call()
+            return raw_bal / self._usdc_scale
         except Exception as e:
-            print(f"⚠️ Balance error: {e}")
+            log(f"⚠️ Balance error: {e}")
             return 0.0
 
+    def sync_balance(self):
+        """Read the balance over RPC and reset the cache to it"""
+        balance = self.get_balance()
+        with self._balance_lock:
+            self._cached_balance = balance
+            self._balance_synced_at = time.monotonic()
+        return balance
+
+    def cached_balance(self):
+        """Balance tracked from our fills; re-synced over RPC every BALANCE_RESYNC_INTERVAL"""
+        with self._balance_lock:
+            if self._cached_balance is not None and time.monotonic() - self._balance_synced_at < BALANCE_RESYNC_INTERVAL:
+                return self._cached_balance
+        return self.sync_balance()
+
+    def invalidate_balance(self):
+        """Force the next cached_balance() to re-read over RPC"""
+        with self._balance_lock:
+            self._balance_synced_at = 0.0
+
+    def apply_fill_to_balance(self, order_id, price, size, fee_rate_bps=None):
+        """Move the cached balance by a fill's execution price, size and fee (BUY spends, SELL receives)"""
+        side = self.order_sides.pop(order_id, None)
+        if side is None or not size or fee_rate_bps is None:
+            # Unregistered order or inexact amounts (limit price / unknown fee) - re-sync instead of guessing
+            self.invalidate_balance()
+            return
+        notional = price * size
+        fee = fee_rate_bps / 10000 * min(price, 1 - price) * size
+        with self._balance_lock:
+            if self._cached_balance is not None:
+                self._cached_balance += -(notional + fee) if side == BUY else notional - fee
+
     def get_market_from_slug(self, slug):
-        """Get market details from a specific slug"""
+        """Get market details from a specific slug (memoized per session)"""
+        market = self._slug_cache.get(slug)
+        if market:
+            return market
+        
+        market = self.fetch_market_from_slug(slug)
+        if market:
+            self._slug_cache[slug] = market
+            # Keep only the most recent slugs (dicts preserve insertion order)
+            for old_slug in list(self._slug_cache)[:-SLUG_CACHE_SIZE]:
+                del self._slug_cache[old_slug]
+        return market
+
+    def fetch_market_from_slug(self, slug):
+        """Fetch market details for a slug from the Gamma API"""
         try:
-            url = f"https://gamma-api.polymarket.com/events?slug={slug}"
-            resp = requests.get(url, timeout=10).json()
+            resp = orjson.loads(self.http.get(GAMMA_EVENTS_URL, params={"slug": slug}, timeout=10).content)
             
             if not resp or len(resp) == 0:
                 return None
             
             event = resp[0]
-            raw_ids = event['markets'][0].get('clobTokenIds')
-            clob_ids = json.loads(raw_ids) if isinstance(raw_ids, str) else raw_ids
+            m = event['markets'][0]
+            raw_ids = m.get('clobTokenIds')
+            clob_ids = orjson.loads(raw_ids) if isinstance(raw_ids, str) else raw_ids
             
             return {
                 'slug': slug,
                 'yes_token': clob_ids[0],
                 'no_token': clob_ids[1],
-                'title': event.get('title', slug)
+                'title': event.get('title', slug),
+                'order_options': OrderOptions(m.get('orderPriceMinTickSize') or 0.01, bool(m.get('negRisk')))
             }
         except Exception as e:
             return None
 
-    def get_best_ask(self, token_id):
-        """Get cheapest available price"""
+    # ==========================================
+    # MARKET WEBSOCKET (order book cache)
+    # Same connection handling as midgame_bot.py / bots.py (ping, zombie
+    # guard, reconnect) - each bot runs as a standalone script, so keep them in step
+    # ==========================================
+    def subscribe_market(self, token_ids):
+        """Point the market stream at a new set of tokens (reconnects with the new subscription)"""
+        if list(token_ids) == self._ws_assets:
+            return  # Same market (e.g. MANUAL_SLUG re-resolved) - keep the live stream
+        with self._book_lock:
+            self._ws_assets = list(token_ids)
+            self._book_levels.clear()
+            self._book_cache.clear()
+        if self._ws:
+            self._ws.close()
+
+    def stream_alive(self):
+        return time.monotonic() - self._ws_last_msg < WS_STALE_AFTER
+
+    def load_book(self, token_id, bids, asks):
+        """Replace a token's local book from a snapshot (lock held)"""
+        bid_levels = {float(o['price']): float(o['size']) for o in bids}
+        ask_levels = {float(o['price']): float(o['size']) for o in asks}
+        # Price ladders keep the best level at the END of the list (asks stored negated),
+        # so the updates that cluster at the touch are appends/pops with no shifting
+        bid_px = sorted(bid_levels)
+        ask_px = sorted(-p for p in ask_levels)
+        self._book_levels[token_id] = {
+            'bids': bid_levels,
+            'asks': ask_levels,
+            'bid_px': bid_px,
+            'ask_px': ask_px,
+            'best_bid': bid_px[-1] if bid_px else None,
+            'best_ask': -ask_px[-1] if ask_px else None,
+            'bid_size': sum(bid_levels.values())
+        }
+
+    def apply_level(self, levels, side, price, size):
+        """Apply one price-level update, keeping best price and bid size current (lock held)"""
+        book = levels[side]
+        old_size = book.get(price, 0.0)
+        if size == old_size:
+            return  # Repeated level (common in price_change bursts) - nothing moved
+        if size:
+            book[price] = size
+        else:
+            del book[price]
+        
+        if side == 'bids':
+            levels['bid_size'] += size - old_size
+            ladder, key = levels['bid_px'], price
+        else:
+            ladder, key = levels['ask_px'], -price
+        
+        if size and not old_size:
+            # New level: at or beyond the touch is a plain append, otherwise binary insert
+            if not ladder or key > ladder[-1]:
+                ladder.append(key)
+            else:
+                insort(ladder, key)
+        elif old_size and not size:
+            # Level erased: the touch is the last slot, anything deeper is found by bisection
+            if ladder[-1] == key:
+                ladder.pop()
+            else:
+                del ladder[bisect_left(ladder, key)]
+        else:
+            return  # Size change on an existing level - best price unchanged
+        
+        if side == 'bids':
+            levels['best_bid'] = ladder[-1] if ladder else None
+        else:
+            levels['best_ask'] = -ladder[-1] if ladder else None
+
+    def refresh_top_of_book(self, token_id):
+        """Publish a token's best ask / best bid / total bid size to the cache (lock held)"""
+        levels = self._book_levels[token_id]
+        previous = self._book_cache.get(token_id)
+        best_bid = levels['best_bid']
+        self._book_cache[token_id] = {
+            'best_ask': levels['best_ask'],
+            'best_bid': best_bid,
+            'bid_size': levels['bid_size']
+        }
+        if not previous or previous['best_bid'] != best_bid:
+            self._bid_changed.set()
+
+    def apply_market_event(self, event, touched):
+        """Apply one book/price_change event to the local book and note the tokens it moved (lock held)"""
+        event_type = event.get('event_type')
+        
+        if event_type == 'book':
+            token_id = event.get('asset_id')
+            if token_id not in self._ws_assets:
+                return
+            bids = event.get('bids') or event.get('buys') or []
+            asks = event.get('asks') or event.get('sells') or []
+            self.load_book(token_id, bids, asks)
+            touched.add(token_id)
+        
+        elif event_type == 'price_change':
+            changes = event.get('price_changes') or event.get('changes') or []
+            for change in changes:
+                token_id = change.get('asset_id') or event.get('asset_id')
+                levels = self._book_levels.get(token_id)
+                if levels is None:
+                    continue  # No snapshot yet - wait for the book event
+                side = 'bids' if change.get('side') == 'BUY' else 'asks'
+                self.apply_level(levels, side, float(change['price']), float(change['size']))
+                touched.add(token_id)
+
+    def on_market_message(self, ws, message):
+        self._ws_last_msg = time.monotonic()
+        
+        if message == "PONG":
+            return
+        
         try:
-            book = self.client.get_order_book(token_id)
-            if book.asks:
-                return min(float(o.price) for o in book.asks)
-            return None
-        except:
+            data = orjson.loads(message)
+        except ValueError:
+            return
+        
+        # Apply the whole burst first, then publish each moved token once, so the
+        # strategy wakes a single time on the final state instead of once per diff
+        touched = set()
+        with self._book_lock:
+            for event in (data if isinstance(data, list) else [data]):
+                if isinstance(event, dict):
+                    self.apply_market_event(event, touched)
+            for token_id in touched:
+                self.refresh_top_of_book(token_id)
+
+    def on_market_open(self, ws):
+        ws.send(json.dumps({"assets_ids": self._ws_assets, "type": "market"}))
+        self._ws_last_msg = time.monotonic()
+        
+        def keepalive():
+            while ws.sock and ws.sock.connected:
+                # Zombie guard: a connected socket that stopped talking gets recycled
+                if not self.stream_alive():
+                    log(f"\n   ⚠️ Market stream silent for {WS_STALE_AFTER}s - reconnecting")
+                    ws.close()
+                    return
+                try:
+                    ws.send("PING")
+                except Exception:
+                    return
+                time.sleep(WS_PING_INTERVAL)
+        
+        threading.Thread(target=keepalive, daemon=True).start()
+
+    def market_stream_loop(self):
+        """Keep the market channel connected for the current tokens, reconnecting on drop/market switch"""
+        while True:
+            if not self._ws_assets:
+                time.sleep(1)
+                continue
+            try:
+                self._ws = websocket.WebSocketApp(
+                    MARKET_WS_URL,
+                    on_open=self.on_market_open,
+                    on_message=self.on_market_message
+                )
+                self._ws.run_forever()
+            except Exception as e:
+                log(f"   ⚠️ Market stream error: {e}")
+            time.sleep(1)
+
+    def get_cached_book(self, token_id):
+        """Streamed top of book for a token, or None if cold/stale"""
+        if not self.stream_alive():
             return None
+        with self._book_lock:
+            return self._book_cache.get(token_id)
+
+    # ==========================================
+    # ORDER BOOK HELPERS (stream first, REST for cold start)
+    # ==========================================
+    def get_best_ask(self, token_id):
+        """Get cheapest available price"""
+        book = self.get_order_book_depth(token_id)
+        return book['best_ask'] if book else None
 
     def get_best_bid(self, token_id):
         """Get best available selling price"""
-        try:
-            book = self.client.get_order_book(token_id)
-            if book.bids:
-                return max(float(o.price) for o in book.bids)
-            return None
-        except:
-            return None
+        book = self.get_order_book_depth(token_id)
+        return book['best_bid'] if book else None
 
     def get_order_book_depth(self, token_id):
         """Get detailed order book information including bid size"""
+        cached = self.get_cached_book(token_id)
+        if cached:
+            return dict(cached)
         try:
-            book = self.client.get_order_book(token_id)
-            
-            best_ask = min(float(o.price) for o in book.asks) if book.asks else None
-            best_bid = max(float(o.price) for o in book.bids) if book.bids else None
-            
-            bid_size = 0
-            if book.bids:
-                for order in book.bids:
-                    bid_size += float(order.size)
-            
-            return {
-                'best_ask': best_ask,
-                'best_bid': best_bid,
-                'bid_size': bid_size
-            }
+            resp = self.clob_http.get(CLOB_BOOK_URL, params={"token_id": token_id})
+            self.clob_rtts.append(resp.elapsed.total_seconds())
+            resp.raise_for_status()
+            return self.summarize_book(orjson.loads(resp.content))
         except Exception as e:
-            print(f"   ⚠️ Error getting order book: {e}")
+            log(f"   ⚠️ Error getting order book: {e}")
             return None
 
+    def summarize_book(self, book):
+        """Reduce a raw REST order book to best ask / best bid / total bid size"""
+        # Levels arrive as decimal strings in no best-first order (bids ascend, asks
+        # descend); numpy parses each side to float64 in one go and reduces in C
+        asks = book.get('asks') or []
+        bids = book.get('bids') or []
+        ask_px = np.array([o['price'] for o in asks], dtype=np.float64)
+        bid_px = np.array([o['price'] for o in bids], dtype=np.float64)
+        bid_sz = np.array([o['size'] for o in bids], dtype=np.float64)
+        
+        return {
+            'best_ask': float(ask_px.min()) if ask_px.size else None,
+            'best_bid': float(bid_px.max()) if bid_px.size else None,
+            'bid_size': float(bid_sz.sum())
+        }
+
+    def get_books_batch(self, token_ids):
+        """Order book depth for several tokens: streamed where live, one batched REST call for the rest"""
+        depths = {token_id: self.get_cached_book(token_id) for token_id in token_ids}
+        missing = [token_id for token_id, depth in depths.items() if not depth]
+        
+        if missing:
+            try:
+                resp = self.clob_http.post(CLOB_BOOKS_URL, json=[{"token_id": t} for t in missing])
+                self.clob_rtts.append(resp.elapsed.total_seconds())
+                resp.raise_for_status()
+                for book in orjson.loads(resp.content):
+                    depths[book['asset_id']] = self.summarize_book(book)
+            except Exception as e:
+                log(f"   ⚠️ Error getting order books: {e}")
+        
+        return [dict(depths[t]) if depths.get(t) else None for t in token_ids]
+
     # ==========================================
     # ⭐ NEW PRECISE ORDER FUNCTIONS
     # ==========================================
     
+    def set_order_options(self, market):
+        """Pin the market's tick size / neg-risk flag for both tokens so orders skip the lookups"""
+        self._order_opts = {
+            market['yes_token']: market['order_options'],
+            market['no_token']: market['order_options'],
+        }
+
+    def submit_order(self, token_id, price, size, side, order_type):
+        """Sign and post a single order using the active market's pinned options"""
+        order = self.client.create_order(
+            OrderArgs(price=price, size=size, side=side, token_id=token_id),
+            self._order_opts.get(token_id),
+        )
+        resp = self.client.post_orders([PostOrdersArgs(order=order, orderType=order_type)])
+        order_id = resp[0].get('orderID') if resp else None
+        if order_id:
+            self.order_sides[order_id] = side
+        return resp
+
     def place_strict_limit_order(self, token_id, limit_price, size, side, wait_time=5):
         """
-        ⭐ NEW FUNCTION: Place a GTC limit order at EXACT price and wait for fill.
-        Returns: (success, actual_price, order_id)
+        ⭐ NEW FUNCTION: Place an immediate-or-cancel (FAK) limit order at EXACT price or better.
+        Whatever isn't matched on arrival is killed by the exchange - no resting order to cancel.
+        Returns: (success, actual_price, order_id, filled_size)
         """
         try:
             size = round(size, 1)
             
             if size < MIN_ORDER_SIZE:
-                print(f"   ⚠️ Order size {size} below minimum {MIN_ORDER_SIZE}")
-                return False, None, None
+                log(f"   ⚠️ Order size {size} below minimum {MIN_ORDER_SIZE}")
+                return False, None, None, 0.0
             
             # Ensure price is within bounds
             limit_price = max(0.01, min(0.99, round(limit_price, 2)))
             
-            print(f"   🎯 Placing STRICT LIMIT {side} | Size: {size} | Price: ${limit_price:.2f}")
+            log(f"   🎯 Placing STRICT LIMIT {side} | Size: {size} | Price: ${limit_price:.2f}")
             
-            # Create GTC (Good-Til-Cancelled) order
-            order = self.client.create_order(OrderArgs(
-                price=limit_price,
-                size=size,
-                side=side,
-                token_id=token_id,
-            ))
-            
-            resp = self.client.post_orders([
-                PostOrdersArgs(
-                    order=order,
-                    orderType=OrderType.GTC,  # Will stay in book until filled or cancelled
-                )
-            ])
+            # FAK (Fill-And-Kill = IOC): matches what it can right now, unmatched remainder is cancelled
+            resp = self.submit_order(token_id, limit_price, size, side, OrderType.FAK)
             
             if not resp or len(resp) == 0:
-                print(f"   ❌ Empty response from CLOB")
-                return False, None, None
+                log(f"   ❌ Empty response from CLOB")
+                return False, None, None, 0.0
             
             order_result = resp[0]
             if not (order_result.get('success') or order_result.get('orderID')):
                 error_msg = order_result.get('errorMsg') or order_result.get('error') or str(order_result)
-                print(f"   ❌ Order failed: {error_msg}")
-                return False, None, None
+                log(f"   ❌ Order failed: {error_msg}")
+                return False, None, None, 0.0
             
             order_id = order_result.get('orderID')
-            print(f"   📝 Order placed: {order_id} | Waiting {wait_time}s for fill...")
             
-            # Wait and check for fill
-            start_time = time.time()
-            while time.time() - start_time < wait_time:
-                time.sleep(0.5)
-                
-                filled, actual_price = self.check_order_status(order_id)
-                if filled:
-                    print(f"   ✅ FILLED @ ${actual_price:.2f}")
-                    return True, actual_price, order_id
+            # The match result comes back on the post itself (BUY: making=USDC, taking=shares; SELL: reverse)
+            making = float(order_result.get('makingAmount') or 0)
+            taking = float(order_result.get('takingAmount') or 0)
+            if making > 0 and taking > 0:
+                filled_size, usdc = (taking, making) if side == BUY else (making, taking)
+                actual_price = usdc / filled_size
+                # The post already told us the fill - ignore the pushed echo; its fee isn't
+                # reported here, so the balance re-syncs rather than taking an approximate delta
+                self.apply_fill_to_balance(order_id, actual_price, filled_size)
+                self.forget_order(order_id)
+                log(f"   ✅ FILLED {filled_size:.2f} @ ${actual_price:.2f}")
+                return True, actual_price, order_id, filled_size
             
-            # Not filled - cancel order
-            print(f"   ⏰ Not filled in {wait_time}s - cancelling order")
-            try:
-                self.client.cancel(order_id)
-                print(f"   🚫 Order cancelled")
-            except:
-                pass
+            if order_result.get('status') != 'delayed':
+                self.forget_order(order_id)
+                log(f"   ⏰ Nothing matched at ${limit_price:.2f} - order killed")
+                return False, None, order_id, 0.0
+            
+            # Delayed matching - the result arrives on the user channel
+            log(f"   📝 Order {order_id} delayed | Waiting up to {wait_time}s for the match...")
+            filled, actual_price, filled_size = self.wait_for_fill(order_id, wait_time)
+            if filled:
+                log(f"   ✅ FILLED @ ${actual_price:.2f}")
+                return True, actual_price, order_id, filled_size
             
-            return False, None, order_id
+            log(f"   ⏰ Not matched in {wait_time}s")
+            return False, None, order_id, 0.0
             
         except Exception as e:
-            print(f"   ❌ Order error: {e}")
-            return False, None, None
+            log(f"   ❌ Order error: {e}")
+            return False, None, None, 0.0
 
     def place_market_order_with_validation(self, token_id, max_price, size, side, max_slippage=0.01):
         """
@@ -379,59 +996,47 @@ class DualStrategyBot:
             size = round(size, 1)
             
             if size < MIN_ORDER_SIZE:
-                print(f"   ⚠️ Order size {size} below minimum {MIN_ORDER_SIZE}")
+                log(f"   ⚠️ Order size {size} below minimum {MIN_ORDER_SIZE}")
                 return None
             
             # Check current market price
             current_price = self.get_best_ask(token_id) if side == BUY else self.get_best_bid(token_id)
             
             if not current_price:
-                print(f"   ⚠️ Cannot get current price")
+                log(f"   ⚠️ Cannot get current price")
                 return None
             
             # Validate price is acceptable
             if side == BUY:
                 if current_price > (max_price + max_slippage):
-                    print(f"   🚫 Price moved too high: ${current_price:.2f} > ${max_price + max_slippage:.2f}")
+                    log(f"   🚫 Price moved too high: ${current_price:.2f} > ${max_price + max_slippage:.2f}")
                     return None
                 limit_price = min(0.99, round(current_price + max_slippage, 2))
             else:
                 if current_price < (max_price - max_slippage):
-                    print(f"   🚫 Price moved too low: ${current_price:.2f} < ${max_price - max_slippage:.2f}")
+                    log(f"   🚫 Price moved too low: ${current_price:.2f} < ${max_price - max_slippage:.2f}")
                     return None
                 limit_price = max(0.01, round(current_price - max_slippage, 2))
             
-            print(f"   ⚡ Market validated: ${current_price:.2f} | Limit: ${limit_price:.2f}")
+            log(f"   ⚡ Market validated: ${current_price:.2f} | Limit: ${limit_price:.2f}")
             
-            order = self.client.create_order(OrderArgs(
-                price=limit_price,
-                size=size,
-                side=side,
-                token_id=token_id,
-            ))
-            
-            resp = self.client.post_orders([
-                PostOrdersArgs(
-                    order=order,
-                    orderType=OrderType.FOK,
-                )
-            ])
+            resp = self.submit_order(token_id, limit_price, size, side, OrderType.FOK)
             
             if resp and len(resp) > 0:
                 order_result = resp[0]
                 if order_result.get('success') or order_result.get('orderID'):
                     order_id = order_result.get('orderID', 'success')
-                    print(f"   ✅ Order placed: {order_id}")
+                    log(f"   ✅ Order placed: {order_id}")
                     return order_id
                 else:
                     error_msg = order_result.get('errorMsg') or order_result.get('error') or str(order_result)
-                    print(f"   ⚠️ Order failed: {error_msg}")
+                    log(f"   ⚠️ Order failed: {error_msg}")
                     return None
             
             return None
             
         except Exception as e:
-            print(f"   ❌ Order error: {e}")
+            log(f"   ❌ Order error: {e}")
             return None
 
     # ==========================================
@@ -447,7 +1052,7 @@ class DualStrategyBot:
             size = round(size, 1)
             
             if size < MIN_ORDER_SIZE:
-                print(f"   ⚠️ Order size {size} below minimum {MIN_ORDER_SIZE}")
+                log(f"   ⚠️ Order size {size} below minimum {MIN_ORDER_SIZE}")
                 return None
 
             if side == BUY:
@@ -457,49 +1062,53 @@ class DualStrategyBot:
                 limit_price = round(current_price - slippage, 2)
                 if limit_price < 0.01: limit_price = 0.01
             
-            print(f"   🔧 Placing FOK {side} | Size: {size} | Mkt Price: {current_price:.2f} | Limit Price: {limit_price:.2f}")
-            
-            order = self.client.create_order(OrderArgs(
-                price=limit_price, 
-                size=size,
-                side=side,
-                token_id=token_id,
-            ))
+            log(f"   🔧 Placing FOK {side} | Size: {size} | Mkt Price: {current_price:.2f} | Limit Price: {limit_price:.2f}")
             
-            resp = self.client.post_orders([
-                PostOrdersArgs(
-                    order=order,
-                    orderType=OrderType.FOK,
-                )
-            ])
+            resp = self.submit_order(token_id, limit_price, size, side, OrderType.FOK)
             
             if resp and len(resp) > 0:
                 order_result = resp[0]
                 if order_result.get('success') or order_result.get('orderID'):
                     order_id = order_result.get('orderID', 'success')
-                    print(f"   ✅ FOK Order placed: {order_id}")
+                    log(f"   ✅ FOK Order placed: {order_id}")
                     return order_id
                 else:
                     error_msg = order_result.get('errorMsg') or order_result.get('error') or str(order_result)
-                    print(f"   ⚠️ FOK Order failed: {error_msg}")
+                    log(f"   ⚠️ FOK Order failed: {error_msg}")
                     return None
             else:
-                print(f"   ⚠️ Empty response from CLOB")
+                log(f"   ⚠️ Empty response from CLOB")
                 return None
                 
         except Exception as e:
-            print(f"   ❌ Order error: {e}")
+            log(f"   ❌ Order error: {e}")
             return None 
  
     def check_order_status(self, order_id):
-        """Check if order has been filled and return the fill price"""
+        """Check if order has been filled; returns (filled, fill_price, filled_size)"""
+        ev = self.order_events.get(order_id)
+        if ev and ev.is_set():
+            result = self.order_fills[order_id]
+            self.forget_order(order_id)
+            return result
+        
+        if self.user_stream_alive():
+            return False, None, 0.0
+        
+        return self.check_order_status_rest(order_id)
+
+    def check_order_status_rest(self, order_id):
+        """Check order fill status with a single GET /order/{id} (fallback when the user stream is silent)"""
         try:
             order_details = self.client.get_order(order_id)
             
             if isinstance(order_details, dict):
                 status = order_details.get('status', '')
+                size_matched = float(order_details.get('size_matched') or 0)
+                original_size = float(order_details.get('original_size') or 0)
                 
-                if status in ['MATCHED', 'FILLED', 'COMPLETED']:
+                # Same rule as the user channel: terminal status, or fully matched while still LIVE
+                if status in FILL_STATUSES or (original_size > 0 and size_matched >= original_size):
                     actual_price = None
                     
                     if 'price' in order_details:
@@ -508,13 +1117,162 @@ class DualStrategyBot:
                         actual_price = float(order_details['avgFillPrice'])
                     
                     if actual_price and actual_price > 0:
-                        return True, actual_price
+                        # Fill seen on REST rather than pushed - let the balance cache re-sync
+                        self.order_sides.pop(order_id, None)
+                        self.invalidate_balance()
+                        return True, actual_price, size_matched
                 
-                return False, None
+                return False, None, 0.0
             
-            return False, None
+            return False, None, 0.0
         except Exception as e:
-            return False, None
+            return False, None, 0.0
+
+    def wait_for_fill(self, order_id, timeout):
+        """Block until the user stream reports a fill; poll REST only while the stream is silent"""
+        ev = self.get_order_event(order_id)
+        deadline = time.monotonic() + timeout
+        
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if ev.wait(max(0, min(0.5, remaining))):
+                    return self.order_fills[order_id]
+                if remaining <= 0:
+                    break
+                if not self.user_stream_alive():
+                    result = self.check_order_status_rest(order_id)
+                    if result[0]:
+                        return result
+            
+            # Last word from REST in case the push was missed
+            return self.check_order_status_rest(order_id)
+        finally:
+            # Callers wait on FOK/FAK orders once - filled or killed, the order is done either way
+            self.forget_order(order_id)
+
+    # ==========================================
+    # USER CHANNEL (ORDER FILLS)
+    # ==========================================
+    def get_order_event(self, order_id):
+        """Get (or create) the fill event for an order id"""
+        with self.order_lock:
+            ev = self.order_events.get(order_id)
+            if ev is None:
+                ev = threading.Event()
+                self.order_events[order_id] = ev
+            return ev
+
+    def forget_order(self, order_id):
+        """Drop an order's fill tracking once it has been consumed or killed"""
+        self.finished_orders.add(order_id)
+        self.order_sides.pop(order_id, None)
+        with self.order_lock:
+            self.order_events.pop(order_id, None)
+            self.order_fills.pop(order_id, None)
+
+    def record_fill(self, order_id, price, size, fee_rate_bps=None):
+        """Store a fill pushed by the user channel and wake any waiter (fee_rate_bps=None: cost not exact)"""
+        if not order_id or not price or price <= 0:
+            return
+        if order_id in self.finished_orders:
+            return  # Late MINED/CONFIRMED echo of an order we are done with
+        ev = self.get_order_event(order_id)
+        if not ev.is_set():
+            self.order_fills[order_id] = (True, price, size)
+            ev.set()
+            self.apply_fill_to_balance(order_id, price, size, fee_rate_bps)
+
+    def user_stream_alive(self):
+        """True if the user channel has spoken within USER_WS_STALE_AFTER seconds"""
+        return time.monotonic() - self.user_ws_last_msg < USER_WS_STALE_AFTER
+
+    def handle_user_event(self, event):
+        """Apply a single user-channel event (trade / order update)"""
+        event_type = event.get('event_type')
+        
+        if event_type == 'trade':
+            if event.get('status') not in ('MATCHED', 'MINED', 'CONFIRMED'):
+                return
+            # Trades carry the execution price, matched size and fee rate - an exact balance delta
+            self.record_fill(
+                event.get('taker_order_id'),
+                float(event.get('price') or 0),
+                float(event.get('size') or 0),
+                float(event.get('fee_rate_bps') or 0),
+            )
+        
+        elif event_type == 'order':
+            order_id = event.get('id')
+            status = event.get('status', '')
+            size_matched = float(event.get('size_matched') or 0)
+            original_size = float(event.get('original_size') or 0)
+            
+            if status in FILL_STATUSES or (original_size > 0 and size_matched >= original_size):
+                # 'price' here is the order's limit, not the execution price - balance re-syncs
+                self.record_fill(order_id, float(event.get('price') or 0), size_matched)
+
+    def on_user_message(self, ws, message):
+        self.user_ws_last_msg = time.monotonic()
+        
+        if message == "PONG":
+            return
+        
+        try:
+            data = orjson.loads(message)
+        except ValueError:
+            return
+        
+        for event in (data if isinstance(data, list) else [data]):
+            if isinstance(event, dict):
+                self.handle_user_event(event)
+
+    def on_user_open(self, ws):
+        self.invalidate_balance()  # Fills may have been missed while disconnected
+        creds = self.api_creds
+        ws.send(json.dumps({
+            "auth": {
+                "apiKey": creds.api_key,
+                "secret": creds.api_secret,
+                "passphrase": creds.api_passphrase
+            },
+            "markets": [],
+            "type": "user"
+        }))
+        self.user_ws_last_msg = time.monotonic()
+        
+        def keepalive():
+            while ws.sock and ws.sock.connected:
+                # Zombie guard: a connected socket that stopped talking gets recycled
+                if not self.user_stream_alive():
+                    log(f"\n   ⚠️ User stream silent for {USER_WS_STALE_AFTER}s - reconnecting")
+                    ws.close()
+                    return
+                try:
+                    ws.send("PING")
+                except Exception:
+                    return
+                time.sleep(USER_WS_PING_INTERVAL)
+        
+        threading.Thread(target=keepalive, daemon=True).start()
+
+    def user_stream_loop(self):
+        """Keep the user channel connected, reconnecting on drop"""
+        while True:
+            try:
+                ws = websocket.WebSocketApp(
+                    USER_WS_URL,
+                    on_open=self.on_user_open,
+                    on_message=self.on_user_message
+                )
+                ws.run_forever()
+            except Exception as e:
+                log(f"   ⚠️ User stream error: {e}")
+            time.sleep(1)
+
+    def start_user_stream(self):
+        """Start the user WebSocket channel in a background thread"""
+        threading.Thread(target=self.user_stream_loop, daemon=True).start()
 
     def get_actual_position_size(self, token_id):
         """Get the actual number of shares we own for a token"""
@@ -524,41 +1282,54 @@ class DualStrategyBot:
                 return float(balance)
             return 0.0
         except Exception as e:
-            print(f"   ⚠️ Error getting position size: {e}")
+            log(f"   ⚠️ Error getting position size: {e}")
             return 0.0
 
     # ==========================================
     # DUMP HEDGE STRATEGY (UPDATED WITH PRECISE ORDERS)
     # ==========================================
     
+    def find_reference_tick(self, cutoff):
+        """Newest (time, yes, no) row sampled at or before `cutoff`, or None"""
+        # The ring is two time-sorted runs: [head:] holds the older samples, [:head] the newer
+        # ones. Binary-search the newer run first, then the older one - no copy, O(log n).
+        count = self.price_tick_count
+        if count <= DH_TICK_BUFFER:
+            runs = (self.price_ticks[:count],)
+        else:
+            head = count % DH_TICK_BUFFER
+            runs = (self.price_ticks[:head], self.price_ticks[head:])
+        
+        for run in runs:
+            i = np.searchsorted(run[:, 0], cutoff, side='right') - 1
+            if i >= 0:
+                return run[i]
+        return None
+
     def detect_dump(self, current_yes, current_no, time_since_start):
         """Detect if either side has dumped significantly"""
         if time_since_start > (DH_WATCH_WINDOW_MINUTES * 60):
             return None, None
         
-        self.yes_price_history.append((time.time(), current_yes))
-        self.no_price_history.append((time.time(), current_no))
+        # Both sides are sampled together, so one clock read covers the pair
+        now = time.monotonic()
+        self.price_ticks[self.price_tick_count % DH_TICK_BUFFER] = (now, current_yes, current_no)
+        self.price_tick_count += 1
         
-        if len(self.yes_price_history) < 2 or len(self.no_price_history) < 2:
+        ref = self.find_reference_tick(now - DH_DUMP_TIMEFRAME)
+        if ref is None:
             return None, None
+        yes_old_price, no_old_price = ref[1], ref[2]
         
         # Calculate YES dump
-        yes_old_time, yes_old_price = self.yes_price_history[0]
-        yes_new_time, yes_new_price = self.yes_price_history[-1]
-        yes_time_diff = yes_new_time - yes_old_time
-        
-        if yes_time_diff >= DH_DUMP_TIMEFRAME and yes_old_price > 0:
-            yes_drop_pct = (yes_old_price - yes_new_price) / yes_old_price
+        if yes_old_price > 0:
+            yes_drop_pct = float((yes_old_price - current_yes) / yes_old_price)
             if yes_drop_pct >= DH_DUMP_THRESHOLD:
                 return "YES", yes_drop_pct
         
         # Calculate NO dump
-        no_old_time, no_old_price = self.no_price_history[0]
-        no_new_time, no_new_price = self.no_price_history[-1]
-        no_time_diff = no_new_time - no_old_time
-        
-        if no_time_diff >= DH_DUMP_TIMEFRAME and no_old_price > 0:
-            no_drop_pct = (no_old_price - no_new_price) / no_old_price
+        if no_old_price > 0:
+            no_drop_pct = float((no_old_price - current_no) / no_old_price)
             if no_drop_pct >= DH_DUMP_THRESHOLD:
                 return "NO", no_drop_pct
         
@@ -570,13 +1341,19 @@ class DualStrategyBot:
         
         # Reset for new market
         if self.dh_current_market != slug:
+            if self.dh_leg1_active:
+                unhedged = self.dh_leg1_shares - self.dh_leg2_shares
+                log(f"\n⚠️ DH LEG 1 on {self.dh_current_market} closed with {unhedged:.2f} shares unhedged")
             self.dh_current_market = slug
+            self._side_tok = {"YES": market['yes_token'], "NO": market['no_token']}
             self.dh_leg1_active = False
             self.dh_leg1_side = None
             self.dh_leg1_price = None
             self.dh_leg1_shares = 0
-            self.yes_price_history.clear()
-            self.no_price_history.clear()
+            self.dh_leg2_shares = 0.0
+            self.dh_leg2_cost = 0.0
+            self.dh_balance_before = None
+            self.price_tick_count = 0
         
         if slug in self.traded_markets_dumphedge:
             return "already_traded"
@@ -586,40 +1363,45 @@ class DualStrategyBot:
         market_end_time = market_start_time + 900
         time_remaining = market_end_time - current_time
         
-        yes_price = self.get_best_ask(market['yes_token'])
-        no_price = self.get_best_ask(market['no_token'])
+        yes_book, no_book = self.get_books_batch([self._side_tok["YES"], self._side_tok["NO"]])
+        yes_price = yes_book['best_ask'] if yes_book else None
+        no_price = no_book['best_ask'] if no_book else None
         
         if not yes_price or not no_price:
             return "no_prices"
-        
-        minutes_elapsed = int(time_since_start // 60)
-        seconds_elapsed = int(time_since_start % 60)
+        side_price = {"YES": yes_price, "NO": no_price}
         
         # LEG 1: Watch for dump
         if not self.dh_leg1_active:
             if time_since_start > (DH_WATCH_WINDOW_MINUTES * 60):
                 return "outside_watch_window"
             
-            print(f"💥 DH [{minutes_elapsed}m {seconds_elapsed}s] YES: ${yes_price:.2f} | NO: ${no_price:.2f} | Watching for dump...", end="\r")
+            minutes_elapsed, seconds_elapsed = divmod(int(time_since_start), 60)
+            if self.status_due("DH"):
+                log(f"💥 DH [{minutes_elapsed}m {seconds_elapsed}s] YES: ${yes_price:.2f} | NO: ${no_price:.2f} | Watching for dump...", end="\r")
             
             dump_side, dump_pct = self.detect_dump(yes_price, no_price, time_since_start)
             
             if dump_side:
-                print(f"\n\n{'='*60}")
-                print(f"💥 DUMP DETECTED - {dump_side} dropped {dump_pct*100:.1f}% in {DH_DUMP_TIMEFRAME}s!")
-                print(f"{'='*60}")
-                print(f"Market: {market['title']}")
-                print(f"Time Since Start: {minutes_elapsed}m {seconds_elapsed}s")
-                print(f"YES: ${yes_price:.2f} | NO: ${no_price:.2f}")
+                log(f"\n\n{'='*60}")
+                log(f"💥 DUMP DETECTED - {dump_side} dropped {dump_pct*100:.1f}% in {DH_DUMP_TIMEFRAME}s!")
+                log(f"{'='*60}")
+                log(f"Market: {market['title']}")
+                log(f"Time Since Start: {minutes_elapsed}m {seconds_elapsed}s")
+                log(f"YES: ${yes_price:.2f} | NO: ${no_price:.2f}")
                 
                 # ⭐ UPDATED: Use precise limit order for LEG 1
-                entry_token = market['yes_token'] if dump_side == "YES" else market['no_token']
-                entry_price = yes_price if dump_side == "YES" else no_price
+                entry_token = self._side_tok[dump_side]
+                entry_price = side_price[dump_side]
+                
+                log(f"\n⚡ Executing LEG 1: BUY {dump_side}")
                 
-                print(f"\n⚡ Executing LEG 1: BUY {dump_side}")
+                # Snapshot the balance before LEG 1 so the hedge log gets a real before/after.
+                # Runs on the pool so a due RPC re-sync never delays the LEG 1 order.
+                balance_future = self.pool.submit(self.cached_balance)
                 
                 # Try precise order first
-                success, actual_entry_price, entry_id = self.place_strict_limit_order(
+                success, actual_entry_price, entry_id, filled_size = self.place_strict_limit_order(
                     token_id=entry_token,
                     limit_price=entry_price,
                     size=DH_SHARES_PER_LEG,
@@ -629,7 +1411,7 @@ class DualStrategyBot:
                 
                 # Fallback to market order if precise fails
                 if not success:
-                    print(f"   ⚠️ Precise order missed, trying market order with validation...")
+                    log(f"   ⚠️ Precise order missed, trying market order with validation...")
                     entry_id = self.place_market_order_with_validation(
                         token_id=entry_token,
                         max_price=entry_price,
@@ -639,109 +1421,124 @@ class DualStrategyBot:
                     )
                     
                     if not entry_id:
-                        print("❌ LEG 1 entry failed")
+                        log("❌ LEG 1 entry failed")
                         return "leg1_failed"
                     
-                    time.sleep(2)
-                    filled, actual_entry_price = self.check_order_status(entry_id)
+                    # FOK fills immediately - return as soon as the fill is pushed
+                    filled, actual_entry_price, filled_size = self.wait_for_fill(entry_id, FOK_CONFIRM_TIMEOUT)
                     
                     if not filled or not actual_entry_price:
-                        print("❌ Could not verify LEG 1 fill")
+                        log("❌ Could not verify LEG 1 fill")
                         return "leg1_failed"
                 
-                # Get actual position
-                self.dh_leg1_shares = self.get_actual_position_size(entry_token)
-                if self.dh_leg1_shares <= 0:
-                    self.dh_leg1_shares = DH_SHARES_PER_LEG
+                # Fill size comes with the fill itself - no position lookup needed
+                self.dh_leg1_shares = filled_size or DH_SHARES_PER_LEG
+                self.dh_leg2_shares = 0.0
+                self.dh_leg2_cost = 0.0
                 
+                self.dh_balance_before = balance_future.result()
                 self.dh_leg1_active = True
                 self.dh_leg1_side = dump_side
                 self.dh_leg1_price = actual_entry_price
                 
-                print(f"✅ LEG 1 FILLED @ ${actual_entry_price:.2f}")
-                print(f"📦 Shares: {self.dh_leg1_shares:.2f}")
-                print(f"\n🔍 Now watching for LEG 2 hedge opportunity...")
-                print(f"   Target: leg1_price + opposite_ask < ${DH_SUM_TARGET:.2f}")
-                print(f"   Need opposite side < ${DH_SUM_TARGET - actual_entry_price:.2f}")
+                log(f"✅ LEG 1 FILLED @ ${actual_entry_price:.2f}")
+                log(f"📦 Shares: {self.dh_leg1_shares:.2f}")
+                log(f"\n🔍 Now watching for LEG 2 hedge opportunity...")
+                log(f"   Target: leg1_price + opposite_ask < ${DH_SUM_TARGET:.2f}")
+                log(f"   Need opposite side < ${DH_SUM_TARGET - actual_entry_price:.2f}")
         
         # LEG 2: Watch for hedge opportunity
         else:
-            opposite_side = "NO" if self.dh_leg1_side == "YES" else "YES"
-            opposite_price = no_price if opposite_side == "NO" else yes_price
+            opposite_side = OPPOSITE_SIDE[self.dh_leg1_side]
+            opposite_price = side_price[opposite_side]
             combined_cost = self.dh_leg1_price + opposite_price
             
-            print(f"🔍 DH LEG2 Watch | {opposite_side}: ${opposite_price:.2f} | Combined: ${combined_cost:.2f} | Target: <${DH_SUM_TARGET:.2f}", end="\r")
+            if self.status_due("DH"):
+                log(f"🔍 DH LEG2 Watch | {opposite_side}: ${opposite_price:.2f} | Combined: ${combined_cost:.2f} | Target: <${DH_SUM_TARGET:.2f}", end="\r")
             
             if combined_cost < DH_SUM_TARGET:
                 profit_pct = ((1.0 - combined_cost) / combined_cost) * 100
                 
-                print(f"\n\n{'='*60}")
-                print(f"🎯 HEDGE OPPORTUNITY FOUND!")
-                print(f"{'='*60}")
-                print(f"LEG 1: {self.dh_leg1_side} @ ${self.dh_leg1_price:.2f}")
-                print(f"LEG 2: {opposite_side} @ ${opposite_price:.2f}")
-                print(f"Combined Cost: ${combined_cost:.2f}")
-                print(f"Guaranteed Profit: ~{profit_pct:.1f}%")
+                log(f"\n\n{'='*60}")
+                log(f"🎯 HEDGE OPPORTUNITY FOUND!")
+                log(f"{'='*60}")
+                log(f"LEG 1: {self.dh_leg1_side} @ ${self.dh_leg1_price:.2f}")
+                log(f"LEG 2: {opposite_side} @ ${opposite_price:.2f}")
+                log(f"Combined Cost: ${combined_cost:.2f}")
+                log(f"Guaranteed Profit: ~{profit_pct:.1f}%")
                 
                 # ⭐ UPDATED: Use precise limit order for LEG 2
-                opposite_token = market['no_token'] if opposite_side == "NO" else market['yes_token']
+                opposite_token = self._side_tok[opposite_side]
+                # Only what LEG 1 filled and earlier LEG 2 fills have not covered yet
+                leg2_target = self.dh_leg1_shares - self.dh_leg2_shares
                 
-                print(f"\n⚡ Executing LEG 2: BUY {opposite_side}")
+                log(f"\n⚡ Executing LEG 2: BUY {opposite_side} ({leg2_target:.2f} shares)")
                 
                 # Try precise order first
-                success, actual_leg2_price, leg2_id = self.place_strict_limit_order(
+                success, actual_leg2_price, leg2_id, leg2_shares = self.place_strict_limit_order(
                     token_id=opposite_token,
                     limit_price=opposite_price,
-                    size=DH_SHARES_PER_LEG,
+                    size=leg2_target,
                     side=BUY,
                     wait_time=DH_ENTRY_WAIT_TIME
                 )
                 
                 # Fallback to market order if precise fails
                 if not success:
-                    print(f"   ⚠️ Precise order missed, trying market order with validation...")
+                    log(f"   ⚠️ Precise order missed, trying market order with validation...")
                     leg2_id = self.place_market_order_with_validation(
                         token_id=opposite_token,
                         max_price=opposite_price,
-                        size=DH_SHARES_PER_LEG,
+                        size=leg2_target,
                         side=BUY,
                         max_slippage=DH_MAX_SLIPPAGE
                     )
                     
                     if not leg2_id:
-                        print("❌ LEG 2 entry failed")
+                        log("❌ LEG 2 entry failed")
                         return "leg2_failed"
                     
-                    time.sleep(2)
-                    filled, actual_leg2_price = self.check_order_status(leg2_id)
+                    filled, actual_leg2_price, leg2_shares = self.wait_for_fill(leg2_id, FOK_CONFIRM_TIMEOUT)
                     
                     if not filled or not actual_leg2_price:
-                        print("❌ Could not verify LEG 2 fill")
+                        log("❌ Could not verify LEG 2 fill")
                         return "leg2_failed"
                 
-                # Get actual position
-                leg2_shares = self.get_actual_position_size(opposite_token)
-                if leg2_shares <= 0:
-                    leg2_shares = DH_SHARES_PER_LEG
+                leg2_shares = min(leg2_shares or leg2_target, leg2_target)
+                self.dh_leg2_shares += leg2_shares
+                self.dh_leg2_cost += actual_leg2_price * leg2_shares
+                unhedged = self.dh_leg1_shares - self.dh_leg2_shares
+                
+                log(f"✅ LEG 2 FILLED @ ${actual_leg2_price:.2f}")
+                log(f"📦 Shares: {leg2_shares:.2f}")
+                
+                if unhedged >= MIN_ORDER_SIZE:
+                    log(f"   ⚠️ Partial hedge - {unhedged:.2f} LEG 1 shares still unhedged, continuing to watch...")
+                    return "watching"
                 
-                actual_combined = self.dh_leg1_price + actual_leg2_price
-                actual_profit = (1.0 - actual_combined) * min(self.dh_leg1_shares, leg2_shares)
+                if unhedged > 0:
+                    log(f"   ⚠️ {unhedged:.2f} shares left below the {MIN_ORDER_SIZE} minimum order size")
+                
+                # Fully hedged - log the whole hedge at LEG 2's volume-weighted price
+                avg_leg2_price = self.dh_leg2_cost / self.dh_leg2_shares
+                actual_combined = self.dh_leg1_price + avg_leg2_price
+                actual_profit = (1.0 - actual_combined) * self.dh_leg2_shares
                 actual_profit_pct = ((1.0 - actual_combined) / actual_combined) * 100
                 
-                print(f"✅ LEG 2 FILLED @ ${actual_leg2_price:.2f}")
-                print(f"📦 Shares: {leg2_shares:.2f}")
-                print(f"\n💰 HEDGE COMPLETE!")
-                print(f"   Actual Combined: ${actual_combined:.2f}")
-                print(f"   Locked Profit: ${actual_profit:.2f} ({actual_profit_pct:.1f}%)")
+                log(f"\n💰 HEDGE COMPLETE!")
+                log(f"   Actual Combined: ${actual_combined:.2f}")
+                log(f"   Locked Profit: ${actual_profit:.2f} ({actual_profit_pct:.1f}%)")
                 
-                # Log trade
+                # Log trade (one clock read / one balance read for the whole row)
+                now = time.time()
+                balance_after = self.cached_balance()
                 trade_data = {
-                    'timestamp': datetime.now().isoformat(),
+                    'timestamp': now,
                     'strategy': 'DUMP_HEDGE',
                     'market_slug': slug,
                     'market_title': market['title'],
                     'entry_side': self.dh_leg1_side,
-                    'entry_time': datetime.now().isoformat(),
+                    'entry_time': now,
                     'intended_entry_price': self.dh_leg1_price,
                     'actual_entry_price': self.dh_leg1_price,
                     'entry_size': DH_SHARES_PER_LEG,
@@ -751,25 +1548,24 @@ class DualStrategyBot:
                     'time_remaining_at_entry': int(time_remaining),
                     'bid_size_at_entry': 0,
                     'exit_reason': 'HEDGE_COMPLETE',
-                    'exit_time': datetime.now().isoformat(),
-                    'exit_price': actual_leg2_price,
-                    'time_in_trade_seconds': int(time.time() - market_start_time),
+                    'exit_time': now,
+                    'exit_price': avg_leg2_price,
+                    'time_in_trade_seconds': int(now - market_start_time),
                     'gross_pnl': actual_profit,
                     'pnl_percent': actual_profit_pct,
                     'win_loss': 'WIN',
                     'leg2_side': opposite_side,
-                    'leg2_price': actual_leg2_price,
-                    'leg2_shares': leg2_shares,
+                    'leg2_price': avg_leg2_price,
+                    'leg2_shares': self.dh_leg2_shares,
                     'combined_cost': actual_combined,
                     'session_trade_number': self.session_trades + 1,
-                    'balance_before': self.get_balance(),
-                    'balance_after': self.get_balance(),
+                    'balance_before': self.dh_balance_before,
+                    'balance_after': balance_after,
                     'session_pnl_running': 0
                 }
                 
                 self.log_trade(trade_data)
-                self.session_wins += 1
-                self.session_trades += 1
+                self.record_result(True)
                 self.traded_markets_dumphedge.add(slug)
                 
                 self.dh_leg1_active = False
@@ -798,8 +1594,7 @@ class DualStrategyBot:
             return "outside_window"
         
         # Get current prices and order book depth
-        yes_book = self.get_order_book_depth(market['yes_token'])
-        no_book = self.get_order_book_depth(market['no_token'])
+        yes_book, no_book = self.get_books_batch([market['yes_token'], market['no_token']])
         
         if not yes_book or not no_book:
             return "no_orderbook"
@@ -810,9 +1605,9 @@ class DualStrategyBot:
         if not yes_price or not no_price:
             return "no_prices"
         
-        minutes_remaining = int(time_remaining // 60)
-        seconds_remaining = int(time_remaining % 60)
-        print(f"📊 MG [{minutes_remaining}m {seconds_remaining}s] YES: ${yes_price:.2f} (Bids: {yes_book['bid_size']:.0f}) | NO: ${no_price:.2f} (Bids: {no_book['bid_size']:.0f})", end="\r")
+        minutes_remaining, seconds_remaining = divmod(int(time_remaining), 60)
+        if self.status_due("MG"):
+            log(f"📊 MG [{minutes_remaining}m {seconds_remaining}s] YES: ${yes_price:.2f} (Bids: {yes_book['bid_size']:.0f}) | NO: ${no_price:.2f} (Bids: {no_book['bid_size']:.0f})", end="\r")
         
         # ONLY CHECK NO (DOWN) SIDE
         entry_token = market['no_token']
@@ -826,39 +1621,39 @@ class DualStrategyBot:
             return "no_opportunity"
         
         # Calculate position size based on wallet balance
-        current_balance = self.get_balance()
+        current_balance = self.cached_balance()
         available_to_trade = current_balance * MG_WALLET_PERCENTAGE
         order_size = available_to_trade / entry_price
         order_size = round(order_size, 1)
         
         if order_size < MIN_ORDER_SIZE:
-            print(f"\n⚠️ Calculated order size {order_size:.2f} is below minimum {MIN_ORDER_SIZE}")
+            log(f"\n⚠️ Calculated order size {order_size:.2f} is below minimum {MIN_ORDER_SIZE}")
             return "insufficient_balance"
         
         # Ensure we don't exceed available balance
         max_cost = order_size * entry_price
         if max_cost > current_balance:
-            print(f"⚠️ Order cost ${max_cost:.2f} exceeds balance ${current_balance:.2f}")
+            log(f"⚠️ Order cost ${max_cost:.2f} exceeds balance ${current_balance:.2f}")
             order_size = (current_balance * 0.99) / entry_price
             order_size = round(order_size, 1)
-            print(f"   Adjusted to {order_size} shares (${order_size * entry_price:.2f})")
+            log(f"   Adjusted to {order_size} shares (${order_size * entry_price:.2f})")
         
         # Entry criteria met - execute trade
-        print(f"\n\n{'='*60}")
-        print(f"🎯 MID-GAME ENTRY SIGNAL - {entry_side} (DOWN)")
-        print(f"{'='*60}")
-        print(f"Market: {market['title']}")
-        print(f"Time Remaining: {minutes_remaining}m {seconds_remaining}s")
-        print(f"📊 YES: ${yes_price:.2f} | NO: ${no_price:.2f}")
-        print(f"📈 Entry Side: {entry_side} @ ${entry_price:.2f}")
-        print(f"💰 Available Liquidity (Bid Size): {bid_size:.0f} shares")
-        print(f"💵 Wallet Balance: ${current_balance:.2f}")
-        print(f"💵 Using {MG_WALLET_PERCENTAGE*100:.0f}% = ${available_to_trade:.2f}")
-        print(f"📦 Order Size: {order_size:.2f} shares")
+        log(f"\n\n{'='*60}")
+        log(f"🎯 MID-GAME ENTRY SIGNAL - {entry_side} (DOWN)")
+        log(f"{'='*60}")
+        log(f"Market: {market['title']}")
+        log(f"Time Remaining: {minutes_remaining}m {seconds_remaining}s")
+        log(f"📊 YES: ${yes_price:.2f} | NO: ${no_price:.2f}")
+        log(f"📈 Entry Side: {entry_side} @ ${entry_price:.2f}")
+        log(f"💰 Available Liquidity (Bid Size): {bid_size:.0f} shares")
+        log(f"💵 Wallet Balance: ${current_balance:.2f}")
+        log(f"💵 Using {MG_WALLET_PERCENTAGE*100:.0f}% = ${available_to_trade:.2f}")
+        log(f"📦 Order Size: {order_size:.2f} shares")
         
         # Initialize trade data
         trade_data = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': current_time,
             'strategy': 'MID_GAME',
             'market_slug': slug,
             'market_title': market['title'],
@@ -878,13 +1673,13 @@ class DualStrategyBot:
         }
         
         # ⭐ UPDATED: Execute entry with PRECISE limit order
-        entry_start_time = time.time()
-        trade_data['entry_time'] = datetime.fromtimestamp(entry_start_time).isoformat()
+        entry_start_mono = time.monotonic()   # durations: immune to wall-clock steps
+        trade_data['entry_time'] = time.time()
         
-        print(f"\n⚡ Executing PRECISE ENTRY order...")
-        print(f"   Will ONLY fill at ${entry_price:.2f} or better")
+        log(f"\n⚡ Executing PRECISE ENTRY order...")
+        log(f"   Will ONLY fill at ${entry_price:.2f} or better")
         
-        success, actual_entry_price, entry_id = self.place_strict_limit_order(
+        success, actual_entry_price, entry_id, entry_size = self.place_strict_limit_order(
             token_id=entry_token,
             limit_price=entry_price,
             size=order_size,
@@ -893,229 +1688,294 @@ class DualStrategyBot:
         )
         
         if not success:
-            print(f"❌ Entry at ${entry_price:.2f} not available within {MG_ENTRY_WAIT_TIME}s")
-            print(f"   Price may have moved above ${MG_MAX_ENTRY_PRICE:.2f} threshold")
+            log(f"❌ Entry at ${entry_price:.2f} not available")
+            log(f"   Price may have moved above ${MG_MAX_ENTRY_PRICE:.2f} threshold")
             
             # Mark as attempted to prevent retry
             self.traded_markets_midgame.add(slug)
             return "entry_failed"
         
-        # Get the ACTUAL number of shares we purchased
-        time.sleep(1)
-        actual_shares_purchased = self.get_actual_position_size(entry_token)
+        # Get the ACTUAL number of shares we purchased (from the fill; position lookup only if unknown)
+        actual_shares_purchased = entry_size or self.get_actual_position_size(entry_token)
         
         if actual_shares_purchased <= 0:
-            print(f"⚠️ Could not determine actual position size, using order size as fallback")
+            log(f"⚠️ Could not determine actual position size, using order size as fallback")
             actual_shares_purchased = order_size
         
         trade_data['actual_entry_price'] = actual_entry_price
         trade_data['actual_shares_purchased'] = actual_shares_purchased
         
-        print(f"✅ ENTRY FILLED @ ${actual_entry_price:.2f}")
-        print(f"📦 Actual shares purchased: {actual_shares_purchased:.2f}")
-        print(f"\n🎯 Targets:")
-        print(f"   Take Profit: ${MG_TAKE_PROFIT:.2f}")
-        print(f"   Stop Loss: ${MG_STOP_LOSS:.2f}")
+        # Never re-enter this market, even if the bot restarts mid-position
+        self.traded_markets_midgame.add(slug)
+        self.mg_open_position = {
+            'market': slug,
+            'token': entry_token,
+            'entry_price': actual_entry_price,
+            'shares': actual_shares_purchased
+        }
+        
+        log(f"✅ ENTRY FILLED @ ${actual_entry_price:.2f}")
+        log(f"📦 Actual shares purchased: {actual_shares_purchased:.2f}")
+        log(f"\n🎯 Targets:")
+        log(f"   Take Profit: ${MG_TAKE_PROFIT:.2f}")
+        log(f"   Stop Loss: ${MG_STOP_LOSS:.2f}")
         
         # Monitor position until take profit or stop loss
-        print(f"\n💎 Monitoring position...")
+        log(f"\n💎 Monitoring position...")
         
+        # FAK exits can fill partially - keep selling whatever is left until the position is flat
+        shares_remaining = actual_shares_purchased
+        shares_sold = 0.0
+        exit_proceeds = 0.0
+        last_exit_attempt = 0.0
+        
+        self._bid_changed.set()  # First TP/SL check runs immediately, not after a timeout
         while True:
-            time.sleep(CHECK_INTERVAL)
+            # Wake on every streamed bid move; the timeout keeps the REST fallback ticking
+            self._bid_changed.wait(CHECK_INTERVAL)
+            self._bid_changed.clear()
             
             current_bid = self.get_best_bid(entry_token)
             
             if not current_bid:
                 continue
             
-            current_pnl = (current_bid - actual_entry_price) * actual_shares_purchased
-            
-            print(f"   💹 Current Bid: ${current_bid:.2f} | Est P&L: ${current_pnl:+.2f}", end="\r")
+            if self.status_due("MG"):
+                current_pnl = (exit_proceeds - actual_entry_price * shares_sold) + (current_bid - actual_entry_price) * shares_remaining
+                log(f"   💹 Current Bid: ${current_bid:.2f} | Est P&L: ${current_pnl:+.2f}", end="\r")
             
-            # ⭐ UPDATED: Check Take Profit with PRECISE order
+            # ⭐ UPDATED: Check Take Profit / Stop Loss with PRECISE order
             if current_bid >= MG_TAKE_PROFIT:
-                print(f"\n\n🚀 TAKE PROFIT TRIGGERED @ ${current_bid:.2f}!")
-                print(f"   Placing sell order at ${MG_TAKE_PROFIT:.2f}")
-                
-                success, exit_price, exit_id = self.place_strict_limit_order(
-                    token_id=entry_token,
-                    limit_price=MG_TAKE_PROFIT,
-                    size=actual_shares_purchased,
-                    side=SELL,
-                    wait_time=MG_EXIT_WAIT_TIME
-                )
-                
-                if success:
-                    trade_data['exit_reason'] = 'TAKE_PROFIT'
-                    trade_data['exit_time'] = datetime.now().isoformat()
-                    trade_data['exit_price'] = exit_price
-                    trade_data['time_in_trade_seconds'] = time.time() - entry_start_time
-                    trade_data['gross_pnl'] = (exit_price - actual_entry_price) * actual_shares_purchased
-                    trade_data['pnl_percent'] = ((exit_price - actual_entry_price) / actual_entry_price) * 100
-                    trade_data['win_loss'] = 'WIN'
-                    trade_data['balance_after'] = self.get_balance()
-                    trade_data['session_pnl_running'] = trade_data['balance_after'] - trade_data['balance_before']
-                    
-                    self.log_trade(trade_data)
-                    self.session_wins += 1
-                    self.session_trades += 1
-                    self.traded_markets_midgame.add(slug)
-                    
-                    print(f"✅ EXIT FILLED @ ${exit_price:.2f}")
-                    print(f"📦 Shares sold: {actual_shares_purchased:.2f}")
-                    print(f"💰 P&L: ${trade_data['gross_pnl']:+.2f} ({trade_data['pnl_percent']:+.2f}%)")
-                    return "take_profit"
-                else:
-                    print(f"⚠️ Take profit order not filled, continuing to monitor...")
-            
-            # ⭐ UPDATED: Check Stop Loss with PRECISE order
+                exit_reason, exit_limit = 'TAKE_PROFIT', MG_TAKE_PROFIT
             elif current_bid <= MG_STOP_LOSS:
-                print(f"\n\n🛑 STOP LOSS TRIGGERED @ ${current_bid:.2f}!")
-                print(f"   Placing sell order at ${MG_STOP_LOSS:.2f}")
-                
-                success, exit_price, exit_id = self.place_strict_limit_order(
-                    token_id=entry_token,
-                    limit_price=MG_STOP_LOSS,
-                    size=actual_shares_purchased,
-                    side=SELL,
-                    wait_time=MG_EXIT_WAIT_TIME
-                )
-                
-                if success:
-                    trade_data['exit_reason'] = 'STOP_LOSS'
-                    trade_data['exit_time'] = datetime.now().isoformat()
-                    trade_data['exit_price'] = exit_price
-                    trade_data['time_in_trade_seconds'] = time.time() - entry_start_time
-                    trade_data['gross_pnl'] = (exit_price - actual_entry_price) * actual_shares_purchased
-                    trade_data['pnl_percent'] = ((exit_price - actual_entry_price) / actual_entry_price) * 100
-                    trade_data['win_loss'] = 'LOSS'
-                    trade_data['balance_after'] = self.get_balance()
-                    trade_data['session_pnl_running'] = trade_data['balance_after'] - trade_data['balance_before']
-                    
-                    self.log_trade(trade_data)
-                    self.session_losses += 1
-                    self.session_trades += 1
-                    self.traded_markets_midgame.add(slug)
-                    
-                    print(f"✅ EXIT FILLED @ ${exit_price:.2f}")
-                    print(f"📦 Shares sold: {actual_shares_purchased:.2f}")
-                    print(f"💰 P&L: ${trade_data['gross_pnl']:+.2f} ({trade_data['pnl_percent']:+.2f}%)")
-                    return "stop_loss"
-                else:
-                    print(f"⚠️ Stop loss order not filled, continuing to monitor...")
+                # The bid can gap through the stop - price off the live bid so the FAK can still match
+                exit_reason, exit_limit = 'STOP_LOSS', current_bid - MG_MAX_SLIPPAGE
+            else:
+                continue
+            
+            # An unfilled FAK is killed at once - don't sign and post another on every bid tick
+            if time.monotonic() - last_exit_attempt < MG_EXIT_RETRY_INTERVAL:
+                continue
+            last_exit_attempt = time.monotonic()
+            
+            if exit_reason == 'TAKE_PROFIT':
+                log(f"\n\n🚀 TAKE PROFIT TRIGGERED @ ${current_bid:.2f}!")
+            else:
+                log(f"\n\n🛑 STOP LOSS TRIGGERED @ ${current_bid:.2f}!")
+            
+            log(f"   Placing sell order for {shares_remaining:.2f} shares at ${exit_limit:.2f}")
+            
+            success, exit_price, exit_id, sold = self.place_strict_limit_order(
+                token_id=entry_token,
+                limit_price=exit_limit,
+                size=shares_remaining,
+                side=SELL,
+                wait_time=MG_EXIT_WAIT_TIME
+            )
+            
+            if not success:
+                log(f"⚠️ {exit_reason.replace('_', ' ').capitalize()} order not filled, continuing to monitor...")
+                continue
+            
+            sold = min(sold or shares_remaining, shares_remaining)
+            shares_sold += sold
+            exit_proceeds += exit_price * sold
+            shares_remaining -= sold
+            log(f"✅ EXIT FILLED {sold:.2f} @ ${exit_price:.2f}")
+            
+            if shares_remaining >= MIN_ORDER_SIZE:
+                self.mg_open_position['shares'] = shares_remaining
+                log(f"   ⚠️ Partial exit - {shares_remaining:.2f} shares still held, continuing to monitor...")
+                continue
+            
+            if shares_remaining > 0:
+                log(f"   ⚠️ {shares_remaining:.2f} shares left below the {MIN_ORDER_SIZE} minimum order size")
+            
+            # Position is flat - log the whole exit at its volume-weighted price
+            avg_exit_price = exit_proceeds / shares_sold
+            gross_pnl = exit_proceeds - actual_entry_price * shares_sold
+            
+            trade_data['exit_reason'] = exit_reason
+            trade_data['exit_time'] = time.time()
+            trade_data['exit_price'] = avg_exit_price
+            trade_data['time_in_trade_seconds'] = time.monotonic() - entry_start_mono
+            trade_data['gross_pnl'] = gross_pnl
+            trade_data['pnl_percent'] = ((avg_exit_price - actual_entry_price) / actual_entry_price) * 100
+            trade_data['win_loss'] = 'WIN' if gross_pnl > 0 else 'LOSS'
+            trade_data['balance_after'] = self.cached_balance()
+            trade_data['session_pnl_running'] = trade_data['balance_after'] - trade_data['balance_before']
+            
+            self.log_trade(trade_data)
+            self.record_result(gross_pnl > 0)
+            self.traded_markets_midgame.add(slug)
+            self.mg_open_position = None
+            
+            log(f"📦 Shares sold: {shares_sold:.2f} @ avg ${avg_exit_price:.2f}")
+            log(f"💰 P&L: ${gross_pnl:+.2f} ({trade_data['pnl_percent']:+.2f}%)")
+            return exit_reason.lower()
 
     # ==========================================
     # MAIN BOT LOOP
     # ==========================================
 
+    def record_result(self, win):
+        """Count a finished trade in the session stats"""
+        with self._stats_lock:
+            self.session_trades += 1
+            if win:
+                self.session_wins += 1
+            else:
+                self.session_losses += 1
+
+    def session_counts(self):
+        """Consistent (trades, wins, losses) snapshot"""
+        with self._stats_lock:
+            return self.session_trades, self.session_wins, self.session_losses
+
+    def print_session_stats(self):
+        current_balance = self.cached_balance()
+        session_pnl = current_balance - self.starting_balance
+        trades, wins, losses = self.session_counts()
+        win_rate = (wins / trades * 100) if trades > 0 else 0
+        
+        log(f"\n📊 SESSION STATS:")
+        log(f"   Starting Balance: ${self.starting_balance:.2f}")
+        log(f"   Current Balance: ${current_balance:.2f}")
+        log(f"   Session P&L: ${session_pnl:+.2f}")
+        log(f"   Trades: {trades} | Wins: {wins} | Losses: {losses}")
+        log(f"   Win Rate: {win_rate:.1f}%")
+        log(f"   CLOB Latency: {self.clob_latency_summary()}\n")
+
+    def strategy_worker(self, name, execute, done_statuses):
+        """Evaluate one strategy against the active market until the process exits"""
+        while True:
+            try:
+                active = self.active_market
+                if not active:
+                    time.sleep(CHECK_INTERVAL)
+                    continue
+                
+                market, market_timestamp = active
+                status = execute(market, market_timestamp)
+                
+                if status in done_statuses:
+                    log(f"\n✅ [{name}] Trade cycle complete!")
+                    self.print_session_stats()
+                    time.sleep(5)
+                elif status == "already_traded":
+                    # Nothing left to do on this market - idle until the run loop rolls it
+                    while self.active_market is active:
+                        time.sleep(CHECK_INTERVAL)
+                else:
+                    time.sleep(CHECK_INTERVAL)
+            
+            except Exception as e:
+                log(f"\n❌ [{name}] Error: {e}")
+                import traceback
+                traceback.print_exc()
+                time.sleep(10)
+
     def run(self):
         """Main bot loop"""
-        print(f"🚀 Bot is now running...")
-        print(f"\n📋 ACTIVE STRATEGY: {ACTIVE_STRATEGY}")
+        log(f"🚀 Bot is now running...")
+        log(f"\n📋 ACTIVE STRATEGY: {ACTIVE_STRATEGY}")
         
         if ACTIVE_STRATEGY in ["MID_GAME", "BOTH"]:
-            print(f"\n📊 MID-GAME STRATEGY (NO ONLY) - ⭐ PRECISE ORDERS ENABLED:")
-            print(f"   Entry Window: {MG_LOCK_WINDOW_START}s to {MG_LOCK_WINDOW_END}s remaining")
-            print(f"   Entry Price Range: ${MG_MIN_ENTRY_PRICE:.2f} - ${MG_MAX_ENTRY_PRICE:.2f}")
-            print(f"   ⭐ Will ONLY fill at exact price or better!")
-            print(f"   Entry Wait Time: {MG_ENTRY_WAIT_TIME}s")
-            print(f"   Minimum Bid Size: {MG_MIN_BID_SIZE} shares")
-            print(f"   Position Size: {MG_WALLET_PERCENTAGE*100:.0f}% of wallet balance")
-            print(f"   Take Profit: ${MG_TAKE_PROFIT:.2f}")
-            print(f"   Stop Loss: ${MG_STOP_LOSS:.2f}")
-            print(f"   Exit Wait Time: {MG_EXIT_WAIT_TIME}s")
+            log(f"\n📊 MID-GAME STRATEGY (NO ONLY) - ⭐ PRECISE ORDERS ENABLED:")
+            log(f"   Entry Window: {MG_LOCK_WINDOW_START}s to {MG_LOCK_WINDOW_END}s remaining")
+            log(f"   Entry Price Range: ${MG_MIN_ENTRY_PRICE:.2f} - ${MG_MAX_ENTRY_PRICE:.2f}")
+            log(f"   ⭐ Will ONLY fill at exact price or better!")
+            log(f"   Entry Wait Time: {MG_ENTRY_WAIT_TIME}s")
+            log(f"   Minimum Bid Size: {MG_MIN_BID_SIZE} shares")
+            log(f"   Position Size: {MG_WALLET_PERCENTAGE*100:.0f}% of wallet balance")
+            log(f"   Take Profit: ${MG_TAKE_PROFIT:.2f}")
+            log(f"   Stop Loss: ${MG_STOP_LOSS:.2f}")
+            log(f"   Exit Wait Time: {MG_EXIT_WAIT_TIME}s")
         
         if ACTIVE_STRATEGY in ["DUMP_HEDGE", "BOTH"]:
-            print(f"\n💥 DUMP HEDGE STRATEGY - ⭐ PRECISE ORDERS ENABLED:")
-            print(f"   Watch Window: First {DH_WATCH_WINDOW_MINUTES} minutes of round")
-            print(f"   Dump Threshold: {DH_DUMP_THRESHOLD*100:.0f}% drop in {DH_DUMP_TIMEFRAME}s")
-            print(f"   Sum Target: <${DH_SUM_TARGET:.2f}")
-            print(f"   Shares Per Leg: {DH_SHARES_PER_LEG}")
-            print(f"   ⭐ Will attempt precise orders with {DH_MAX_SLIPPAGE:.2f} fallback")
-            print(f"   Entry Wait Time: {DH_ENTRY_WAIT_TIME}s")
-        
-        print(f"\n📊 Trade Logging: {TRADE_LOG_FILE}")
+            log(f"\n💥 DUMP HEDGE STRATEGY - ⭐ PRECISE ORDERS ENABLED:")
+            log(f"   Watch Window: First {DH_WATCH_WINDOW_MINUTES} minutes of round")
+            log(f"   Dump Threshold: {DH_DUMP_THRESHOLD*100:.0f}% drop in {DH_DUMP_TIMEFRAME}s")
+            log(f"   Sum Target: <${DH_SUM_TARGET:.2f}")
+            log(f"   Shares Per Leg: {DH_SHARES_PER_LEG}")
+            log(f"   ⭐ Will attempt precise orders with {DH_MAX_SLIPPAGE:.2f} fallback")
+            log(f"   Entry Wait Time: {DH_ENTRY_WAIT_TIME}s")
+        
+        log(f"\n📊 Trade Logging: {TRADE_LOG_FILE}")
         if ENABLE_EXCEL:
-            print(f"   Excel export: ENABLED")
-        print(f"\n")
+            log(f"   Excel export: ENABLED")
+        log(f"\n")
+        
+        # Each strategy runs on its own thread so a held position in one never stalls the other
+        workers = []
+        if ACTIVE_STRATEGY in ["DUMP_HEDGE", "BOTH"]:
+            workers.append(("DH", self.execute_dump_hedge_strategy, ["hedge_complete"]))
+        if ACTIVE_STRATEGY in ["MID_GAME", "BOTH"]:
+            workers.append(("MG", self.execute_midgame_strategy, ["take_profit", "stop_loss"]))
+        
+        for name, execute, done_statuses in workers:
+            threading.Thread(target=self.strategy_worker, args=(name, execute, done_statuses), daemon=True).start()
         
         current_market = None
+        last_market_timestamp = None
         
         while True:
             try:
-                now_utc = datetime.now(timezone.utc)
-                current_timestamp = int(now_utc.timestamp())
+                current_timestamp = int(time.time())  # POSIX time is already UTC
                 
-                market_timestamp = (current_timestamp // 900) * 900
-                expected_slug = f"btc-updown-15m-{market_timestamp}"
+                # The slug only changes when the 15-minute bucket rolls over (or never, for MANUAL_SLUG)
+                if MANUAL_SLUG:
+                    market_timestamp = MANUAL_MARKET_TIMESTAMP
+                else:
+                    market_timestamp = (current_timestamp // 900) * 900
+                if market_timestamp != last_market_timestamp:
+                    last_market_timestamp = market_timestamp
+                    expected_slug = MANUAL_SLUG or f"btc-updown-15m-{market_timestamp}"
                 
                 if not current_market or current_market['slug'] != expected_slug:
-                    print(f"\n🔍 Looking for market: {expected_slug}")
+                    log(f"\n🔍 Looking for market: {expected_slug}")
                     
-                    if MANUAL_SLUG:
-                        current_market = self.get_market_from_slug(MANUAL_SLUG)
-                        market_timestamp = int(MANUAL_SLUG.split('-')[-1])
-                    else:
-                        current_market = self.get_market_from_slug(expected_slug)
+                    current_market = self.get_market_from_slug(expected_slug)
                     
                     if current_market:
                         market_end = market_timestamp + 900
                         time_left = market_end - current_timestamp
-                        print(f"✅ Active Market Found!")
-                        print(f"   {current_market['title']}")
-                        print(f"   Time Left: {time_left//60}m {time_left%60}s\n")
+                        log(f"✅ Active Market Found!")
+                        log(f"   {current_market['title']}")
+                        log(f"   Time Left: {time_left//60}m {time_left%60}s\n")
+                        
+                        # Stream this market's books instead of polling REST
+                        self.subscribe_market([current_market['yes_token'], current_market['no_token']])
+                        self.set_order_options(current_market)
+                        
+                        # Publish to the strategy workers as one tuple so they never see a torn update
+                        self.active_market = (current_market, market_timestamp)
                     else:
                         next_market_time = ((current_timestamp // 900) + 1) * 900
                         wait_time = next_market_time - current_timestamp
-                        print(f"⏳ No active market. Next check in {wait_time}s")
+                        log(f"⏳ No active market. Next check in {wait_time}s")
                         time.sleep(min(wait_time, 60))
                         continue
                 
-                # Execute strategies
-                dh_status = None
-                mg_status = None
-                
-                if ACTIVE_STRATEGY in ["DUMP_HEDGE", "BOTH"]:
-                    dh_status = self.execute_dump_hedge_strategy(current_market, market_timestamp)
-                
-                if ACTIVE_STRATEGY in ["MID_GAME", "BOTH"]:
-                    mg_status = self.execute_midgame_strategy(current_market, market_timestamp)
-                
-                # Handle results
-                if dh_status == "hedge_complete" or mg_status in ["take_profit", "stop_loss"]:
-                    print("\n✅ Trade cycle complete!")
-                    
-                    # Print session stats
-                    current_balance = self.get_balance()
-                    session_pnl = current_balance - self.starting_balance
-                    win_rate = (self.session_wins / self.session_trades * 100) if self.session_trades > 0 else 0
-                    
-                    print(f"\n📊 SESSION STATS:")
-                    print(f"   Starting Balance: ${self.starting_balance:.2f}")
-                    print(f"   Current Balance: ${current_balance:.2f}")
-                    print(f"   Session P&L: ${session_pnl:+.2f}")
-                    print(f"   Trades: {self.session_trades} | Wins: {self.session_wins} | Losses: {self.session_losses}")
-                    print(f"   Win Rate: {win_rate:.1f}%\n")
-                    
-                    time.sleep(5)
-                
                 time.sleep(CHECK_INTERVAL)
                 
             except KeyboardInterrupt:
-                print("\n\n🛑 Bot stopped by user")
-                print(f"\n📊 FINAL SESSION STATS:")
-                current_balance = self.get_balance()
+                log("\n\n🛑 Bot stopped by user")
+                log(f"\n📊 FINAL SESSION STATS:")
+                current_balance = self.sync_balance()
                 session_pnl = current_balance - self.starting_balance
-                win_rate = (self.session_wins / self.session_trades * 100) if self.session_trades > 0 else 0
-                print(f"   Starting Balance: ${self.starting_balance:.2f}")
-                print(f"   Final Balance: ${current_balance:.2f}")
-                print(f"   Total P&L: ${session_pnl:+.2f}")
-                print(f"   Total Trades: {self.session_trades} | Wins: {self.session_wins} | Losses: {self.session_losses}")
-                print(f"   Win Rate: {win_rate:.1f}%")
-                print(f"\n📊 Trade log saved: {TRADE_LOG_FILE}")
+                trades, wins, losses = self.session_counts()
+                win_rate = (wins / trades * 100) if trades > 0 else 0
+                log(f"   Starting Balance: ${self.starting_balance:.2f}")
+                log(f"   Final Balance: ${current_balance:.2f}")
+                log(f"   Total P&L: ${session_pnl:+.2f}")
+                log(f"   Total Trades: {trades} | Wins: {wins} | Losses: {losses}")
+                log(f"   Win Rate: {win_rate:.1f}%")
+                self.shutdown_trade_log()
+                log(f"\n📊 Trade log saved: {TRADE_LOG_FILE}")
                 break
             except Exception as e:
-                print(f"\n❌ Error: {e}")
+                log(f"\n❌ Error: {e}")
                 import traceback
                 traceback.print_exc()
                 time.sleep(10)
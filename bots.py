@@ -2,9 +2,15 @@ import os
 import time
 import requests
 import json
+import orjson
+import threading
+import websocket
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
 from web3 import Web3
 from py_clob_client.client import ClobClient
 from py_clob_client.clob_types import OrderArgs, OrderType, PostOrdersArgs
+from py_clob_client.exceptions import PolyApiException
 from py_clob_client.order_builder.constants import BUY, SELL
 from datetime import datetime, timedelta, timezone
 
@@ -16,6 +22,27 @@ class OrderOptions:
         self.tick_size = str(tick_size)
         self.neg_risk = neg_risk
 
+# ==========================================
+# 🧺 BOUNDED SET (traded-market memory)
+# ==========================================
+class BoundedSet:
+    """Insertion-ordered set that forgets its oldest entries beyond `capacity`"""
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._items = OrderedDict()
+
+    def add(self, item):
+        self._items[item] = None
+        self._items.move_to_end(item)
+        while len(self._items) > self.capacity:
+            self._items.popitem(last=False)
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def __len__(self):
+        return len(self._items)
+
 # ==========================================
 # 🛑 USER CONFIGURATION
 # ==========================================
@@ -60,6 +87,8 @@ MAX_ENTRY_PRICE = 0.95  # Don't enter above 95 cents (no profit room)
 EXIT_SPREAD = 0.05      # Exit at +5 cents profit
 ORDER_SIZE = 5.0        # Buy 5 shares per trade
 CHECK_INTERVAL = 5      # Check every 5 seconds when market is active
+TRADED_MARKETS_CAPACITY = 192  # Traded slugs remembered (two days of 15min windows)
+BALANCE_CACHE_TTL = 30  # Reuse the last on-chain balance for this many seconds (dropped after a fill)
 
 # ==========================================
 # SYSTEM SETUP
@@ -67,6 +96,11 @@ CHECK_INTERVAL = 5      # Check every 5 seconds when market is active
 HOST = "https://clob.polymarket.com"
 CHAIN_ID = 137
 RPC_URL = "https://polygon-rpc.com"
+GAMMA_EVENTS_URL = "https://gamma-api.polymarket.com/events"
+GAMMA_TIMEOUT = (2, 5)  # (connect, read) seconds
+MARKET_WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+WS_PING_INTERVAL = 2    # Polymarket drops idle sockets without a PING (PONGs also prove liveness)
+WS_STALE_AFTER = 5      # Silent this long = zombie socket: reconnect and use REST meanwhile
 USDC_E_CONTRACT = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
 USDC_CHECKSUM = Web3.to_checksum_address(USDC_E_CONTRACT)
 ERC20_ABI = json.loads('[{"constant":true,"inputs":[{"name":"_owner","type":"address"}],"name":"balanceOf","outputs":[{"name":"balance","type":"uint256"}],"type":"function"},{"constant":true,"inputs":[],"name":"decimals","outputs":[{"name":"","type":"uint8"}],"type":"function"}]')
@@ -78,6 +112,21 @@ class BTCSniper:
         # 1. Setup Web3 (For Balance)
         self.w3 = Web3(Web3.HTTPProvider(RPC_URL))
         self.usdc_contract = self.w3.eth.contract(address=USDC_CHECKSUM, abi=ERC20_ABI)
+        self._balance_of = self.usdc_contract.functions.balanceOf(TRADING_ADDRESS)
+        try:
+            self._usdc_scale = 10 ** self.usdc_contract.functions.decimals().call()  # USDC.e decimals never change
+        except Exception as e:
+            print(f"⚠️ Decimals lookup failed ({e}), assuming 6 decimals")
+            self._usdc_scale = 10 ** 6
+        
+        # Persistent HTTP session for Gamma API (keep-alive, pooled connections)
+        self.http = requests.Session()
+        self.http.headers.update({"Accept": "application/json", "Connection": "keep-alive"})
+        self.http.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=0))
+        try:
+            self.http.get(GAMMA_EVENTS_URL, params={"limit": 1}, timeout=GAMMA_TIMEOUT)  # Open the TLS connection now
+        except requests.RequestException as e:
+            print(f"⚠️ Gamma warm-up failed: {e}")
         
         # 2. Setup Client (For Trading)
         try:
@@ -113,15 +162,36 @@ class BTCSniper:
             import traceback
             traceback.print_exc()
             exit()
+        
+        # Open the CLOB connection now so the first order skips the TLS handshake
+        try:
+            self.client.get_server_time()
+        except Exception as e:
+            print(f"⚠️ CLOB warm-up failed: {e}")
             
-        self.traded_markets = set()  # Track markets we've already traded
+        self.traded_markets = BoundedSet(TRADED_MARKETS_CAPACITY)  # Track markets we've already traded
+        self._bal_cache = (0.0, 0.0)  # (balance, monotonic time it was read)
+        self._order_opts = {}  # token_id -> OrderOptions for the current market
+        
+        # Market stream: pushed asks for the current market's tokens. Connection handling
+        # (ping, zombie guard, reconnect) matches bot_mg.py - keep the standalone copies in step
+        self._ws = None
+        self._ws_assets = []
+        self._ws_last_msg = 0
+        self._ask_lock = threading.Lock()
+        self._asks = {}       # token_id -> {price: size}
+        self._best_ask = {}   # token_id -> best ask price
+        threading.Thread(target=self.market_stream_loop, daemon=True).start()
 
     def get_balance(self):
-        """Get USDC.e balance from the trading address"""
+        """Get USDC.e balance from the trading address (cached for BALANCE_CACHE_TTL)"""
+        balance, read_at = self._bal_cache
+        if read_at and time.monotonic() - read_at < BALANCE_CACHE_TTL:
+            return balance
         try:
-            raw_bal = self.usdc_contract.functions.balanceOf(TRADING_ADDRESS).call()
-            decimals = self.usdc_contract.functions.decimals().call()
-            return raw_bal / (10 ** decimals)
+            balance = self._balance_of.call() / self._usdc_scale
+            self._bal_cache = (balance, time.monotonic())
+            return balance
         except Exception as e:
             print(f"⚠️ Balance error: {e}")
             return 0.0
@@ -129,100 +199,147 @@ class BTCSniper:
     def get_market_from_slug(self, slug):
         """Get market details from a specific slug"""
         try:
-            url = f"https://gamma-api.polymarket.com/events?slug={slug}"
-            resp = requests.get(url, timeout=10).json()
+            resp = orjson.loads(self.http.get(GAMMA_EVENTS_URL, params={"slug": slug}, timeout=GAMMA_TIMEOUT).content)
             
             if not resp or len(resp) == 0:
                 return None
             
             event = resp[0]
-            raw_ids = event['markets'][0].get('clobTokenIds')
-            clob_ids = json.loads(raw_ids) if isinstance(raw_ids, str) else raw_ids
+            m = event['markets'][0]
+            raw_ids = m.get('clobTokenIds')
+            clob_ids = orjson.loads(raw_ids) if isinstance(raw_ids, str) else raw_ids
             
             return {
                 'slug': slug,
                 'yes_token': clob_ids[0],
                 'no_token': clob_ids[1],
-                'title': event.get('title', slug)
+                'title': event.get('title', slug),
+                'order_options': OrderOptions(m.get('orderPriceMinTickSize') or 0.01, bool(m.get('negRisk')))
             }
         except Exception as e:
             # Silently skip markets that don't exist
             return None
 
-    def generate_todays_slugs(self):
-        """Generate all possible BTC 15min slugs for today"""
-        # Get start of today in UTC
-        now = datetime.now(timezone.utc)
-        today_start = datetime(now.year, now.month, now.day, tzinfo=timezone.utc)
-        day_start_timestamp = int(today_start.timestamp())
-        
-        # Generate 96 slugs (24 hours * 4 per hour)
-        slugs = [
-            f"btc-updown-15m-{day_start_timestamp + i * INTERVAL}"
-            for i in range(96)
-        ]
-        return slugs
+    def find_active_market(self, current_timestamp):
+        """Look up the 15min BTC market whose window contains current_timestamp (MANUAL_SLUG wins)"""
+        if MANUAL_SLUG:
+            return self.get_market_from_slug(MANUAL_SLUG)
+        
+        # Windows are aligned to INTERVAL, so the active one is computed, not searched for
+        market_timestamp = (current_timestamp // INTERVAL) * INTERVAL
+        return self.get_market_from_slug(f"btc-updown-15m-{market_timestamp}")
 
-    def find_active_market(self):
-        """Find the currently active 15min BTC market based on UTC time"""
-        now_utc = datetime.now(timezone.utc)
-        current_timestamp = int(now_utc.timestamp())
-        
-        print(f"🕐 Current UTC Time: {now_utc.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"🔍 Searching for active market at timestamp: {current_timestamp}")
-        
-        # Generate today's slugs
-        slugs = self.generate_todays_slugs()
+    def subscribe_market(self, token_ids):
+        """Point the market stream at a new set of tokens (reconnects with the new subscription)"""
+        if list(token_ids) == self._ws_assets:
+            return  # Same market (e.g. MANUAL_SLUG re-resolved) - keep the live stream
+        with self._ask_lock:
+            self._ws_assets = list(token_ids)
+            self._asks.clear()
+            self._best_ask.clear()
+        if self._ws:
+            self._ws.close()
+
+    def stream_alive(self):
+        return time.monotonic() - self._ws_last_msg < WS_STALE_AFTER
+
+    def on_market_message(self, ws, message):
+        self._ws_last_msg = time.monotonic()
         
-        # Find the active market (current 15min window)
-        # Market is active if: market_time <= current_time < market_time + 900
-        active_markets = []
+        if message == "PONG":
+            return
         
-        for slug in slugs:
-            market_timestamp = int(slug.split('-')[-1])
-            market_end = market_timestamp + 900  # 15 minutes later
-            
-            # Check if this market is currently active
-            if market_timestamp <= current_timestamp < market_end:
-                market = self.get_market_from_slug(slug)
-                if market:
-                    time_left = market_end - current_timestamp
-                    print(f"✅ ACTIVE MARKET FOUND!")
-                    print(f"   Start: {datetime.fromtimestamp(market_timestamp, tz=timezone.utc).strftime('%H:%M:%S')} UTC")
-                    print(f"   End: {datetime.fromtimestamp(market_end, tz=timezone.utc).strftime('%H:%M:%S')} UTC")
-                    print(f"   Time Left: {time_left}s ({time_left//60}m {time_left%60}s)")
-                    active_markets.append(market)
-        
-        if active_markets:
-            return active_markets[0]
-        
-        # If no active market, find the next upcoming one
-        print("⏳ No active market right now, checking for upcoming markets...")
-        
-        for slug in slugs:
-            market_timestamp = int(slug.split('-')[-1])
-            
-            if market_timestamp > current_timestamp:
-                market = self.get_market_from_slug(slug)
-                if market:
-                    wait_time = market_timestamp - current_timestamp
-                    print(f"📅 NEXT MARKET:")
-                    print(f"   Starts: {datetime.fromtimestamp(market_timestamp, tz=timezone.utc).strftime('%H:%M:%S')} UTC")
-                    print(f"   Wait Time: {wait_time}s ({wait_time//60}m {wait_time%60}s)")
-                    return None  # Don't trade yet
-        
-        print("❌ No markets found for today")
-        return None
+        try:
+            data = orjson.loads(message)
+        except ValueError:
+            return
+        
+        with self._ask_lock:
+            for event in (data if isinstance(data, list) else [data]):
+                if not isinstance(event, dict):
+                    continue
+                event_type = event.get('event_type')
+                
+                if event_type == 'book':
+                    token_id = event.get('asset_id')
+                    if token_id not in self._ws_assets:
+                        continue
+                    asks = event.get('asks') or event.get('sells') or []
+                    levels = {float(o['price']): float(o['size']) for o in asks}
+                    self._asks[token_id] = levels
+                    self._best_ask[token_id] = min(levels) if levels else None
+                
+                elif event_type == 'price_change':
+                    for change in event.get('price_changes') or event.get('changes') or []:
+                        if change.get('side') != 'SELL':
+                            continue  # Only asks matter for entries
+                        token_id = change.get('asset_id') or event.get('asset_id')
+                        levels = self._asks.get(token_id)
+                        if levels is None:
+                            continue  # No snapshot yet - wait for the book event
+                        price, size = float(change['price']), float(change['size'])
+                        if size:
+                            levels[price] = size
+                        else:
+                            levels.pop(price, None)
+                        self._best_ask[token_id] = min(levels) if levels else None
+
+    def on_market_open(self, ws):
+        ws.send(json.dumps({"assets_ids": self._ws_assets, "type": "market"}))
+        self._ws_last_msg = time.monotonic()
+        
+        def keepalive():
+            while ws.sock and ws.sock.connected:
+                # Zombie guard: a connected socket that stopped talking gets recycled
+                if not self.stream_alive():
+                    print(f"\n   ⚠️ Market stream silent for {WS_STALE_AFTER}s - reconnecting")
+                    ws.close()
+                    return
+                try:
+                    ws.send("PING")
+                except Exception:
+                    return
+                time.sleep(WS_PING_INTERVAL)
+        
+        threading.Thread(target=keepalive, daemon=True).start()
+
+    def market_stream_loop(self):
+        """Keep the market channel connected for the current tokens, reconnecting on drop/market switch"""
+        while True:
+            if not self._ws_assets:
+                time.sleep(1)
+                continue
+            try:
+                self._ws = websocket.WebSocketApp(
+                    MARKET_WS_URL,
+                    on_open=self.on_market_open,
+                    on_message=self.on_market_message
+                )
+                self._ws.run_forever()
+            except Exception as e:
+                print(f"   ⚠️ Market stream error: {e}")
+            time.sleep(1)
 
     def get_best_ask(self, token_id):
-        """Get cheapest available price"""
+        """Get cheapest available price (streamed, REST when the stream is cold/stale)"""
+        if self.stream_alive():
+            with self._ask_lock:
+                if token_id in self._best_ask:
+                    return self._best_ask[token_id]
         try:
-            book = self.client.get_order_book(token_id)
-            if book.asks:
-                return min(float(o.price) for o in book.asks)
-            return None
-        except:
+            # /price returns one scalar instead of the whole book; the SELL side is the best ask
+            resp = self.client.get_price(token_id, side=SELL)
+        except (PolyApiException, requests.RequestException):
             return None
+        price = resp.get('price') if isinstance(resp, dict) else None
+        return float(price) if price else None
+
+    def set_order_options(self, market):
+        """Pin the market's tick size / neg-risk flag for both tokens so orders skip the lookups"""
+        self._order_opts = {
+            market['yes_token']: market['order_options'],
+            market['no_token']: market['order_options'],
+        }
 
     def place_order(self, token_id, price, size, side):
         """Place a market order using official Polymarket API"""
@@ -242,7 +359,7 @@ class BTCSniper:
                         size=size,
                         side=side,
                         token_id=token_id,
-                    )),
+                    ), self._order_opts.get(token_id)),
                     orderType=OrderType.FOK,  # Fill or Kill for immediate execution
                 )
             ])
@@ -287,7 +404,7 @@ class BTCSniper:
                         size=size,
                         side=SELL,
                         token_id=token_id,
-                    )),
+                    ), self._order_opts.get(token_id)),
                     orderType=OrderType.GTC,  # Good-til-cancelled for limit orders
                 )
             ])
@@ -388,6 +505,7 @@ class BTCSniper:
             return "entry_failed"
         
         print(f"✅ ENTRY FILLED! Order ID: {entry_id}")
+        self._bal_cache = (0.0, 0.0)  # Fill spent USDC - next check goes on-chain
         
         # Persistently try to place exit order
         print(f"\n⚡ Placing EXIT order at ${exit_price:.2f}...")
@@ -397,6 +515,7 @@ class BTCSniper:
         exit_id = None
         
         while exit_attempts < max_attempts and not exit_id:
+            attempt_start = time.monotonic()
             exit_id = self.place_limit_order(entry_token, exit_price, ORDER_SIZE)
             
             if exit_id:
@@ -407,7 +526,7 @@ class BTCSniper:
                 exit_attempts += 1
                 if exit_attempts < max_attempts:
                     print(f"   ⏳ Retry {exit_attempts}/{max_attempts} - waiting 3s for shares to settle...")
-                    time.sleep(3)
+                    time.sleep(max(0.0, 3 - (time.monotonic() - attempt_start)))
                 else:
                     print("⚠️ Exit order failed after all attempts - you'll need to sell manually")
         
@@ -430,6 +549,7 @@ class BTCSniper:
         current_market = None
         
         while True:
+            t0 = time.monotonic()  # Start of this tick - sleeps subtract the time spent working
             try:
                 # Find what market should be active now
                 now_utc = datetime.now(timezone.utc)
@@ -437,18 +557,17 @@ class BTCSniper:
                 
                 # Calculate which 15min window we're in
                 market_timestamp = (current_timestamp // 900) * 900
-                expected_slug = f"btc-updown-15m-{market_timestamp}"
+                expected_slug = MANUAL_SLUG or f"btc-updown-15m-{market_timestamp}"  # a manual slug never rolls over
                 
                 # Check if we need to find a new market
                 if not current_market or current_market['slug'] != expected_slug:
                     print(f"\n🔍 Looking for market: {expected_slug}")
                     
-                    if MANUAL_SLUG:
-                        current_market = self.get_market_from_slug(MANUAL_SLUG)
-                    else:
-                        current_market = self.get_market_from_slug(expected_slug)
+                    current_market = self.find_active_market(current_timestamp)
                     
                     if current_market:
+                        self.subscribe_market([current_market['yes_token'], current_market['no_token']])
+                        self.set_order_options(current_market)
                         market_end = market_timestamp + 900
                         time_left = market_end - current_timestamp
                         print(f"✅ Active Market Found!")
@@ -478,8 +597,8 @@ class BTCSniper:
                     print(f"\n⏭️  Already traded this market. Next market in {wait_time}s\n")
                     time.sleep(wait_time)
                 else:
-                    # Keep monitoring prices
-                    time.sleep(CHECK_INTERVAL)
+                    # Keep monitoring prices on a fixed cadence
+                    time.sleep(max(0.0, CHECK_INTERVAL - (time.monotonic() - t0)))
                 
             except KeyboardInterrupt:
                 print("\n\n🛑 Bot stopped by user")
@@ -1,14 +1,21 @@
 import os
 import time
+import atexit
+import threading
 import requests
 import json
+import orjson
+import websocket
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from web3 import Web3
 from py_clob_client.client import ClobClient
 from py_clob_client.clob_types import OrderArgs, OrderType, PostOrdersArgs
 from py_clob_client.order_builder.constants import BUY, SELL
-from datetime import datetime, timezone
+from datetime import datetime
 import csv
-import pandas as pd
+import openpyxl
 
 # ==========================================
 # 🔧 CONFIGURATION
@@ -32,9 +39,22 @@ MG_STOP_LOSS = 0.44            # Stop loss at 44 cents
 
 # System Settings
 CHECK_INTERVAL = 1
+FILL_POLL_INTERVAL = 0.1       # How often to re-check an order's matched size
+FILL_VERIFY_TIMEOUT = 2        # Give up verifying the filled amount after this long
 MIN_ORDER_SIZE = 0.1
 TRADE_LOG_FILE = "midgame_trades.csv"
+TRADE_LOG_HEADERS = [
+    'timestamp', 'market_slug', 'market_title',
+    'entry_side', 'entry_price', 'shares',
+    'yes_price_at_entry', 'no_price_at_entry',
+    'time_remaining_at_entry', 'bid_size_at_entry',
+    'exit_reason', 'exit_price',
+    'gross_pnl', 'pnl_percent', 'win_loss',
+    'session_trade_number', 'balance_before', 'balance_after'
+]
 ENABLE_EXCEL = True
+SLUG_CACHE_FILE = "midgame_slug_cache.json"   # slug -> market, survives restarts
+SLUG_CACHE_SIZE = 64
 
 # Setup addresses
 from eth_account import Account
@@ -56,9 +76,18 @@ else:
 # System setup
 HOST = "https://clob.polymarket.com"
 CHAIN_ID = 137
-RPC_URL = "https://polygon-mainnet.g.alchemy.com/v2/Vwy188P6gCu8mAUrbObWH"
+# Point POLYGON_RPC_URL at a local bor/erigon node or a dedicated gateway for the lowest RPC latency
+RPC_URL = os.getenv("POLYGON_RPC_URL", "https://polygon-mainnet.g.alchemy.com/v2/Vwy188P6gCu8mAUrbObWH")
 USDC_E_CONTRACT = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
 USDC_CHECKSUM = Web3.to_checksum_address(USDC_E_CONTRACT)
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL3_ABI = json.loads('[{"inputs":[{"components":[{"name":"target","type":"address"},{"name":"allowFailure","type":"bool"},{"name":"callData","type":"bytes"}],"name":"calls","type":"tuple[]"}],"name":"aggregate3","outputs":[{"components":[{"name":"success","type":"bool"},{"name":"returnData","type":"bytes"}],"name":"returnData","type":"tuple[]"}],"stateMutability":"payable","type":"function"}]')
+MARKET_WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+WS_PING_INTERVAL = 2       # Polymarket drops idle sockets without a PING (PONGs also prove liveness)
+WS_STALE_AFTER = 5         # Silent this long = zombie socket: reconnect and use REST meanwhile
+REST_BACKOFF_MIN = 0.5     # First pause after a CLOB 429, doubled on each repeat
+REST_BACKOFF_MAX = 8
+REST_BOOK_TTL = 0.5        # Reuse a REST book snapshot for this long across helpers
 ERC20_ABI = json.loads('[{"constant":true,"inputs":[{"name":"_owner","type":"address"}],"name":"balanceOf","outputs":[{"name":"balance","type":"uint256"}],"type":"function"},{"constant":true,"inputs":[],"name":"decimals","outputs":[{"name":"","type":"uint8"}],"type":"function"}]')
 
 class MidGameBot:
@@ -68,6 +97,28 @@ class MidGameBot:
         # Setup Web3
         self.w3 = Web3(Web3.HTTPProvider(RPC_URL))
         self.usdc_contract = self.w3.eth.contract(address=USDC_CHECKSUM, abi=ERC20_ABI)
+        self.multicall3 = self.w3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+        
+        # Persistent HTTP session for Gamma API (keep-alive, pooled connections)
+        self.http = requests.Session()
+        self.http.headers.update({"Accept": "application/json"})
+        self.http.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504])
+        ))
+        
+        # slug -> market (token ids never change for a slug, so no expiry needed)
+        self._slug_cache = self.load_slug_cache()
+        
+        # CLOB REST book reads are unthrottled; only back off once the API answers 429
+        self._rest_backoff = 0
+        self._rest_backoff_until = 0
+        self._rest_book_lock = threading.Lock()
+        self._rest_books = {}    # token_id -> (fetched_at, depth dict) from the REST fallback
+        
+        # Worker pool for overlapping independent REST calls (e.g. YES/NO books)
+        self.pool = ThreadPoolExecutor(max_workers=4)
         
         # Setup Client
         try:
@@ -99,70 +150,176 @@ class MidGameBot:
         
         # Tracking
         self.traded_markets = set()
-        self.starting_balance = self.get_balance()
+        
+        # Balance + decimals in one eth_call; decimals never change so keep the float divisor
+        try:
+            raw_bal, raw_decimals = self.multicall([
+                (self.usdc_contract, 'balanceOf', [TRADING_ADDRESS]),
+                (self.usdc_contract, 'decimals', [])
+            ])
+            self._usdc_scale = float(10 ** int.from_bytes(raw_decimals, 'big'))
+            self.starting_balance = int.from_bytes(raw_bal, 'big') / self._usdc_scale
+        except Exception as e:
+            print(f"⚠️ Multicall failed ({e}), assuming 6 decimals")
+            self._usdc_scale = float(10 ** 6)
+            self.starting_balance = self.get_balance()
         self.session_trades = 0
         self.session_wins = 0
         self.session_losses = 0
         
-        # Trade logging
+        # Trade logging (plain list of row dicts; never turned into a DataFrame)
         self.trade_logs = []
         self.initialize_trade_log()
+        self._excel_dirty = False
+        atexit.register(self.export_excel)
+        
+        # Top-of-book cache fed by the market WebSocket
+        self._book_lock = threading.Lock()
+        self._book_levels = {}   # token_id -> {'bids': {price: size}, 'asks': {price: size}}
+        self._book_cache = {}    # token_id -> {'best_ask', 'best_bid', 'bid_size'}
+        self._bid_changed = threading.Event()   # set whenever a streamed best bid moves
+        self._ws_assets = []
+        self._ws = None
+        self._ws_last_msg = 0
+        threading.Thread(target=self.market_stream_loop, daemon=True).start()
 
     def initialize_trade_log(self):
-        if not os.path.exists(TRADE_LOG_FILE):
-            headers = [
-                'timestamp', 'market_slug', 'market_title',
-                'entry_side', 'entry_price', 'shares',
-                'yes_price_at_entry', 'no_price_at_entry',
-                'time_remaining_at_entry', 'bid_size_at_entry',
-                'exit_reason', 'exit_price',
-                'gross_pnl', 'pnl_percent', 'win_loss',
-                'session_trade_number', 'balance_before', 'balance_after'
-            ]
-            
-            with open(TRADE_LOG_FILE, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=headers)
-                writer.writeheader()
-            
+        """Open the CSV log once for the whole session (header written on first use)"""
+        is_new = not os.path.exists(TRADE_LOG_FILE)
+        
+        self._csv_file = open(TRADE_LOG_FILE, 'a', newline='', buffering=1 << 16)
+        self._csv_writer = csv.writer(self._csv_file)
+        atexit.register(self.close_trade_log)
+        
+        if is_new:
+            self._csv_writer.writerow(TRADE_LOG_HEADERS)
+            self._csv_file.flush()
             print(f"📊 Trade log initialized: {TRADE_LOG_FILE}")
 
+    def close_trade_log(self):
+        """Flush and close the session CSV handle"""
+        if not self._csv_file.closed:
+            self._csv_file.close()
+
     def log_trade(self, trade_data):
         try:
             self.trade_logs.append(trade_data)
             
-            with open(TRADE_LOG_FILE, 'a', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=trade_data.keys())
-                writer.writerow(trade_data)
+            row = self.format_trade_row(trade_data)
+            self._csv_writer.writerow([row.get(h, '') for h in TRADE_LOG_HEADERS])
+            self._csv_file.flush()
             
-            if ENABLE_EXCEL:
-                df = pd.DataFrame(self.trade_logs)
-                excel_file = TRADE_LOG_FILE.replace('.csv', '.xlsx')
-                df.to_excel(excel_file, index=False, engine='openpyxl')
+            # Excel is rebuilt once at shutdown (export_excel), not on every trade
+            self._excel_dirty = True
             
             print(f"✅ Trade logged")
             
         except Exception as e:
             print(f"⚠️ Error logging trade: {e}")
 
+    def finish_trade_log(self, trade_data):
+        """Stamp the post-exit balance and log the trade (runs on the pool, off the exit path)"""
+        trade_data['balance_after'] = self.get_balance()
+        self.log_trade(trade_data)
+
+    def format_trade_row(self, trade_data):
+        """Copy of a trade record with its epoch timestamp rendered for the log files"""
+        row = dict(trade_data)
+        row['timestamp'] = datetime.fromtimestamp(row['timestamp']).isoformat()
+        return row
+
+    def export_excel(self):
+        """Write the session's trades to xlsx in one streaming pass"""
+        if not ENABLE_EXCEL or not self._excel_dirty:
+            return
+        try:
+            excel_file = TRADE_LOG_FILE.replace('.csv', '.xlsx')
+            headers = TRADE_LOG_HEADERS
+            
+            wb = openpyxl.Workbook(write_only=True)
+            ws = wb.create_sheet("trades")
+            ws.append(headers)
+            for trade_data in self.trade_logs:
+                row = self.format_trade_row(trade_data)
+                ws.append([row.get(h) for h in headers])
+            wb.save(excel_file)
+            
+            self._excel_dirty = False
+            print(f"📊 Excel log written: {excel_file}")
+        except Exception as e:
+            print(f"⚠️ Error writing Excel log: {e}")
+
+    def multicall(self, calls):
+        """Run several (contract, fn_name, args) reads in a single eth_call via Multicall3"""
+        results = self.multicall3.functions.aggregate3([
+            (contract.address, False, contract.encode_abi(fn_name, args=args))
+            for contract, fn_name, args in calls
+        ]).call()
+        return [return_data for success, return_data in results]
+
+    def get_chain_state(self):
+        """Get USDC.e balance and latest block number in a single batched JSON-RPC request"""
+        try:
+            with self.w3.batch_requests() as batch:
+                batch.add(self.usdc_contract.functions.balanceOf(TRADING_ADDRESS))
+                batch.add(self.w3.eth.get_block_number())
+                raw_bal, block_number = batch.execute()
+            return raw_bal / self._usdc_scale, block_number
+        except Exception as e:
+            # Some public Polygon endpoints reject batches - fall back to single calls
+            print(f"⚠️ Batched RPC failed ({e}), falling back to single calls")
+            try:
+                return self.get_balance(), self.w3.eth.get_block_number()
+            except Exception:
+                return self.get_balance(), None
+
     def get_balance(self):
         try:
-            raw_bal = self.usdc_contract.functions.balanceOf(TRADING_ADDRESS).call()
-            decimals = self.usdc_contract.functions.decimals().call()
-            return raw_bal / (10 ** decimals)
+            return self.usdc_contract.functions.balanceOf(TRADING_ADDRESS).call() / self._usdc_scale
         except:
             return 0.0
 
+    def load_slug_cache(self):
+        try:
+            with open(SLUG_CACHE_FILE, 'rb') as f:
+                return orjson.loads(f.read())
+        except (OSError, ValueError):
+            return {}
+
+    def save_slug_cache(self):
+        try:
+            with open(SLUG_CACHE_FILE, 'wb') as f:
+                f.write(orjson.dumps(self._slug_cache))
+        except OSError as e:
+            print(f"   ⚠️ Could not save slug cache: {e}")
+
     def get_market_from_slug(self, slug):
+        """Get market details for a slug, from memory/disk cache when seen before"""
+        market = self._slug_cache.get(slug)
+        if market:
+            return market
+        
+        market = self.fetch_market_from_slug(slug)
+        if market:
+            self._slug_cache[slug] = market
+            # Keep only the most recent slugs (dicts preserve insertion order)
+            for old_slug in list(self._slug_cache)[:-SLUG_CACHE_SIZE]:
+                del self._slug_cache[old_slug]
+            self.save_slug_cache()
+        return market
+
+    def fetch_market_from_slug(self, slug):
+        """Fetch market details for a slug from the Gamma API"""
         try:
             url = f"https://gamma-api.polymarket.com/events?slug={slug}"
-            resp = requests.get(url, timeout=10).json()
+            resp = orjson.loads(self.http.get(url, timeout=10).content)
             
             if not resp or len(resp) == 0:
                 return None
             
             event = resp[0]
             raw_ids = event['markets'][0].get('clobTokenIds')
-            clob_ids = json.loads(raw_ids) if isinstance(raw_ids, str) else raw_ids
+            clob_ids = orjson.loads(raw_ids) if isinstance(raw_ids, str) else raw_ids
             
             return {
                 'slug': slug,
@@ -173,57 +330,212 @@ class MidGameBot:
         except:
             return None
 
-    def get_best_ask(self, token_id):
+    # ==========================================
+    # MARKET WEBSOCKET (order book cache)
+    # Same connection handling as bot_mg.py / bots.py (ping, zombie
+    # guard, reconnect) - each bot runs as a standalone script, so keep them in step
+    # ==========================================
+    def subscribe_market(self, token_ids):
+        """Point the market stream at a new set of tokens (reconnects with the new subscription)"""
+        if list(token_ids) == self._ws_assets:
+            return  # Same market (e.g. MANUAL_SLUG re-resolved) - keep the live stream
+        with self._book_lock:
+            self._ws_assets = list(token_ids)
+            self._book_levels.clear()
+            self._book_cache.clear()
+        if self._ws:
+            self._ws.close()
+
+    def stream_alive(self):
+        return time.monotonic() - self._ws_last_msg < WS_STALE_AFTER
+
+    def apply_level(self, levels, price, size):
+        if size == 0:
+            levels.pop(price, None)
+        else:
+            levels[price] = size
+
+    def refresh_top_of_book(self, token_id):
+        """Recompute cached best ask / best bid / total bid size for a token (lock held)"""
+        levels = self._book_levels[token_id]
+        previous = self._book_cache.get(token_id)
+        best_bid = max(levels['bids']) if levels['bids'] else None
+        self._book_cache[token_id] = {
+            'best_ask': min(levels['asks']) if levels['asks'] else None,
+            'best_bid': best_bid,
+            'bid_size': sum(levels['bids'].values())
+        }
+        if not previous or previous['best_bid'] != best_bid:
+            self._bid_changed.set()
+
+    def handle_market_event(self, event):
+        event_type = event.get('event_type')
+        
+        with self._book_lock:
+            if event_type == 'book':
+                token_id = event.get('asset_id')
+                if token_id not in self._ws_assets:
+                    return
+                bids = event.get('bids') or event.get('buys') or []
+                asks = event.get('asks') or event.get('sells') or []
+                self._book_levels[token_id] = {
+                    'bids': {float(o['price']): float(o['size']) for o in bids},
+                    'asks': {float(o['price']): float(o['size']) for o in asks}
+                }
+                self.refresh_top_of_book(token_id)
+            
+            elif event_type == 'price_change':
+                changes = event.get('price_changes') or event.get('changes') or []
+                touched = set()
+                for change in changes:
+                    token_id = change.get('asset_id') or event.get('asset_id')
+                    levels = self._book_levels.get(token_id)
+                    if levels is None:
+                        continue  # No snapshot yet - wait for the book event
+                    side = 'bids' if change.get('side') == 'BUY' else 'asks'
+                    self.apply_level(levels[side], float(change['price']), float(change['size']))
+                    touched.add(token_id)
+                for token_id in touched:
+                    self.refresh_top_of_book(token_id)
+
+    def on_market_message(self, ws, message):
+        self._ws_last_msg = time.monotonic()
+        
+        if message == "PONG":
+            return
+        
         try:
-            book = self.client.get_order_book(token_id)
-            if book.asks:
-                return min(float(o.price) for o in book.asks)
-            return None
-        except:
+            data = orjson.loads(message)
+        except ValueError:
+            return
+        
+        for event in (data if isinstance(data, list) else [data]):
+            if isinstance(event, dict):
+                self.handle_market_event(event)
+
+    def on_market_open(self, ws):
+        ws.send(json.dumps({"assets_ids": self._ws_assets, "type": "market"}))
+        self._ws_last_msg = time.monotonic()
+        
+        def keepalive():
+            while ws.sock and ws.sock.connected:
+                # Zombie guard: a connected socket that stopped talking gets recycled
+                if not self.stream_alive():
+                    print(f"\n   ⚠️ Market stream silent for {WS_STALE_AFTER}s - reconnecting")
+                    ws.close()
+                    return
+                try:
+                    ws.send("PING")
+                except Exception:
+                    return
+                time.sleep(WS_PING_INTERVAL)
+        
+        threading.Thread(target=keepalive, daemon=True).start()
+
+    def market_stream_loop(self):
+        """Keep the market channel connected for the current tokens, reconnecting on drop/market switch"""
+        while True:
+            if not self._ws_assets:
+                time.sleep(1)
+                continue
+            try:
+                self._ws = websocket.WebSocketApp(
+                    MARKET_WS_URL,
+                    on_open=self.on_market_open,
+                    on_message=self.on_market_message
+                )
+                self._ws.run_forever()
+            except Exception as e:
+                print(f"   ⚠️ Market stream error: {e}")
+            time.sleep(1)
+
+    def get_cached_book(self, token_id):
+        """Streamed top of book for a token, or None if cold/stale"""
+        if not self.stream_alive():
             return None
+        with self._book_lock:
+            return self._book_cache.get(token_id)
+
+    # ==========================================
+    # ORDER BOOK HELPERS (stream first, REST for cold start)
+    # ==========================================
+    def get_best_ask(self, token_id):
+        book = self.get_order_book_depth(token_id)
+        return book['best_ask'] if book else None
 
     def get_best_bid(self, token_id):
-        try:
-            book = self.client.get_order_book(token_id)
-            if book.bids:
-                return max(float(o.price) for o in book.bids)
-            return None
-        except:
-            return None
+        book = self.get_order_book_depth(token_id)
+        return book['best_bid'] if book else None
 
     def get_order_book_depth(self, token_id):
+        cached = self.get_cached_book(token_id)
+        if cached:
+            return dict(cached)
+        return self.get_rest_book(token_id)
+
+    def get_rest_book(self, token_id, max_age=REST_BOOK_TTL):
+        """REST top of book, re-fetched at most once per max_age so back-to-back helpers share it"""
+        now = time.monotonic()
+        with self._rest_book_lock:
+            hit = self._rest_books.get(token_id)
+        if hit and now - hit[0] < max_age:
+            return dict(hit[1])
+        if now < self._rest_backoff_until:
+            return None
         try:
             book = self.client.get_order_book(token_id)
+            self._rest_backoff = 0
             
-            best_ask = min(float(o.price) for o in book.asks) if book.asks else None
-            best_bid = max(float(o.price) for o in book.bids) if book.bids else None
+            # REST levels are not best-first (bids ascend, asks descend), so scan
+            # each side once, converting every level a single time
+            best_ask = min(map(float, (o.price for o in book.asks))) if book.asks else None
             
+            best_bid = None
             bid_size = 0
-            if book.bids:
-                for order in book.bids:
-                    bid_size += float(order.size)
+            for order in book.bids or []:
+                price = float(order.price)
+                if best_bid is None or price > best_bid:
+                    best_bid = price
+                bid_size += float(order.size)
             
-            return {
+            depth = {
                 'best_ask': best_ask,
                 'best_bid': best_bid,
                 'bid_size': bid_size
             }
-        except:
+            with self._rest_book_lock:
+                self._rest_books[token_id] = (time.monotonic(), depth)
+            return dict(depth)
+        except Exception as e:
+            if getattr(e, 'status_code', None) == 429:
+                self._rest_backoff = min(max(self._rest_backoff * 2, REST_BACKOFF_MIN), REST_BACKOFF_MAX)
+                self._rest_backoff_until = time.monotonic() + self._rest_backoff
+                print(f"   ⚠️ CLOB rate limited, backing off {self._rest_backoff:.1f}s")
             return None
 
     def get_filled_amount(self, order_id):
-        """Get the actual filled amount for an order"""
-        try:
-            time.sleep(0.5)  # Brief pause to let order settle
-            order = self.client.get_order(order_id)
-            if order:
-                filled = float(order.size_matched) if hasattr(order, 'size_matched') else 0
-                print(f"   📊 Order {order_id[:8]}... filled: {filled} shares")
-                return filled
-            return 0
-        except Exception as e:
-            print(f"   ⚠️ Could not verify fill amount: {e}")
-            return 0
+        """Get the actual filled amount for an order, polling until the match shows up"""
+        deadline = time.monotonic() + FILL_VERIFY_TIMEOUT
+        filled = 0
+        warned = False
+        while True:
+            try:
+                order = self.client.get_order(order_id)
+                if order:
+                    # get_order returns the order as a dict
+                    filled = float(order.get('size_matched') or 0)
+                    if filled > 0:
+                        break
+            except Exception as e:
+                if not warned:
+                    print(f"   ⚠️ Could not verify fill amount: {e}")
+                    warned = True
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(FILL_POLL_INTERVAL)
+        
+        print(f"   📊 Order {order_id[:8]}... filled: {filled} shares")
+        return filled
 
     def force_buy(self, token_id, price, size):
         """Force buy immediately with generous slippage - returns (order_id, filled_amount)"""
@@ -324,6 +636,10 @@ class MidGameBot:
             print(f"   ❌ Sell error: {e}")
             return None
 
+    def meets_entry_criteria(self, price, bid_size):
+        """Mid-game entry filter: price inside the entry band with enough resting bids"""
+        return MG_MIN_ENTRY_PRICE <= price <= MG_MAX_ENTRY_PRICE and bid_size >= MG_MIN_BID_SIZE
+
     def execute_midgame_strategy(self, market, market_start_time):
         """Execute mid-game strategy - NO (DOWN) only"""
         slug = market['slug']
@@ -339,9 +655,10 @@ class MidGameBot:
         if time_remaining < MG_LOCK_WINDOW_START or time_remaining > MG_LOCK_WINDOW_END:
             return "outside_window"
         
-        # Get prices
-        yes_book = self.get_order_book_depth(market['yes_token'])
-        no_book = self.get_order_book_depth(market['no_token'])
+        # Get prices (both books fetched concurrently)
+        yes_future = self.pool.submit(self.get_order_book_depth, market['yes_token'])
+        no_future = self.pool.submit(self.get_order_book_depth, market['no_token'])
+        yes_book, no_book = yes_future.result(), no_future.result()
         
         if not yes_book or not no_book:
             return "no_orderbook"
@@ -357,8 +674,7 @@ class MidGameBot:
         print(f"📊 [{minutes_remaining}m {seconds_remaining}s] YES: ${yes_price:.2f} (Bids: {yes_book['bid_size']:.0f}) | NO: ${no_price:.2f} (Bids: {no_book['bid_size']:.0f})", end="\r")
         
         # Check NO (DOWN) side only
-        if not (MG_MIN_ENTRY_PRICE <= no_price <= MG_MAX_ENTRY_PRICE and 
-                no_book['bid_size'] >= MG_MIN_BID_SIZE):
+        if not self.meets_entry_criteria(no_price, no_book['bid_size']):
             return "no_opportunity"
         
         # Entry signal found
@@ -405,7 +721,7 @@ class MidGameBot:
         
         # Initialize trade data with actual shares
         trade_data = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': time.time(),  # formatted only when written out
             'market_slug': slug,
             'market_title': market['title'],
             'entry_side': entry_side,
@@ -422,17 +738,23 @@ class MidGameBot:
         # Monitor position
         print(f"\n💎 Monitoring...")
         
+        last_bid = None
+        
         while True:
-            time.sleep(CHECK_INTERVAL)
+            # Wake as soon as the stream moves a bid; the timeout keeps the REST fallback ticking
+            self._bid_changed.wait(CHECK_INTERVAL)
+            self._bid_changed.clear()
             
             current_bid = self.get_best_bid(entry_token)
             
             if not current_bid:
                 continue
             
-            current_pnl = (current_bid - entry_price) * actual_shares
-            
-            print(f"   💹 Bid: ${current_bid:.2f} | P&L: ${current_pnl:+.2f}", end="\r")
+            # Only redraw the status line when the bid actually moved
+            if current_bid != last_bid:
+                last_bid = current_bid
+                current_pnl = (current_bid - entry_price) * actual_shares
+                print(f"   💹 Bid: ${current_bid:.2f} | P&L: ${current_pnl:+.2f}", end="\r")
             
             # Check take profit
             if current_bid >= MG_TAKE_PROFIT:
@@ -451,9 +773,8 @@ class MidGameBot:
                     trade_data['gross_pnl'] = pnl
                     trade_data['pnl_percent'] = pnl_pct
                     trade_data['win_loss'] = 'WIN'
-                    trade_data['balance_after'] = self.get_balance()
                     
-                    self.log_trade(trade_data)
+                    self.pool.submit(self.finish_trade_log, trade_data)
                     self.session_wins += 1
                     self.session_trades += 1
                     self.traded_markets.add(slug)
@@ -478,9 +799,8 @@ class MidGameBot:
                     trade_data['gross_pnl'] = pnl
                     trade_data['pnl_percent'] = pnl_pct
                     trade_data['win_loss'] = 'LOSS'
-                    trade_data['balance_after'] = self.get_balance()
                     
-                    self.log_trade(trade_data)
+                    self.pool.submit(self.finish_trade_log, trade_data)
                     self.session_losses += 1
                     self.session_trades += 1
                     self.traded_markets.add(slug)
@@ -500,14 +820,17 @@ class MidGameBot:
         print(f"\n📊 Logging: {TRADE_LOG_FILE}\n")
         
         current_market = None
+        last_market_timestamp = None
         
         while True:
             try:
-                now_utc = datetime.now(timezone.utc)
-                current_timestamp = int(now_utc.timestamp())
+                current_timestamp = int(time.time())  # POSIX time is already UTC
                 
+                # The slug only changes when the 15-minute bucket rolls over
                 market_timestamp = (current_timestamp // 900) * 900
-                expected_slug = f"btc-updown-15m-{market_timestamp}"
+                if market_timestamp != last_market_timestamp:
+                    last_market_timestamp = market_timestamp
+                    expected_slug = f"btc-updown-15m-{market_timestamp}"
                 
                 if not current_market or current_market['slug'] != expected_slug:
                     print(f"\n🔍 Looking for: {expected_slug}")
@@ -518,6 +841,9 @@ class MidGameBot:
                         time_left = market_end - current_timestamp
                         print(f"✅ Found! {current_market['title']}")
                         print(f"   Time Left: {time_left//60}m {time_left%60}s\n")
+                        
+                        # Stream this market's books instead of polling REST
+                        self.subscribe_market([current_market['yes_token'], current_market['no_token']])
 
                         # Cancel all old orders when new market detected
                         try:
@@ -538,19 +864,34 @@ class MidGameBot:
                 status = self.execute_midgame_strategy(current_market, market_timestamp)
                 
                 if status in ["take_profit", "stop_loss"]:
-                    current_balance = self.get_balance()
+                    current_balance, block_number = self.get_chain_state()
                     session_pnl = current_balance - self.starting_balance
                     win_rate = (self.session_wins / self.session_trades * 100) if self.session_trades > 0 else 0
                     
                     print(f"\n📊 SESSION: Trades: {self.session_trades} | W: {self.session_wins} | L: {self.session_losses}")
-                    print(f"   Balance: ${current_balance:.2f} | P&L: ${session_pnl:+.2f} | WR: {win_rate:.1f}%\n")
+                    print(f"   Balance: ${current_balance:.2f} | P&L: ${session_pnl:+.2f} | WR: {win_rate:.1f}% | Block: {block_number}\n")
                     
                     time.sleep(5)
                 
+                elif status in ["outside_window", "already_traded"]:
+                    # Nothing can happen until the window opens (or the next market) - sleep straight there
+                    time_remaining = market_timestamp + 900 - time.time()
+                    if status == "outside_window" and time_remaining > MG_LOCK_WINDOW_END:
+                        wait_time = time_remaining - MG_LOCK_WINDOW_END
+                        print(f"⏳ Entry window opens in {int(wait_time)}s")
+                    else:
+                        wait_time = max(time_remaining, 0)
+                        print(f"⏳ Done with this market, next one in {int(wait_time)}s")
+                    time.sleep(wait_time)
+                    continue
+                
                 time.sleep(CHECK_INTERVAL)
                 
             except KeyboardInterrupt:
                 print("\n\n🛑 Bot stopped")
+                self.pool.shutdown(wait=True)  # Let any pending trade log finish first
+                self.close_trade_log()
+                self.export_excel()
                 current_balance = self.get_balance()
                 session_pnl = current_balance - self.starting_balance
                 win_rate = (self.session_wins / self.session_trades * 100) if self.session_trades > 0 else 0